@@ -0,0 +1,206 @@
+"""
+Dispatch path benchmark, runs without MIDI hardware or a window system.
+
+Drives MidiEngine with SyntheticSource traffic against generated profile sets and reports
+throughput and per-message latency percentiles. Run from the repository root:
+
+    python -m benchmarks.bench_dispatch
+    python -m benchmarks.bench_dispatch --profiles 1 100 --rate 2000 --output bench.json
+    python -m benchmarks.bench_dispatch --compare baseline.json
+    python -m benchmarks.bench_dispatch --replay session.mid --profiles 100
+
+Results are written as JSON; --compare exits with status 1 when a scenario got slower than the
+baseline by more than --tolerance.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from src.models.midi_engine import MidiEngine
+from src.models.midi_sources import MidiFileSource, SyntheticSource
+from src.models.profile_watcher import ProfileWatcher
+from src.models.window_provider import WindowProvider
+
+PROFILE_COUNTS = (1, 10, 100, 1000, 10000)
+SCENARIOS = {
+    "note": ("note_on",),
+    "cc": ("control_change",),
+    "pitchwheel": ("pitchwheel",),
+    "clock": ("clock",),
+    "mixed": SyntheticSource.MESSAGE_TYPES,
+}
+LATENCY_STAGES = ("resolve", "lookup", "queue", "total")
+
+class StaticWindowProvider(WindowProvider):
+    """Always reports the same foreground window."""
+    def __init__(self, title: str):
+        self._title = title
+
+    def get_active_title(self):
+        return self._title
+
+class CountingActionHandler():
+    """Stands in for MidiDetection.execute_action and only counts calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, action_conf, msg=None):
+        self.calls += 1
+
+def build_profiles(count: int, bindings: int = 32) -> dict:
+    """`count` profiles (the first one is default) with note, control change and pitchwheel bindings."""
+    profiles = {}
+    for index in range(count):
+        name = "default" if index == 0 else f"profile_{index}"
+        action = {"action": "4", "params": {"PRINT_MESSAGE": name}, "policy": "concurrent"}
+        profiles[name] = {
+            "program_window_name": "default" if index == 0 else f"application {index} window",
+            "KEY": {str(note): action for note in range(0, 128, 128 // bindings)},
+            "CONTROL_CHANGE": {str(slot): {**action, "params": {"cc_control_id": str(control)}}
+                               for slot, control in enumerate(range(0, 128, 128 // bindings))},
+            "PITCHWHEEL": {"1": action},
+        }
+    return profiles
+
+def run_scenario(profile_path: str, title: str, source, count: int, cc_window: float) -> dict:
+    handler = CountingActionHandler()
+    engine = MidiEngine(handler, profile_path, StaticWindowProvider(title), cc_window=cc_window)
+    with contextlib.redirect_stdout(io.StringIO()):  # keep the engine's shutdown stats out of the report
+        # loading the profiles is measured on its own, throughput only covers the message stream
+        started = time.perf_counter()
+        engine.start()
+        startup = time.perf_counter() - started
+        started = time.perf_counter()
+        engine.run(source)
+        elapsed = time.perf_counter() - started
+
+    latency = {}
+    for _, name, samples, _, mean, p50, p90, p99, p999, maximum in engine.latency.snapshot():
+        if name in LATENCY_STAGES:
+            latency[name] = {"count": samples, "mean_us": mean, "p50_us": p50, "p90_us": p90,
+                             "p99_us": p99, "p999_us": p999, "max_us": maximum}
+    return {
+        "messages": count,
+        "startup_seconds": startup,
+        "elapsed_seconds": elapsed,
+        "throughput": count / elapsed if elapsed else 0.0,
+        "actions": handler.calls,
+        "latency": latency,
+        "executor": engine.action_executor.stats(),
+    }
+
+def run_benchmark(profile_counts=PROFILE_COUNTS, scenarios=tuple(SCENARIOS), rate: float = 0, count: int = 5000,
+                  cc_window: float = 0.015, quiet: bool = False, replay: str = None, realtime: bool = True) -> dict:
+    """Run every scenario against every profile set size, or only the recorded session `replay` if given."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for profile_count in profile_counts:
+            profile_path = os.path.join(directory, f"profiles_{profile_count}.json")
+            with open(profile_path, "w") as file:
+                json.dump(build_profiles(profile_count), file)
+
+            started = time.perf_counter()
+            ProfileWatcher(profile_path, use_cache=False)
+            compile_seconds = time.perf_counter() - started
+            # the last profile is the focused one, so window matching has to search the whole set
+            title = f"document - application {profile_count - 1} window" if profile_count > 1 else "desktop"
+
+            for scenario in ([f"replay:{os.path.basename(replay)}"] if replay else scenarios):
+                if replay:
+                    source = MidiFileSource(replay, realtime)
+                    with MidiFileSource(replay, realtime=False) as counting:
+                        messages = sum(1 for _ in counting)
+                    result = run_scenario(profile_path, title, source, messages, cc_window)
+                    if realtime:
+                        result["replay_lateness_us"] = {"p50": source.lateness.percentile(50) / 1000,
+                                                        "p99": source.lateness.percentile(99) / 1000,
+                                                        "max": source.lateness.max / 1000}
+                else:
+                    source = SyntheticSource(SCENARIOS[scenario], rate=rate, count=count)
+                    result = run_scenario(profile_path, title, source, count, cc_window)
+                result.update({"profiles": profile_count, "scenario": scenario, "rate": rate,
+                               "compile_seconds": compile_seconds})
+                results.append(result)
+                if not quiet:
+                    total = result["latency"].get("total", {})
+                    print(f"{profile_count:>6} profiles {scenario:<10} {result['throughput']:>10.0f} msg/s"
+                          f"  p50 {total.get('p50_us', 0):>8.1f} us  p99 {total.get('p99_us', 0):>8.1f} us"
+                          f"  compile {compile_seconds * 1000:.1f} ms")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rate": rate,
+            "count": count,
+            "cc_window": cc_window,
+            "replay": replay,
+            "realtime": realtime,
+        },
+        "results": results,
+    }
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.2, noise_us: float = 5.0) -> list:
+    """
+    Regressions of report against baseline as readable strings, empty when there are none.
+    p99 changes smaller than noise_us are ignored, sub-microsecond stages jitter far more than tolerance.
+    """
+    baseline_results = {(result["profiles"], result["scenario"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        key = (result["profiles"], result["scenario"])
+        previous = baseline_results.get(key)
+        if previous is None:
+            continue
+        if result["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"{key[0]} profiles {key[1]}: throughput {previous['throughput']:.0f} -> {result['throughput']:.0f} msg/s")
+        for stage in ("lookup", "total"):
+            before = previous["latency"].get(stage, {}).get("p99_us")
+            after = result["latency"].get(stage, {}).get("p99_us")
+            if before and after and after > before * (1 + tolerance) and after - before > noise_us:
+                regressions.append(f"{key[0]} profiles {key[1]}: {stage} p99 {before:.1f} -> {after:.1f} us")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the MIDI dispatch path with synthetic traffic.")
+    parser.add_argument("--profiles", type=int, nargs="+", default=list(PROFILE_COUNTS), help="profile set sizes")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--rate", type=float, default=0, help="messages per second, 0 for as fast as possible")
+    parser.add_argument("--count", type=int, default=5000, help="messages per scenario")
+    parser.add_argument("--cc-window", type=float, default=0.015, help="control change coalescing window in seconds")
+    parser.add_argument("--output", help="where to write the JSON results, bench_results.json or with --compare bench_latest.json")
+    parser.add_argument("--compare", help="baseline JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline")
+    parser.add_argument("--replay", help="replay a recorded .mid session instead of the synthetic scenarios")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible instead of at the recorded timing")
+    args = parser.parse_args(argv)
+    output = args.output or ("bench_latest.json" if args.compare else "bench_results.json")
+    baseline = None
+    if args.compare:
+        if os.path.abspath(output) == os.path.abspath(args.compare):
+            parser.error("--output would overwrite the --compare baseline")
+        # read before running, the baseline must be the file as it was given
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    report = run_benchmark(args.profiles, args.scenarios, args.rate, args.count, args.cc_window,
+                           replay=args.replay, realtime=not args.fast)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=4)
+    print(f"Results written to {output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+KnobWidget repaint benchmark, runs on the offscreen Qt platform without a window system.
+
+Turns a knob through every value and times its paint() three ways: the whole widget with the
+body cache dropped before every frame (what every repaint cost before the cache), the whole
+widget with a warm cache, and only the dirty area show_value() asks for. Run from the repository
+root:
+
+    python -m benchmarks.bench_knob_paint
+    python -m benchmarks.bench_knob_paint --size 200 --frames 5000 --output knob_paint.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QWidget
+from src.models.latency import LatencyHistogram
+
+MODES = ("uncached", "cached", "dirty")
+
+def paint_frames(knob, mode: str, frames: int) -> LatencyHistogram:
+    ratio = knob.devicePixelRatioF()
+    target = QImage(round(knob.width() * ratio), round(knob.height() * ratio), QImage.Format_ARGB32_Premultiplied)
+    target.setDevicePixelRatio(ratio)
+    histogram = LatencyHistogram()
+    span = knob.max_value - knob.min_value + 1
+    for frame in range(frames):
+        value = knob.min_value + frame % span
+        previous = knob.value
+        knob.value = value
+        if mode == "uncached":
+            knob.invalidate_cache()
+        rect = knob.dirty_rect(previous, value) if mode == "dirty" else knob.rect()
+        started = time.perf_counter_ns()
+        # the work paintEvent does for this clip, without going through the widget backing store
+        painter = QPainter(target)
+        painter.setClipRect(rect)
+        painter.fillRect(rect, Qt.transparent)
+        knob.paint(painter, rect)
+        painter.end()
+        histogram.record(time.perf_counter_ns() - started)
+    return histogram
+
+def run_benchmark(size: int = 80, frames: int = 2000, modes=MODES) -> dict:
+    app = QApplication.instance() or QApplication([])
+    from src.widgets.knob_widget import KnobWidget
+    cwd = os.getcwd()
+    results = {}
+    # widgets open the shared profile store on ./profiles.json, keep it away from the user's profiles
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            host = QWidget()  # the shared side panel needs a parent to size itself against
+            knob = KnobWidget(parent=host, knob_id=0)
+            knob.resize(size, size)
+            paint_frames(knob, "cached", 50)  # warm up fonts and the pixmap cache
+
+            for mode in modes:
+                histogram = paint_frames(knob, mode, frames)
+                results[mode] = {"frames": histogram.count, "mean_us": histogram.mean / 1000,
+                                 "p50_us": histogram.percentile(50) / 1000, "p99_us": histogram.percentile(99) / 1000,
+                                 "max_us": histogram.max / 1000}
+        finally:
+            os.chdir(cwd)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt_platform": app.platformName(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "size": size,
+            "frames": frames,
+        },
+        "results": results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark KnobWidget repaints on the offscreen Qt platform.")
+    parser.add_argument("--size", type=int, default=80, help="knob width and height in pixels")
+    parser.add_argument("--frames", type=int, default=2000, help="repaints per mode")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--output", help="where to write the JSON results")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.size, args.frames, args.modes)
+    for mode, result in report["results"].items():
+        print(f"{mode:<9} mean {result['mean_us']:>8.1f} us  p50 {result['p50_us']:>8.1f} us  p99 {result['p99_us']:>8.1f} us")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
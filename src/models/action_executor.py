@@ -0,0 +1,160 @@
+import queue
+import threading
+import time
+from collections import deque
+from src.models.enums import QueuePolicy
+
+class _Task():
+    __slots__ = ("func", "args", "key", "policy", "enqueued_at")
+
+    def __init__(self, func, args, key, policy):
+        self.func = func
+        self.args = args
+        self.key = key
+        self.policy = policy
+        self.enqueued_at = time.perf_counter()
+
+class ActionExecutor():
+    """
+    Bounded worker pool that runs actions off the listener thread.
+
+    `submit` never blocks: tasks go onto a bounded queue and the queue policy of the task's key
+    decides what happens while an earlier task with the same key is still queued or running:
+        SERIALIZE     run after the earlier ones, in order
+        CONCURRENT    run right away on any free worker
+        DROP_IF_BUSY  discard the new task
+        COALESCE      keep only the newest waiting task
+    """
+    def __init__(self, workers: int = 4, max_queue: int = 256):
+        self._workers = workers
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._busy_keys = {}  # key -> deque of tasks waiting behind the running one
+        self._threads = []
+        self._submitted = 0
+        self._executed = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._failed = 0
+        self._waiting = 0
+        self._peak_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def queue_depth(self):
+        """Tasks queued for a worker plus tasks parked behind a busy key."""
+        return self._waiting
+
+    def start(self):
+        for index in range(self._workers):
+            thread = threading.Thread(target=self._run_worker, name=f"ActionExecutor-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 1.0):
+        for _ in self._threads:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, func, *args, key=None, policy: QueuePolicy = QueuePolicy.CONCURRENT):
+        """Queue func(*args). Returns False if the task was dropped."""
+        task = _Task(func, args, key, policy)
+        with self._lock:
+            self._submitted += 1
+            if policy == QueuePolicy.CONCURRENT or key is None:
+                return self._enqueue(task)
+
+            pending = self._busy_keys.get(key)
+            if pending is None:
+                self._busy_keys[key] = deque()
+                if not self._enqueue(task):
+                    del self._busy_keys[key]
+                    return False
+                return True
+
+            match policy:
+                case QueuePolicy.DROP_IF_BUSY:
+                    self._dropped += 1
+                    return False
+                case QueuePolicy.COALESCE:
+                    self._coalesced += len(pending)
+                    self._waiting -= len(pending)
+                    pending.clear()
+            pending.append(task)
+            self._waiting += 1
+            self._peak_depth = max(self._peak_depth, self._waiting)
+            return True
+
+    def stats(self):
+        """Snapshot of the counters, wait times are in seconds."""
+        with self._lock:
+            started = self._executed + self._failed
+            return {
+                "workers": self._workers,
+                "queue_depth": self._waiting,
+                "peak_queue_depth": self._peak_depth,
+                "submitted": self._submitted,
+                "executed": self._executed,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "coalesced": self._coalesced,
+                "average_wait": self._total_wait / started if started else 0.0,
+                "max_wait": self._max_wait,
+            }
+
+    def _enqueue(self, task: _Task):
+        # called with the lock held, must never block the caller
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            self._dropped += 1
+            return False
+        self._waiting += 1
+        self._peak_depth = max(self._peak_depth, self._waiting)
+        return True
+
+    def _run_worker(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+
+            wait = time.perf_counter() - task.enqueued_at
+            with self._lock:
+                self._waiting -= 1
+            try:
+                task.func(*task.args)
+                failed = False
+            except Exception as e:
+                print(f"Error executing action: {e}")
+                failed = True
+
+            with self._lock:
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+                if failed:
+                    self._failed += 1
+                else:
+                    self._executed += 1
+                if task.key is not None and task.policy != QueuePolicy.CONCURRENT:
+                    self._release(task.key)
+
+    def _release(self, key):
+        # hand the key over to its next waiting task, or mark it idle
+        pending = self._busy_keys.get(key)
+        while pending:
+            task = pending.popleft()
+            self._waiting -= 1
+            if self._enqueue(task):
+                return
+        self._busy_keys.pop(key, None)
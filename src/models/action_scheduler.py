@@ -0,0 +1,166 @@
+import heapq
+import itertools
+import threading
+import time
+from src.models.action_executor import ActionExecutor
+from src.models.enums import QueuePolicy
+from src.models.latency import LatencyHistogram
+from src.models.midi_sources import SPIN_THRESHOLD
+
+# names accepted for each step kind in MACRO_SEQUENCE params
+STEP_KINDS = {
+    "keys": "keys", "key": "keys", "shortcut": "keys",
+    "command": "command", "cmd": "command",
+    "script": "script",
+    "print": "print",
+    "wait": "delay", "delay": "delay", "sleep": "delay",
+}
+
+def parse_sequence(spec):
+    """
+    [(delay_ms, kind, value)] for a MACRO_SEQUENCE, from either a list of one-key dicts
+    ([{"keys": "ctrl+c"}, {"delay": 50}, {"command": "start notepad"}]) or the side panel's
+    text form ("keys ctrl+c; wait 50; command start notepad"). Each delay is added to the
+    step that follows it. Raises ValueError for unknown steps or bad delays.
+    """
+    if isinstance(spec, str):
+        items = []
+        for part in spec.split(";"):
+            part = part.strip()
+            if part:
+                kind, _, value = part.partition(" ")
+                items.append((kind, value.strip()))
+    else:
+        items = [next(iter(step.items())) for step in spec or [] if isinstance(step, dict) and step]
+
+    steps = []
+    delay = 0.0
+    for kind, value in items:
+        kind = STEP_KINDS.get(str(kind).lower())
+        if kind is None:
+            raise ValueError(f"Unknown macro step: {items}")
+        if kind == "delay":
+            delay += float(value)
+            if delay < 0:
+                raise ValueError(f"Negative macro delay: {value}")
+        else:
+            steps.append((delay, kind, value))
+            delay = 0.0
+    return steps
+
+class _Sequence():
+    __slots__ = ("id", "steps", "index", "due", "context")
+
+    def __init__(self, sequence_id, steps, started, context):
+        self.id = sequence_id
+        self.steps = steps
+        self.index = 0
+        self.due = started
+        self.context = context
+
+class ActionScheduler(threading.Thread):
+    """
+    Runs MACRO_SEQUENCE steps at their due time from a single timer heap.
+
+    Due times are perf_counter_ns based and anchored to when the sequence started, so delays
+    do not drift with how long the steps take. The thread waits on a condition until shortly
+    before the earliest step and spins the rest of the way. It hands each due step to its own
+    ActionExecutor, serialized per sequence, so steps of one sequence stay in order while a slow
+    step only holds up its own sequence. `lateness` records how late each step was handed over.
+    """
+    def __init__(self, run_step, workers: int = 4, max_queue: int = 256):
+        super().__init__(daemon=True)
+        self._run_step = run_step
+        self._executor = ActionExecutor(workers, max_queue)
+        self._condition = threading.Condition()
+        self._heap = []  # (due ns, order, sequence)
+        self._order = itertools.count()
+        self._ids = itertools.count(1)
+        self._spin_ns = int(SPIN_THRESHOLD * 1e9)
+        self._stopped = False
+        self._lateness = LatencyHistogram()
+        self._started_sequences = 0
+        self._finished_sequences = 0
+
+    @property
+    def lateness(self):
+        return self._lateness
+
+    @property
+    def active(self):
+        """Sequences started and not finished yet."""
+        return self._started_sequences - self._finished_sequences
+
+    def start(self):
+        self._executor.start()
+        super().start()
+
+    def stop(self):
+        """Drop the steps that are not due yet and stop the thread and its workers."""
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            self._condition.notify()
+        self._executor.stop()
+
+    def schedule(self, steps: list, context=None):
+        """Start a sequence of parse_sequence steps. Returns its id, None if there is nothing to run."""
+        if not steps:
+            return None
+        sequence = _Sequence(next(self._ids), steps, time.perf_counter_ns(), context)
+        with self._condition:
+            self._started_sequences += 1
+        self._push(sequence)
+        return sequence.id
+
+    def _push(self, sequence: _Sequence):
+        delay_ms, _, _ = sequence.steps[sequence.index]
+        # anchored to the previous due time: a slow step makes the next one late, never every later one
+        sequence.due += int(delay_ms * 1_000_000)
+        with self._condition:
+            if self._stopped:
+                return
+            heapq.heappush(self._heap, (sequence.due, next(self._order), sequence))
+            if self._heap[0][2] is sequence:
+                self._condition.notify()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._heap and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                remaining = self._heap[0][0] - time.perf_counter_ns()
+                if remaining > self._spin_ns:
+                    self._condition.wait((remaining - self._spin_ns) / 1e9)
+                    continue
+                due = []
+                if remaining <= 0:
+                    now = time.perf_counter_ns()
+                    while self._heap and self._heap[0][0] <= now:
+                        due.append(heapq.heappop(self._heap))
+            if not due:
+                time.sleep(0)  # spin the last stretch outside the lock, new sequences can still be added
+                continue
+            for due_at, _, sequence in due:
+                self._lateness.record(max(time.perf_counter_ns() - due_at, 0))
+                if not self._executor.submit(self._run, sequence, key=("macro", sequence.id), policy=QueuePolicy.SERIALIZE):
+                    print(f"Macro sequence {sequence.id} dropped, every worker is busy")
+                    self._finish(sequence)
+
+    def _run(self, sequence: _Sequence):
+        _, kind, value = sequence.steps[sequence.index]
+        try:
+            self._run_step(kind, value, sequence.context)
+        except Exception as e:
+            print(f"Error in macro step '{kind} {value}': {e}")
+        sequence.index += 1
+        if sequence.index < len(sequence.steps):
+            self._push(sequence)
+        else:
+            self._finish(sequence)
+
+    def _finish(self, sequence: _Sequence):
+        with self._condition:
+            self._finished_sequences += 1
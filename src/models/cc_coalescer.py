@@ -0,0 +1,85 @@
+import threading
+import time
+
+class ControlChangeCoalescer(threading.Thread):
+    """
+    Pipeline stage between the port and the dispatcher that collapses control_change bursts.
+
+    Every control_change is held for up to `window` seconds and only the latest value per
+    (channel, control) is passed on when the frame flushes. The flush runs on a timer, so the
+    final position of a sweep always arrives. Any other message goes straight to `sink`.
+    Extra arguments given to push, like the receive timestamp, are passed on with their message.
+    Controls are coalesced per `group` too, so the same CC from two devices is kept apart.
+    """
+    def __init__(self, sink, window: float = 0.015):
+        super().__init__(daemon=True)
+        self._sink = sink
+        self._window = window
+        self._condition = threading.Condition()
+        self._pending = {}  # (group, channel << 7 | control) -> (latest message, its extra arguments)
+        self._deadline = None
+        self._stopped = False
+        self._received = 0
+        self._emitted = 0
+
+    @property
+    def window(self):
+        return self._window
+
+    @property
+    def received(self):
+        """control_change messages pushed into the stage."""
+        return self._received
+
+    @property
+    def emitted(self):
+        """control_change messages passed on to the sink."""
+        return self._emitted
+
+    def push(self, msg, *context, group=None):
+        if msg.type != "control_change" or self._window <= 0:
+            self._sink(msg, *context)
+            return
+
+        with self._condition:
+            self._received += 1
+            self._pending[group, msg.channel << 7 | msg.control] = (msg, context)
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self._window
+                self._condition.notify()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                batch = self._take_pending()
+            self._emit(batch)
+
+    def stop(self):
+        """Stop the flush timer and pass on whatever is still pending."""
+        with self._condition:
+            self._stopped = True
+            batch = self._take_pending()
+            self._condition.notify()
+        self._emit(batch)
+
+    def _take_pending(self):
+        batch = self._pending
+        self._pending = {}
+        self._deadline = None
+        return batch
+
+    def _emit(self, batch: dict):
+        for msg, context in batch.values():
+            self._emitted += 1
+            try:
+                self._sink(msg, *context)
+            except Exception as e:
+                print(f"Error processing MIDI message: {e}")
@@ -0,0 +1,84 @@
+import threading
+import mido
+
+class DeviceMonitor(threading.Thread):
+    """
+    Polls the list of MIDI input ports on its own thread and reports when it changes.
+
+    `on_change(added, removed, devices)` is called from this thread, Qt code forwards it through a
+    signal. PortSources registered with watch() are disconnected when their device disappears and
+    reopened as soon as it shows up again.
+    """
+    def __init__(self, list_devices=None, interval: float = 1.0, on_change=None):
+        super().__init__(daemon=True)
+        self._list_devices = list_devices or mido.get_input_names
+        self._interval = interval
+        self._on_change = on_change
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._devices = None
+        self._watched = []
+
+    @property
+    def devices(self):
+        """Device names from the last poll, None before the first one."""
+        return self._devices
+
+    @property
+    def on_change(self):
+        return self._on_change
+
+    @on_change.setter
+    def on_change(self, callback):
+        self._on_change = callback
+
+    def watch(self, source):
+        with self._lock:
+            if source not in self._watched:
+                self._watched.append(source)
+
+    def unwatch(self, source):
+        with self._lock:
+            if source in self._watched:
+                self._watched.remove(source)
+
+    def stats(self):
+        """Connection stats of every watched port, by device name."""
+        with self._lock:
+            return {source.name: source.connection_stats() for source in self._watched}
+
+    def run(self):
+        self.poll()
+        while not self._stop_event.wait(self._interval):
+            self.poll()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def poll(self):
+        """Check the port list once. Returns True if it changed since the last poll."""
+        try:
+            devices = list(self._list_devices())
+        except Exception as e:
+            print(f"Could not list MIDI devices: {e}")
+            return False
+        if devices == self._devices:
+            return False
+
+        previous = self._devices or []
+        added = [device for device in devices if device not in previous]
+        removed = [device for device in previous if device not in devices]
+        self._devices = devices
+
+        with self._lock:
+            watched = list(self._watched)
+        for source in watched:
+            if source.name in removed:
+                print(f"MIDI device '{source.name}' disconnected")
+                source.disconnect()
+            elif source.name in added and source.disconnected:
+                source.reconnect()
+
+        if self._on_change:
+            self._on_change(added, removed, devices)
+        return True
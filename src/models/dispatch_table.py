@@ -0,0 +1,180 @@
+from array import array
+from dataclasses import dataclass, field
+from src.models.enums import MidiControlType, MidiActionType, QueuePolicy
+from src.models.value_map import ValueMap
+
+MIDI_CHANNELS = 16
+MIDI_NUMBERS = 128
+
+# profiles.json has used a few spellings for the pitchwheel section over time
+PITCHWHEEL_SECTIONS = ("PITCHWHEEL", "PITCH_WHEEL", "PITCHWEEL")
+
+@dataclass(frozen=True, eq=False)
+class Binding:
+    """A single compiled binding, resolved once when the profile is loaded. Hashes by identity."""
+    control_type: MidiControlType
+    number: int
+    action_type: MidiActionType = None
+    params: dict = field(default_factory=dict)
+    conf: dict = field(default_factory=dict)
+    policy: QueuePolicy = QueuePolicy.SERIALIZE
+    value_map: ValueMap = None  # CC and pitchwheel bindings with a "mapping"
+
+    def resolve(self, msg):
+        """The action conf to run for msg, None when its value maps to nothing."""
+        return self.conf if self.value_map is None else self.value_map.lookup(msg)
+
+class DispatchTable():
+    """
+    Flat lookup tables for one profile, indexed by (message type, channel, note/control).
+
+    Everything string-keyed in profiles.json is resolved here so the listener only does
+    an array read per message. Bindings with a "device" field go into a nested table per device
+    and only answer messages from input ports whose name contains it (case-insensitive); they
+    take precedence over the bindings without one.
+    """
+    def __init__(self, name: str, profile: dict):
+        self._name = name
+        self._program_window_name = profile.get("program_window_name")
+        self._keys = [None] * (MIDI_CHANNELS * MIDI_NUMBERS)
+        self._controls = [None] * (MIDI_CHANNELS * MIDI_NUMBERS)
+        self._pitchwheel = [None] * MIDI_CHANNELS
+        self._devices = {}  # lower-cased device name -> DispatchTable holding that device's bindings
+        self._device_matches = {}  # port name -> device tables that apply to it, filled on first use
+        self._compile(profile)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def program_window_name(self):
+        return self._program_window_name
+
+    @property
+    def devices(self):
+        return list(self._devices)
+
+    def lookup(self, msg, device: str = None):
+        """Return the binding for a mido message from the named input port, or None if nothing is bound."""
+        if device is not None and self._devices:
+            matches = self._device_matches.get(device)
+            if matches is None:
+                matches = self._device_matches[device] = [table for name, table in self._devices.items() if name in device.lower()]
+            for table in matches:
+                binding = table.lookup(msg)
+                if binding:
+                    return binding
+
+        match msg.type:
+            case "note_on" if msg.velocity > 0:
+                return self._keys[msg.channel << 7 | msg.note]
+            case "control_change":
+                return self._controls[msg.channel << 7 | msg.control]
+            case "pitchwheel":
+                return self._pitchwheel[msg.channel]
+        return None
+
+    def __getstate__(self):
+        # the flat arrays are mostly empty, only each binding and the packed slots it fills go into the profile cache
+        state = dict(self.__dict__)
+        state["_device_matches"] = {}
+        for table in ("_keys", "_controls", "_pitchwheel"):
+            slots = {}
+            for index, binding in enumerate(state[table]):
+                if binding:
+                    slots.setdefault(binding, (binding, array("H")))[1].append(index)
+            state[table] = (len(state[table]), [(binding, indices.tobytes()) for binding, indices in slots.values()])
+        return state
+
+    def __setstate__(self, state):
+        for table in ("_keys", "_controls", "_pitchwheel"):
+            size, filled = state[table]
+            state[table] = [None] * size
+            for binding, packed in filled:
+                indices = array("H")
+                indices.frombytes(packed)
+                for index in indices:
+                    state[table][index] = binding
+        self.__dict__.update(state)
+
+    def _compile(self, profile: dict):
+        for key, conf in profile.get(MidiControlType.KEY.name, {}).items():
+            binding = self._compile_binding(MidiControlType.KEY, key, conf)
+            if binding:
+                self._fill(self._target(conf)._keys, binding, conf)
+
+        for key, conf in profile.get(MidiControlType.CONTROL_CHANGE.name, {}).items():
+            # CONTROL_CHANGE entries are keyed by widget id, the actual CC number lives in the params
+            params = conf.get("params", {}) if isinstance(conf, dict) else {}
+            binding = self._compile_binding(MidiControlType.CONTROL_CHANGE, params.get("cc_control_id") or key, conf)
+            if binding:
+                self._fill(self._target(conf)._controls, binding, conf)
+
+        for section in PITCHWHEEL_SECTIONS:
+            conf = profile.get(section, {}).get("1")
+            binding = self._compile_binding(MidiControlType.PITCHWHEEL, 0, conf)
+            if binding:
+                for channel in self._channels(conf):
+                    self._target(conf)._pitchwheel[channel] = binding
+
+    def _compile_binding(self, control_type: MidiControlType, number, conf):
+        if not isinstance(conf, dict) or "action" not in conf:
+            return None
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            print(f"Skipping {control_type.name} binding with invalid number: {number}")
+            return None
+        if not 0 <= number < MIDI_NUMBERS:
+            print(f"Skipping {control_type.name} binding out of MIDI range: {number}")
+            return None
+
+        channel = conf.get("channel")
+        if channel is not None and channel != "":
+            try:
+                int(channel)
+            except (TypeError, ValueError):
+                print(f"Skipping {control_type.name} {number} binding with invalid channel: {channel}")
+                return None
+
+        try:
+            action_type = MidiActionType(int(conf["action"]))
+        except (TypeError, ValueError):
+            action_type = None
+
+        try:
+            policy = QueuePolicy(conf.get("policy", QueuePolicy.SERIALIZE.value))
+        except ValueError:
+            print(f"Unknown queue policy '{conf.get('policy')}' for {control_type.name} {number}, using serialize")
+            policy = QueuePolicy.SERIALIZE
+
+        value_map = None
+        if "mapping" in conf and control_type != MidiControlType.KEY:
+            try:
+                value_map = ValueMap(conf, pitchwheel=control_type == MidiControlType.PITCHWHEEL)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping {control_type.name} {number} binding with invalid mapping: {e}")
+                return None
+
+        return Binding(control_type, number, action_type, conf.get("params", {}), conf, policy, value_map)
+
+    def _target(self, conf: dict):
+        device = conf.get("device")
+        if not device:
+            return self
+        device = str(device).lower()
+        if device not in self._devices:
+            self._devices[device] = DispatchTable(f"{self._name}/{device}", {})
+        return self._devices[device]
+
+    def _fill(self, table: list, binding: Binding, conf: dict):
+        for channel in self._channels(conf):
+            table[channel << 7 | binding.number] = binding
+
+    def _channels(self, conf: dict):
+        # bindings without a channel respond on every channel, same as before
+        channel = conf.get("channel")
+        if channel is None or channel == "":
+            return range(MIDI_CHANNELS)
+        return (int(channel) % MIDI_CHANNELS,)
@@ -10,4 +10,16 @@ class MidiActionType(Enum):
     RUN_COMMAND = 1
     KEYBOARD_SHORTCUT = 2
     RUN_SCRIPT = 3
-    PRINT_MESSAGE = 4
\ No newline at end of file
+    PRINT_MESSAGE = 4
+    MACRO_SEQUENCE = 5
+
+class QueuePolicy(Enum):
+    SERIALIZE = "serialize"
+    CONCURRENT = "concurrent"
+    DROP_IF_BUSY = "drop"
+    COALESCE = "coalesce"
+
+class ScriptMode(Enum):
+    SPAWN = "spawn"
+    POOL = "pool"
+    IN_PROCESS = "in_process"
@@ -0,0 +1,70 @@
+import threading
+from src.models.window_provider import WindowProvider, PyGetWindowProvider
+
+class FocusTracker(threading.Thread):
+    """
+    Watches the foreground window on a timer and keeps the resolved profile name cached.
+
+    `resolve_profile` maps a window title (or None) to a profile name. The listener only reads
+    `active_profile`; the window system is never queried from the MIDI path.
+    """
+    def __init__(self, resolve_profile, window_provider: WindowProvider = None, interval: float = 0.1, on_change=None):
+        super().__init__(daemon=True)
+        self._resolve_profile = resolve_profile
+        self._window_provider = window_provider or PyGetWindowProvider()
+        self._interval = interval
+        self._on_change = on_change
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._active_title = None
+        self._active_profile = None
+        self.refresh()
+
+    @property
+    def active_title(self):
+        return self._active_title
+
+    @property
+    def active_profile(self):
+        return self._active_profile
+
+    @property
+    def window_provider(self):
+        return self._window_provider
+
+    def run(self):
+        while not self._stop_event.wait(self._interval):
+            self.poll()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def poll(self):
+        """Check the foreground window and re-resolve only if the title changed."""
+        title = self._get_title()
+        if title == self._active_title:
+            return False
+        return self._publish(title)
+
+    def refresh(self):
+        """Re-resolve the current window, e.g. after the profiles were reloaded."""
+        return self._publish(self._get_title())
+
+    def _publish(self, title):
+        with self._lock:
+            self._active_title = title
+            profile = self._resolve_profile(title)
+            if profile == self._active_profile:
+                return False
+            self._active_profile = profile
+
+        if self._on_change:
+            self._on_change(profile)
+        return True
+
+    def _get_title(self):
+        try:
+            return self._window_provider.get_active_title()
+        except Exception as e:
+            print(f"Focus tracker could not read the active window: {e}")
+            return None
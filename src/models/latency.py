@@ -0,0 +1,160 @@
+import csv
+import threading
+
+STAGES = ("coalesce", "resolve", "lookup", "queue", "execute", "total")
+
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+
+class LatencyHistogram():
+    """
+    HDR-style histogram of nanosecond durations.
+
+    Values below 128 ns get a bucket each, above that every power of two is split into 64
+    buckets, so any recorded value is off by at most ~1.5% and recording is a bit_length,
+    a shift and a list increment. Values above `highest` are clamped to it.
+    """
+    def __init__(self, highest: int = 60_000_000_000):
+        self._highest = highest
+        self._counts = [0] * (self._index(highest) + 1)
+        self._count = 0
+        self._total = 0
+        self._min = None
+        self._max = 0
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def min(self):
+        return self._min or 0
+
+    @property
+    def max(self):
+        return self._max
+
+    @property
+    def mean(self):
+        return self._total / self._count if self._count else 0.0
+
+    def record(self, value: int):
+        value = min(max(int(value), 0), self._highest)
+        self._counts[self._index(value)] += 1
+        self._count += 1
+        self._total += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def percentile(self, percent: float) -> int:
+        """Highest value equivalent to the given percentile, 0 when nothing was recorded."""
+        if not self._count:
+            return 0
+        target = max(1, round(self._count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(index), self._max)
+        return self._max
+
+    def reset(self):
+        self._counts = [0] * len(self._counts)
+        self._count = 0
+        self._total = 0
+        self._min = None
+        self._max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - _SUB_BUCKET_BITS
+        return (shift * _HALF_SUB_BUCKETS) + (value >> shift)
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        if index < _SUB_BUCKETS:
+            return index
+        shift = index // _HALF_SUB_BUCKETS - 1
+        mantissa = index - shift * _HALF_SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+class LatencyRecorder():
+    """
+    Latency of every dispatched message, per pipeline stage and per action type.
+
+    Stages, all measured with time.perf_counter_ns from the moment the listener read the message:
+        coalesce   receive -> dispatch (includes the control change window)
+        resolve    finding the active profile's dispatch table
+        lookup     the dispatch table read
+        queue      waiting for an executor worker
+        execute    the action handler itself
+        total      receive -> action completion
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {stage: LatencyHistogram() for stage in STAGES}
+        self._actions = {}
+
+    def record(self, stage: str, value: int):
+        with self._lock:
+            self._stages[stage].record(value)
+
+    def record_action(self, action_type: str, value: int):
+        with self._lock:
+            histogram = self._actions.get(action_type)
+            if histogram is None:
+                histogram = self._actions[action_type] = LatencyHistogram()
+            histogram.record(value)
+
+    def snapshot(self):
+        """Rows of (group, name, count, min, mean, p50, p90, p99, p99.9, max), times in microseconds."""
+        with self._lock:
+            histograms = [("stage", name, histogram) for name, histogram in self._stages.items()]
+            histograms += [("action", name, histogram) for name, histogram in sorted(self._actions.items())]
+            return [(group, name, histogram.count,
+                     histogram.min / 1000, histogram.mean / 1000,
+                     histogram.percentile(50) / 1000, histogram.percentile(90) / 1000,
+                     histogram.percentile(99) / 1000, histogram.percentile(99.9) / 1000,
+                     histogram.max / 1000)
+                    for group, name, histogram in histograms]
+
+    def summary(self) -> str:
+        lines = [f"{'':<22}{'count':>8}{'p50 us':>11}{'p99 us':>11}{'max us':>11}"]
+        for group, name, count, _, _, p50, _, p99, _, maximum in self.snapshot():
+            if count:
+                lines.append(f"{group + ' ' + name:<22}{count:>8}{p50:>11.1f}{p99:>11.1f}{maximum:>11.1f}")
+        return "\n".join(lines)
+
+    def write_csv(self, file_path: str):
+        with open(file_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["group", "name", "count", "min_us", "mean_us", "p50_us", "p90_us", "p99_us", "p999_us", "max_us"])
+            for row in self.snapshot():
+                writer.writerow([row[0], row[1], row[2]] + [f"{value:.3f}" for value in row[3:]])
+
+    def reset(self):
+        with self._lock:
+            for histogram in self._stages.values():
+                histogram.reset()
+            self._actions = {}
+
+class LatencyReporter(threading.Thread):
+    """Prints the recorder's summary every `interval` seconds until stopped."""
+    def __init__(self, recorder: LatencyRecorder, interval: float = 60.0, sink=print):
+        super().__init__(daemon=True)
+        self._recorder = recorder
+        self._interval = interval
+        self._sink = sink
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self._interval):
+            self._sink(self._recorder.summary())
+
+    def stop(self):
+        self._stopped.set()
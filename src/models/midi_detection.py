@@ -1,10 +1,75 @@
 import mido 
-from src.models.profile_detection import ProfileDetection
-from src.models.enums import MidiActionType
+from src.models.midi_engine import MidiEngine
+from src.models.midi_sources import PortSource, MidiFileSource, MergedSource
+from src.models.midi_recorder import MidiRecorder
+from src.models.device_monitor import DeviceMonitor
+from src.models.script_runner import ScriptWorkerPool, InProcessScriptRunner, message_to_dict
+from src.models.shell_session import ShellSessionPool
+from src.models.action_scheduler import ActionScheduler, parse_sequence
+from src.models.shortcut_cache import ShortcutCache
+from src.models.enums import MidiActionType, ScriptMode
+import json
+import os
 import subprocess
-from keyboard import send
+import threading
 
 class MidiDetection():
+    def __init__(self, shell_sessions: bool = True):
+        self._use_shell_sessions = shell_sessions
+        self._shell_pool = None
+        self._script_pool = None
+        self._scheduler = None
+        self._in_process_runner = InProcessScriptRunner()
+        self._shortcuts = ShortcutCache()
+        self._lock = threading.Lock()  # executor workers may hit the lazy pools at the same time
+
+    @property
+    def shell_pool(self) -> ShellSessionPool:
+        """Long-lived shells for RUN_COMMAND bindings, started on first use."""
+        with self._lock:
+            if self._shell_pool is None:
+                self._shell_pool = ShellSessionPool()
+                self._shell_pool.start()
+            return self._shell_pool
+
+    @property
+    def script_pool(self) -> ScriptWorkerPool:
+        """Warm interpreters for RUN_SCRIPT bindings with script_mode 'pool', started on first use."""
+        with self._lock:
+            if self._script_pool is None:
+                self._script_pool = ScriptWorkerPool()
+                self._script_pool.start()
+            return self._script_pool
+
+    @property
+    def scheduler(self) -> ActionScheduler:
+        """Timer thread for MACRO_SEQUENCE bindings, started on first use."""
+        with self._lock:
+            if self._scheduler is None:
+                self._scheduler = ActionScheduler(self.run_macro_step)
+                self._scheduler.start()
+            return self._scheduler
+
+    @property
+    def shortcuts(self) -> ShortcutCache:
+        """KEYBOARD_SHORTCUT strings compiled to scan codes when the profiles load."""
+        return self._shortcuts
+
+    def load_profiles(self, snapshot):
+        """MidiEngine on_reload callback, compiles the shortcuts of the profiles that changed."""
+        self._shortcuts.load(snapshot.profiles)
+
+    def close(self):
+        if self._scheduler:
+            self._scheduler.stop()
+            self._scheduler = None
+        if self._shell_pool:
+            self._shell_pool.close()
+            self._shell_pool = None
+        if self._script_pool:
+            self._script_pool.close()
+            self._script_pool = None
+
     def list_midi_devices(self):
         # print("Available MIDI Input Ports:")
         devices = []
@@ -16,7 +81,7 @@ class MidiDetection():
             pass 
         return devices
     
-    def execute_action(self, action_conf):
+    def execute_action(self, action_conf, msg=None):
         if not action_conf or "action" not in action_conf:
             print("No action configured")
             return
@@ -28,16 +93,20 @@ class MidiDetection():
             match int(action_type):
                 case MidiActionType.RUN_COMMAND.value:
                     command = parameters.get("RUN_COMMAND", "")
-                    subprocess.run(command, shell=True) if command else print("No command provided for 'run_command'.")    
+                    self.run_command(command, action_conf.get("isolated", False)) if command else print("No command provided for 'run_command'.")
 
                 case MidiActionType.KEYBOARD_SHORTCUT.value:
                     keys = parameters.get("KEYBOARD_SHORTCUT", "")
-                    send(keys) if keys else  print("No keys provided for 'keyboard_shortcut'.")
+                    self._shortcuts.send(keys) if keys else  print("No keys provided for 'keyboard_shortcut'.")
                 
                 case MidiActionType.RUN_SCRIPT.value:
                     script = parameters.get("RUN_SCRIPT", "")
-                    subprocess.run(["python", script], shell=True) if script else print("No script provided for 'run_script'.")
+                    self.run_script(script, action_conf.get("script_mode"), msg) if script else print("No script provided for 'run_script'.")
                         
+                case MidiActionType.MACRO_SEQUENCE.value:
+                    steps = parse_sequence(parameters.get("MACRO_SEQUENCE", ""))
+                    self.scheduler.schedule(steps, msg) if steps else print("No steps provided for 'macro_sequence'.")
+
                 case "print_message": # TODO get rid of this
                     message = parameters.get("PRINT_MESSAGE", "No message provided.")
                     print(message)
@@ -51,29 +120,70 @@ class MidiDetection():
         except Exception as e:
             print(f"Error executing action: {e}")
 
-    def listen_to_midi(self, midi_device):
-        try:
-            with mido.open_input(midi_device) as port:
-                for msg in port:
-                    active_profile = ProfileDetection().run_app()
-                    match msg.type:
-                        case "note_on" if msg.velocity > 0:
-                            action = active_profile["KEY"].get(str(msg.note))
-                            self.execute_action(action)
-                        
-                            if(msg.note == 72):
-                                break
+    def run_macro_step(self, kind, value, msg=None):
+        match kind:
+            case "keys":
+                self._shortcuts.send(value)
+            case "command":
+                self.run_command(value)
+            case "script":
+                self.run_script(value, ScriptMode.POOL.value, msg)
+            case "print":
+                print(value)
 
-                        case "control_change":
-                            action = active_profile["CONTROL_CHANGE"].get(str(msg.control))
-                            self.execute_action(action)
+    def run_command(self, command, isolated=False):
+        # commands marked isolated get a fresh shell, everything else reuses a warm session
+        if self._use_shell_sessions and not isolated:
+            self.shell_pool.run(command)
+        else:
+            subprocess.run(command, shell=True)
 
-                        case "pitchwheel":
-                            action = active_profile["PITCHWHEEL"].get('1')
-                            self.execute_action(action)
-                        
-        except Exception as e:
-            print(f"Error on listening to midi: {e}")
+    def run_script(self, script, script_mode=None, msg=None):
+        # every mode hands the triggering message to the script, as `midi_message` or the MIDI_MESSAGE env var
+        message = message_to_dict(msg)
+        match script_mode:
+            case ScriptMode.POOL.value:
+                self.script_pool.run(script, message)
+            case ScriptMode.IN_PROCESS.value:
+                self._in_process_runner.run(script, message)
+            case _:
+                subprocess.run(["python", script], shell=True, env={**os.environ, "MIDI_MESSAGE": json.dumps(message)})
+
+    def open_devices(self, midi_devices):
+        """A source for one device name, or for several read at once."""
+        if isinstance(midi_devices, str):
+            return PortSource(midi_devices)
+        if len(midi_devices) == 1:
+            return PortSource(midi_devices[0])
+        return MergedSource([PortSource(device) for device in midi_devices])
+
+    def listen_to_midi(self, midi_device, record_path=None):
+        device_monitor = DeviceMonitor(self.list_midi_devices)
+        device_monitor.start()
+        engine = MidiEngine(self.execute_action, latency_report_interval=60, device_monitor=device_monitor, on_reload=self.load_profiles)
+        if record_path:
+            engine.recorder = MidiRecorder()
+            engine.recorder.start()
+        try:
+            engine.run(self.open_devices(midi_device))
+        finally:
+            device_monitor.stop()
+            self.close()
+            if record_path:
+                engine.recorder.stop()
+                print(f"Recorded {engine.recorder.save(record_path)} messages to {record_path}")
+
+    def replay_midi_file(self, file_path, realtime=True):
+        """Run a recorded session through the engine, at its original timing or as fast as possible."""
+        engine = MidiEngine(self.execute_action, on_reload=self.load_profiles)
+        source = MidiFileSource(file_path, realtime)
+        try:
+            engine.run(source)
+        finally:
+            self.close()
+        if realtime:
+            print(f"Replay lateness: p50 {source.lateness.percentile(50) / 1000:.1f} us, p99 {source.lateness.percentile(99) / 1000:.1f} us, max {source.lateness.max / 1000:.1f} us")
+        return engine
 
 if __name__ == "__main__":
     x = MidiDetection()
@@ -0,0 +1,235 @@
+import threading
+import time
+from src.models.profile_detection import ProfileDetection
+from src.models.profile_watcher import ProfileWatcher
+from src.models.focus_tracker import FocusTracker
+from src.models.action_executor import ActionExecutor
+from src.models.cc_coalescer import ControlChangeCoalescer
+from src.models.latency import LatencyRecorder, LatencyReporter
+from src.models.midi_recorder import MidiRecorder
+from src.models.device_monitor import DeviceMonitor
+from src.models.midi_sources import MidiSource
+from src.models.window_provider import WindowProvider
+
+class MidiEngine():
+    """
+    The one dispatch pipeline between a MidiSource and the actions:
+
+        source -> ControlChangeCoalescer -> profile (FocusTracker) -> DispatchTable -> ActionExecutor
+
+    `action_handler(action_conf, msg)` runs on the executor's workers, normally
+    MidiDetection.execute_action. The Qt listener thread and the headless listener both wrap this.
+    Every message is timestamped when it is read and its stages are recorded in `latency`;
+    pass `latency_report_interval` to also print a summary every that many seconds.
+    While `recorder` is set, every message read is also handed to it with its receive timestamp,
+    and `observer(msg)` sees every message too (the GUI's live view); both run on the listener.
+    Messages carry the name of the device they came from, a MergedSource reads several at once.
+    With a `device_monitor`, the source's ports are reopened when their device is plugged back in.
+    `on_reload(snapshot)` is called with the ProfileSnapshot when the engine starts and after every reload.
+    """
+    def __init__(self, action_handler, profile_path: str = None, window_provider: WindowProvider = None,
+                 cc_window: float = 0.015, workers: int = 4, latency: LatencyRecorder = None,
+                 latency_report_interval: float = None, device_monitor: DeviceMonitor = None, on_reload=None):
+        self._action_handler = action_handler
+        self._on_reload = on_reload
+        self._device_monitor = device_monitor
+        self._latency = latency or LatencyRecorder()
+        self._latency_report_interval = latency_report_interval
+        self._latency_reporter = None
+        self._recorder = None
+        self._observer = None
+        self._profile_path = profile_path or ProfileDetection().profile_name
+        self._window_provider = window_provider
+        self._cc_window = cc_window
+        self._workers = workers
+        self._source = None
+        self._running = False
+        self._stop_requested = threading.Event()  # stop() before start() finished must still end run()
+        self._listening = False  # run() is active and tears the pipeline down itself
+        self._profile_watcher = None
+        self._focus_tracker = None
+        self._action_executor = None
+        self._cc_coalescer = None
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def source(self) -> MidiSource:
+        return self._source
+
+    @property
+    def latency(self) -> LatencyRecorder:
+        return self._latency
+
+    @property
+    def device_monitor(self) -> DeviceMonitor:
+        return self._device_monitor
+
+    @property
+    def recorder(self) -> MidiRecorder:
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, recorder: MidiRecorder):
+        self._recorder = recorder
+
+    @property
+    def observer(self):
+        return self._observer
+
+    @observer.setter
+    def observer(self, observer):
+        self._observer = observer
+
+    @property
+    def profile_watcher(self) -> ProfileWatcher:
+        return self._profile_watcher
+
+    @property
+    def focus_tracker(self) -> FocusTracker:
+        return self._focus_tracker
+
+    @property
+    def action_executor(self) -> ActionExecutor:
+        return self._action_executor
+
+    @property
+    def cc_coalescer(self) -> ControlChangeCoalescer:
+        return self._cc_coalescer
+
+    def start(self):
+        """Start the background stages. run() calls this for you."""
+        if self._running:
+            return
+        # the watcher recompiles changed profiles on its own thread, dispatch only reads its snapshot
+        self._profile_watcher = ProfileWatcher(self._profile_path)
+        self._focus_tracker = FocusTracker(lambda title: self._profile_watcher.snapshot.matcher.match(title), self._window_provider)
+        self._profile_watcher.on_reload = self._profiles_reloaded
+        if self._on_reload:
+            self._on_reload(self._profile_watcher.snapshot)  # the watcher loaded the profiles before the callback was set
+        self._action_executor = ActionExecutor(self._workers)
+        # fader and knob sweeps are collapsed to the latest value per control before dispatch
+        self._cc_coalescer = ControlChangeCoalescer(self.dispatch, self._cc_window)
+
+        self._profile_watcher.start()
+        self._focus_tracker.start()
+        self._action_executor.start()
+        self._cc_coalescer.start()
+        if self._latency_report_interval:
+            self._latency_reporter = LatencyReporter(self._latency, self._latency_report_interval)
+            self._latency_reporter.start()
+        self._running = True
+
+    def _profiles_reloaded(self, snapshot):
+        self._focus_tracker.refresh()
+        if self._on_reload:
+            self._on_reload(snapshot)
+
+    def run(self, source: MidiSource):
+        """Read from source until it is exhausted, closed or stop() is called."""
+        self._source = source
+        self._listening = True
+        self.start()
+        try:
+            with source:
+                # opening a source clears its closed flag, so a stop that came in meanwhile is checked here
+                if self._stop_requested.is_set():
+                    return
+                if self._device_monitor:
+                    for port in source.ports:
+                        self._device_monitor.watch(port)
+                # port sources call _receive on the MIDI backend's thread, the others are iterated here
+                source.listen(self._receive)
+        except Exception as e:
+            print(f"Error on listening to midi: {e}")
+        finally:
+            self._shutdown()
+            self._listening = False
+            self._stop_requested.clear()
+            if self._device_monitor:
+                for port in source.ports:
+                    self._device_monitor.unwatch(port)
+
+    def _receive(self, msg, device: str = None, received_at: int = None):
+        if not self._running:
+            return
+        try:
+            self.push(msg, received_at, device or self._source.name)
+        except Exception as e:
+            print(f"Error processing MIDI message: {e}")
+
+    def push(self, msg, received_at: int = None, device: str = None):
+        """Entry point of the pipeline, received_at is a time.perf_counter_ns() timestamp."""
+        received_at = received_at or time.perf_counter_ns()
+        recorder = self._recorder
+        if recorder:
+            recorder.record(msg, received_at)
+        observer = self._observer
+        if observer:
+            observer(msg)
+        self._cc_coalescer.push(msg, received_at, device, group=device)
+
+    def dispatch(self, msg, received_at: int = None, device: str = None):
+        started = time.perf_counter_ns()
+        received_at = received_at or started
+        dispatch_table = self._profile_watcher.snapshot.dispatch_tables.get(self._focus_tracker.active_profile)
+        resolved = time.perf_counter_ns()
+        binding = dispatch_table.lookup(msg, device) if dispatch_table else None
+        looked_up = time.perf_counter_ns()
+
+        self._latency.record("coalesce", started - received_at)
+        self._latency.record("resolve", resolved - started)
+        self._latency.record("lookup", looked_up - resolved)
+        if binding:
+            # value mapped bindings give a precompiled conf per value, or None for values that do nothing
+            conf = binding.resolve(msg)
+            if conf is None:
+                return
+            # only enqueue here, the action itself runs on the executor's workers
+            self._action_executor.submit(self._execute, binding, conf, msg, received_at, time.perf_counter_ns(),
+                                         key=binding, policy=binding.policy)
+
+    def _execute(self, binding, conf, msg, received_at: int, submitted_at: int):
+        started = time.perf_counter_ns()
+        try:
+            self._action_handler(conf, msg)
+        finally:
+            finished = time.perf_counter_ns()
+            self._latency.record("queue", started - submitted_at)
+            self._latency.record("execute", finished - started)
+            self._latency.record("total", finished - received_at)
+            self._latency.record_action(binding.action_type.name if binding.action_type else str(binding.conf.get("action")),
+                                        finished - received_at)
+
+    def stop(self):
+        """
+        Stop listening. While run() is active this only closes the source and returns at once;
+        run() then tears the pipeline down on its own thread, so the caller never waits on workers.
+        """
+        self._stop_requested.set()
+        source = self._source
+        if self._listening and source:
+            source.close()
+            return
+        self._shutdown()
+
+    def _shutdown(self):
+        if not self._running:
+            return
+        self._running = False
+        if self._source:
+            self._source.close()
+        self._profile_watcher.stop()
+        self._focus_tracker.stop()
+        self._cc_coalescer.stop()
+        self._action_executor.stop()
+        if self._latency_reporter:
+            self._latency_reporter.stop()
+            self._latency_reporter = None
+        print(f"Control changes coalesced: {self._cc_coalescer.received} received, {self._cc_coalescer.emitted} dispatched")
+        print(f"Action executor stats: {self._action_executor.stats()}")
+        print(f"Latency:\n{self._latency.summary()}")
+        if self._source and self._source.ports:
+            print(f"Device connections: { {port.name: port.connection_stats() for port in self._source.ports} }")
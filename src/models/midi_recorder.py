@@ -0,0 +1,88 @@
+import threading
+import time
+import mido
+
+# 500000 us per beat at 25000 ticks per beat is a 20 us tick, well below what replay can schedule
+DEFAULT_TEMPO = 500000
+DEFAULT_TICKS_PER_BEAT = 25000
+# MIDI files cannot hold realtime messages (clock, start, stop...), they are stored as sequencer
+# specific meta events under the non-commercial manufacturer id; other players just skip them
+REALTIME_MANUFACTURER_ID = 0x7D
+
+def wrap_realtime(msg):
+    return mido.MetaMessage("sequencer_specific", data=[REALTIME_MANUFACTURER_ID, *msg.bytes()], time=msg.time)
+
+def unwrap_realtime(msg):
+    """The realtime message stored by wrap_realtime, or None for any other meta message."""
+    if msg.type == "sequencer_specific" and len(msg.data) > 1 and msg.data[0] == REALTIME_MANUFACTURER_ID:
+        return mido.Message.from_bytes(msg.data[1:], time=msg.time)
+    return None
+
+class MidiRecorder():
+    """
+    Captures the messages the listener receives and saves them as a standard .mid file.
+
+    Messages are stored with their time.perf_counter_ns() receive timestamp and only converted
+    to delta ticks on save, so recording costs an append per message. The file is a single
+    track with one set_tempo, which MidiFileSource replays at the original timing, realtime
+    messages included.
+    """
+    def __init__(self, ticks_per_beat: int = DEFAULT_TICKS_PER_BEAT, tempo: int = DEFAULT_TEMPO):
+        self._ticks_per_beat = ticks_per_beat
+        self._tempo = tempo
+        self._lock = threading.Lock()
+        self._messages = []
+        self._started_at = None
+        self._recording = False
+
+    @property
+    def recording(self):
+        return self._recording
+
+    @property
+    def message_count(self):
+        return len(self._messages)
+
+    @property
+    def ticks_per_beat(self):
+        return self._ticks_per_beat
+
+    def start(self):
+        with self._lock:
+            self._messages = []
+            self._started_at = time.perf_counter_ns()
+            self._recording = True
+
+    def stop(self):
+        self._recording = False
+
+    def record(self, msg, received_at: int = None):
+        if not self._recording or msg.is_meta:
+            return
+        with self._lock:
+            self._messages.append((received_at or time.perf_counter_ns(), msg))
+
+    def to_midi_file(self) -> mido.MidiFile:
+        with self._lock:
+            messages = list(self._messages)
+            started_at = self._started_at or 0
+
+        midi_file = mido.MidiFile(ticks_per_beat=self._ticks_per_beat)
+        track = mido.MidiTrack()
+        track.append(mido.MetaMessage("set_tempo", tempo=self._tempo, time=0))
+        previous_tick = 0
+        for received_at, msg in sorted(messages, key=lambda entry: entry[0]):
+            seconds = max(received_at - started_at, 0) / 1e9
+            tick = round(mido.second2tick(seconds, self._ticks_per_beat, self._tempo))
+            msg = msg.copy(time=tick - previous_tick)
+            track.append(wrap_realtime(msg) if msg.is_realtime else msg)
+            previous_tick = tick
+        track.append(mido.MetaMessage("end_of_track", time=0))
+        midi_file.tracks.append(track)
+        return midi_file
+
+    def save(self, file_path: str):
+        """Write everything recorded since start() to file_path. Returns the number of messages saved."""
+        midi_file = self.to_midi_file()
+        midi_file.save(file_path)
+        return len(midi_file.tracks[0]) - 2
@@ -0,0 +1,455 @@
+import itertools
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+import mido
+from src.models.latency import LatencyHistogram
+from src.models.midi_recorder import unwrap_realtime
+
+# time.sleep can overshoot by a scheduler tick (1-2 ms, up to 15 ms on Windows), the last stretch is spun instead
+SPIN_THRESHOLD = 0.002
+
+def sleep_until(deadline: float, stop_event: threading.Event = None) -> bool:
+    """Wait until time.perf_counter() reaches deadline. Returns False if stop_event was set first."""
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return True
+        if remaining > SPIN_THRESHOLD:
+            if stop_event is None:
+                time.sleep(remaining - SPIN_THRESHOLD)
+            elif stop_event.wait(remaining - SPIN_THRESHOLD):
+                return False
+        elif stop_event is not None and stop_event.is_set():
+            return False
+        else:
+            time.sleep(0)  # releases the GIL so the spin does not stall the pipeline threads
+
+class MidiSource(ABC):
+    """Something the MidiEngine can read mido messages from. Iterating ends when the source is closed or exhausted."""
+
+    @property
+    @abstractmethod
+    def name(self):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def __iter__(self):
+        pass
+
+    @property
+    def ports(self):
+        """The PortSources this source reads from, for reconnecting them when devices come and go."""
+        return []
+
+    def listen(self, callback):
+        """Call callback(msg) for every message until the source is exhausted or closed."""
+        for msg in self:
+            callback(msg)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+class PortSource(MidiSource):
+    """
+    A hardware (or virtual) MIDI input port, read through the backend's input callback.
+
+    listen() hands every message to the callback on the backend's own thread, so there is no
+    blocking receive to wake up: close() from any thread releases the port and returns from
+    listen() or ends the iterator immediately, whether or not messages are arriving.
+
+    When the device is unplugged, disconnect() drops the stale port handle and listen() keeps
+    waiting; reconnect() opens the port again once the device is back (see DeviceMonitor).
+    """
+    def __init__(self, device_name: str):
+        self._device_name = device_name
+        self._port = None
+        self._queue = None
+        self._callback = None
+        self._generation = 0
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._disconnected_at = None
+        self._disconnects = 0
+        self._reconnects = 0
+        self._last_reconnect = 0.0
+        self._max_reconnect = 0.0
+        self._downtime = 0.0
+        self._dropped = 0
+
+    @property
+    def name(self):
+        return self._device_name
+
+    @property
+    def closed(self):
+        return self._closed.is_set()
+
+    @property
+    def ports(self):
+        return [self]
+
+    @property
+    def disconnected(self):
+        return self._disconnected_at is not None
+
+    def connection_stats(self):
+        """Reconnect times and downtime in seconds, dropped counts messages from a stale port handle."""
+        return {
+            "connected": self._port is not None,
+            "disconnects": self._disconnects,
+            "reconnects": self._reconnects,
+            "last_reconnect": self._last_reconnect,
+            "max_reconnect": self._max_reconnect,
+            "downtime": self._downtime,
+            "dropped": self._dropped,
+        }
+
+    def disconnect(self):
+        with self._lock:
+            if self._disconnected_at is not None:
+                return
+            self._disconnected_at = time.perf_counter()
+            self._disconnects += 1
+            self._generation += 1
+            if self._port:
+                self._port.close()
+                self._port = None
+
+    def reconnect(self):
+        """Reopen the port for the current listener. Returns False if nothing is listening or it failed."""
+        with self._lock:
+            if self._closed.is_set() or self._callback is None:
+                return False
+            started = time.perf_counter()
+            if self._port:
+                self._port.close()
+                self._port = None
+            try:
+                self._connect()
+            except (IOError, OSError) as e:
+                print(f"Could not reconnect MIDI device '{self._device_name}': {e}")
+                return False
+            self._last_reconnect = time.perf_counter() - started
+            self._max_reconnect = max(self._max_reconnect, self._last_reconnect)
+            self._reconnects += 1
+            if self._disconnected_at is not None:
+                self._downtime += started - self._disconnected_at
+                self._disconnected_at = None
+            print(f"Reconnected MIDI device '{self._device_name}' in {self._last_reconnect * 1000:.1f} ms")
+            return True
+
+    def open(self):
+        if self._device_name not in mido.get_input_names():
+            raise IOError(f"MIDI device '{self._device_name}' not available.")
+        self._closed.clear()
+
+    def open_disconnected(self):
+        """Open while the device is missing: listen() waits until reconnect() finds it."""
+        self._closed.clear()
+        self.disconnect()
+
+    def close(self):
+        with self._lock:
+            self._closed.set()
+            if self._port:
+                self._port.close()
+                self._port = None
+            if self._queue:
+                self._queue.put(None)
+
+    def listen(self, callback):
+        if self._open_port(callback):
+            self._closed.wait()
+
+    def __iter__(self):
+        self._queue = queue.SimpleQueue()
+        if not self._open_port(self._queue.put):
+            return
+        while (msg := self._queue.get()) is not None:
+            yield msg
+
+    def _open_port(self, callback):
+        with self._lock:
+            if self._closed.is_set():
+                return False
+            self._callback = callback
+            if self._disconnected_at is None:
+                self._connect()
+            return True
+
+    def _connect(self):
+        # messages still queued on a handle from before the last disconnect are counted and dropped
+        generation = self._generation = self._generation + 1
+        callback = self._callback
+
+        def deliver(msg):
+            if generation != self._generation:
+                self._dropped += 1
+                return
+            callback(msg)
+
+        self._port = mido.open_input(self._device_name, callback=deliver)
+
+class MidiFileSource(MidiSource):
+    """
+    Messages from a .mid file, either at the file's timing or as fast as possible.
+
+    Realtime playback schedules every message against its absolute time from the start of the
+    file with sleep_until, so timing errors do not add up, and records how late each message
+    came out in `lateness` (nanoseconds).
+    """
+    def __init__(self, file_path: str, realtime: bool = True):
+        self._file_path = file_path
+        self._realtime = realtime
+        self._midi_file = None
+        self._closed = threading.Event()
+        self._lateness = LatencyHistogram()
+
+    @property
+    def name(self):
+        return self._file_path
+
+    @property
+    def realtime(self):
+        return self._realtime
+
+    @property
+    def lateness(self) -> LatencyHistogram:
+        return self._lateness
+
+    def open(self):
+        self._closed.clear()
+        self._midi_file = mido.MidiFile(self._file_path)
+
+    def close(self):
+        self._closed.set()
+
+    def __iter__(self):
+        if not self._realtime:
+            return (msg for msg in map(self._unwrap, self._midi_file) if not msg.is_meta)
+        return self._play()
+
+    def _play(self):
+        # iterating a MidiFile merges the tracks and converts delta ticks to seconds through the tempo map
+        started = time.perf_counter()
+        offset = 0.0
+        for msg in self._midi_file:
+            offset += msg.time
+            msg = self._unwrap(msg)
+            if msg.is_meta:
+                continue
+            deadline = started + offset
+            if not sleep_until(deadline, self._closed):
+                return
+            self._lateness.record((time.perf_counter() - deadline) * 1e9)
+            yield msg
+
+    def _unwrap(self, msg):
+        # clock and transport messages recorded by MidiRecorder are stored as meta events
+        return (unwrap_realtime(msg) or msg) if msg.is_meta else msg
+
+class MergedSource(MidiSource):
+    """
+    Several sources read at the same time and merged into one stream tagged with each source's name.
+
+    Every source gets its own reader (the backend's callback thread for ports, a small thread for
+    the others) that only appends to that source's bounded queue. listen() drains the queues
+    round robin, one message per source per turn, so a flooding controller gets its share of the
+    pipeline and no more. When a source's queue is full its oldest message is dropped and counted.
+    Ports whose device is not plugged in yet stay in `ports` as disconnected, for the DeviceMonitor.
+    """
+    def __init__(self, sources, max_pending: int = 1024):
+        self._sources = list(sources)
+        self._max_pending = max_pending
+        self._condition = threading.Condition()
+        self._pending = {source.name: deque() for source in self._sources}
+        self._dropped = {source.name: 0 for source in self._sources}
+        self._readers = []
+        self._active_readers = 0
+        self._closed = False
+
+    @property
+    def name(self):
+        return " + ".join(source.name for source in self._sources)
+
+    @property
+    def sources(self):
+        return list(self._sources)
+
+    @property
+    def dropped(self):
+        """Messages dropped per source because its queue was full."""
+        return dict(self._dropped)
+
+    @property
+    def ports(self):
+        return [port for source in self._sources for port in source.ports]
+
+    def open(self):
+        opened = []
+        connected = False
+        for source in self._sources:
+            try:
+                source.open()
+                opened.append(source)
+                connected = True
+            except IOError as e:
+                # one unplugged controller should not keep the others from working
+                if isinstance(source, PortSource):
+                    # kept as a disconnected port, the DeviceMonitor reconnects it once it is plugged in
+                    print(f"MIDI device {source.name} is not plugged in, waiting for it: {e}")
+                    source.open_disconnected()
+                    opened.append(source)
+                else:
+                    print(f"Skipping MIDI source {source.name}: {e}")
+        if not connected:
+            raise IOError("None of the MIDI devices are available.")
+        self._sources = opened
+        self._closed = False
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for source in self._sources:
+            source.close()
+
+    def listen(self, callback):
+        """callback(msg, device, received_at) with the reader's time.perf_counter_ns() timestamp."""
+        for device, (msg, received_at) in self._drain():
+            callback(msg, device, received_at)
+
+    def __iter__(self):
+        return (msg for _, (msg, _) in self._drain())
+
+    def _drain(self):
+        self._start_readers()
+        names = list(self._pending)
+        turn = 0
+        while True:
+            with self._condition:
+                while not self._closed and self._active_readers and not any(self._pending.values()):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                batch = []
+                for offset in range(len(names)):
+                    name = names[(turn + offset) % len(names)]
+                    if self._pending[name]:
+                        batch.append((name, self._pending[name].popleft()))
+                if not batch:
+                    return  # every reader finished and everything was delivered
+                turn += 1  # rotate who goes first
+            yield from batch
+
+    def _start_readers(self):
+        self._active_readers = len(self._sources)
+        for source in self._sources:
+            thread = threading.Thread(target=self._read, args=(source,), name=f"MidiReader-{source.name}", daemon=True)
+            thread.start()
+            self._readers.append(thread)
+
+    def _read(self, source: MidiSource):
+        pending = self._pending[source.name]
+
+        def put(msg, device=None):
+            with self._condition:
+                if len(pending) >= self._max_pending:
+                    pending.popleft()
+                    self._dropped[source.name] += 1
+                pending.append((msg, time.perf_counter_ns()))
+                self._condition.notify()
+
+        try:
+            source.listen(put)
+        except Exception as e:
+            print(f"Error reading MIDI source {source.name}: {e}")
+        finally:
+            with self._condition:
+                self._active_readers -= 1
+                self._condition.notify()
+
+class LoopbackSource(MidiSource):
+    """In-memory source, messages passed to send() come out of the iterator. Meant for tests."""
+    def __init__(self, name: str = "loopback"):
+        self._name = name
+        self._queue = queue.Queue()
+
+    @property
+    def name(self):
+        return self._name
+
+    def send(self, msg):
+        self._queue.put(msg)
+
+    def close(self):
+        self._queue.put(None)
+
+    def __iter__(self):
+        while (msg := self._queue.get()) is not None:
+            yield msg
+
+class SyntheticSource(MidiSource):
+    """
+    Generates note, control change, pitchwheel and clock traffic without hardware.
+
+    `rate` is messages per second (0 sends as fast as possible) and `count` caps the number
+    of messages (None runs until closed). Values are random but reproducible through `seed`.
+    """
+    MESSAGE_TYPES = ("note_on", "control_change", "pitchwheel", "clock")
+
+    def __init__(self, message_types=MESSAGE_TYPES, rate: float = 0, count: int = None, channel: int = 0,
+                 numbers=range(128), seed: int = 0):
+        self._message_types = tuple(message_types)
+        self._rate = rate
+        self._count = count
+        self._channel = channel
+        self._numbers = tuple(numbers)
+        self._random = random.Random(seed)
+        self._closed = False
+
+    @property
+    def name(self):
+        return "synthetic"
+
+    def close(self):
+        self._closed = True
+
+    def generate(self):
+        """Build the next message without any pacing."""
+        match self._random.choice(self._message_types):
+            case "note_on":
+                return mido.Message("note_on", channel=self._channel, note=self._random.choice(self._numbers), velocity=self._random.randint(1, 127))
+            case "note_off":
+                return mido.Message("note_off", channel=self._channel, note=self._random.choice(self._numbers))
+            case "control_change":
+                return mido.Message("control_change", channel=self._channel, control=self._random.choice(self._numbers), value=self._random.randint(0, 127))
+            case "pitchwheel":
+                return mido.Message("pitchwheel", channel=self._channel, pitch=self._random.randint(-8192, 8191))
+            case _:
+                return mido.Message("clock")
+
+    def __iter__(self):
+        interval = 1 / self._rate if self._rate else 0
+        next_time = time.perf_counter()
+        for index in itertools.count():
+            if self._closed or (self._count is not None and index >= self._count):
+                return
+            if interval:
+                next_time += interval
+                sleep_until(next_time)
+            yield self.generate()
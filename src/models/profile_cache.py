@@ -0,0 +1,81 @@
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+
+CACHE_MAGIC = b"STPC"
+CACHE_VERSION = 4  # bump whenever DispatchTable, Binding or WindowMatcher change shape
+_HEADER = struct.Struct("<4sHI")  # magic, version, length of the source signature
+_PAYLOAD = struct.Struct("<Q32s")  # payload length, sha256 of the payload
+
+class ProfileCache():
+    """
+    Binary cache of compiled profiles stored next to the JSON file (`profiles.json.cache`).
+
+    The cache holds the pickled ProfileSnapshot together with the signature (mtime, size, inode)
+    of the JSON file and journal it was built from, so it is only used while the JSON is
+    unchanged and is rebuilt as soon as the JSON is newer. The file is memory-mapped and the
+    payload checked against its sha256 before it is unpickled. The JSON file stays the source of
+    truth; deleting the cache is always safe. The cache is trusted like profiles.json itself.
+    """
+    def __init__(self, file_path: str):
+        self._cache_path = file_path + ".cache"
+
+    @property
+    def cache_path(self):
+        return self._cache_path
+
+    def load(self, signature):
+        """Return the cached snapshot if it was built from `signature`, otherwise None."""
+        try:
+            with open(self._cache_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self._read(mapped, signature)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, signature, snapshot):
+        payload = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        encoded_signature = json.dumps(signature).encode("utf-8")
+        temp_path = self._cache_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(encoded_signature)))
+                file.write(encoded_signature)
+                file.write(_PAYLOAD.pack(len(payload), hashlib.sha256(payload).digest()))
+                file.write(payload)
+            os.replace(temp_path, self._cache_path)
+        except OSError as e:
+            print(f"Could not write profile cache {self._cache_path}: {e}")
+
+    def _read(self, mapped, signature):
+        view = memoryview(mapped)
+        try:
+            magic, version, signature_length = _HEADER.unpack_from(view, 0)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return None
+
+            offset = _HEADER.size
+            cached_signature = json.loads(bytes(view[offset:offset + signature_length]))
+            if cached_signature != json.loads(json.dumps(signature)):
+                return None
+
+            offset += signature_length
+            payload_length, digest = _PAYLOAD.unpack_from(view, offset)
+            payload = view[offset + _PAYLOAD.size:offset + _PAYLOAD.size + payload_length]
+            if len(payload) != payload_length or hashlib.sha256(payload).digest() != digest:
+                print(f"Profile cache {self._cache_path} failed validation, rebuilding it")
+                return None
+
+            try:
+                return pickle.loads(payload)
+            except Exception as e:
+                print(f"Profile cache {self._cache_path} could not be loaded, rebuilding it: {e}")
+                return None
+            finally:
+                payload.release()  # the mmap can only be closed once no view into it is left
+        except (struct.error, ValueError):
+            return None
+        finally:
+            view.release()
@@ -1,11 +1,14 @@
 import json 
-import os 
-import pygetwindow as gw 
 from src.models.midi import Midi
+from src.models.profile_store import ProfileStore
+from src.models.dispatch_table import DispatchTable
+from src.models.window_matcher import WindowMatcher
+from src.models.window_provider import WindowProvider, PyGetWindowProvider
 from src.models.enums import MidiActionType, MidiControlType
 
 class ProfileDetection():
-    def __init__(self):
+    def __init__(self, window_provider: WindowProvider = None):
+        self._window_provider = window_provider or PyGetWindowProvider()
         self._default_profile = {
             "default": { # this is what the users calls the profile
                 "file_path" : "None",
@@ -17,6 +20,7 @@ class ProfileDetection():
             }            
         }
         self._profile_default_name="profiles.json"
+        self._matcher = (None, None)  # (signature, WindowMatcher), swapped as one reference
     
     @property
     def default_profile(self):
@@ -25,8 +29,19 @@ class ProfileDetection():
     @property
     def profile_name(self):
         return self._profile_default_name
+
+    @property
+    def window_provider(self):
+        return self._window_provider
+
+    @property
+    def store(self) -> ProfileStore:
+        """The process-wide store for profiles.json, every read and write goes through it."""
+        return ProfileStore.open(self.profile_name, self.default_profile)
     
     def get_loaded_profiles(self, file_path:str = None):
+        if not file_path or file_path == self.profile_name:
+            return self.store.profiles
         return self._load_profiles(file_path)
 
     def _load_profiles(self, file_path: str = None):
@@ -47,54 +62,57 @@ class ProfileDetection():
             return self.default_profile
 
     def get_active_app(self):
-        active_window = gw.getActiveWindow()
-        if active_window: return active_window.title.lower()
-        return None
+        return self.window_provider.get_active_title()
 
     def get_profile(self, profiles):
-        active_application = self.get_active_app()
-        for _, macros in profiles.items():
-            if macros.get("program_window_name") in active_application:
-                return macros
-        return profiles["default"]
+        return profiles[self.get_profile_name(profiles)]
 
-    def get_profile_by_key(self, id: int, profile, type):
-        profile_data = {}
-        with open(self.profile_name, "r") as file:
-            try:
-                profile_data = json.load(file)
-                _key = f"{id}"
-                return profile_data[str(profile)][type].get(_key, None)
-            except json.JSONDecodeError:
-                pass
-            except Exception as e:
-                print(f"profile detection error: {e}")
-                return None
+    def get_profile_name(self, profiles):
+        return self.match_profile_name(profiles, self.get_active_app())
 
+    def match_profile_name(self, profiles, active_application):
+        return self.get_matcher(profiles).match(active_application)
 
-    def save_profile(self, midi: Midi, id: str = None):
-        profile_data = {}
+    def get_matcher(self, profiles) -> WindowMatcher:
+        """The WindowMatcher for profiles, recompiled only when a window pattern changed."""
+        signature = WindowMatcher.signature(profiles)
+        cached_signature, matcher = self._matcher
+        if matcher is None or signature != cached_signature:
+            matcher = WindowMatcher(profiles)
+            self._matcher = (signature, matcher)
+        return matcher
 
-        if os.path.exists(self.profile_name):
-            with open(self.profile_name, "r") as file:
-                try:
-                    profile_data = json.load(file)
-                except json.JSONDecodeError:
-                    print(f"JSON Decode Error: {file} is corrupted. Replacing with default profiles.")
-                
-        profile_data.setdefault(midi.profile_name, {}).setdefault(midi.control_type.name, {})
+    def compile_profiles(self, profiles=None):
+        """Compile every profile into a DispatchTable, keyed by profile name."""
+        if profiles is None:
+            profiles = self.get_loaded_profiles()
+        return {name: DispatchTable(name, macros) for name, macros in profiles.items() if isinstance(macros, dict)}
+
+    def get_profile_by_key(self, id: int, profile, type):
+        return self.store.get(str(profile), type, f"{id}")
+
+    def save_profile(self, midi: Midi, id: str = None, store = None):
+        """Save the binding described by midi, through `store` (anything with set_binding) if given."""
+        binding = self.build_binding(midi, id)
+        if binding is None:
+            print("NO MATCH")
+            return
+        (store or self.store).set_binding(*binding)
+
+    def build_binding(self, midi: Midi, id: str = None):
+        """(profile, control type, key, binding) for midi, None for control types without bindings."""
         action_type_str = str(midi.action_type.value).lower()
         action_param = self._get_action_type(midi.action_type)
 
         match(midi.control_type.name):
             case MidiControlType.KEY.name:
-                profile_data[midi.profile_name][midi.control_type.name][str(midi.midi_note)] = {
+                return midi.profile_name, midi.control_type.name, str(midi.midi_note), {
                     "action": action_type_str,
                     "params": {action_param: midi.midi_value},
                 }
 
             case MidiControlType.CONTROL_CHANGE.name:
-                profile_data[midi.profile_name][midi.control_type.name][id] = {
+                return midi.profile_name, midi.control_type.name, str(id), {
                     "action": action_type_str,
                     "params": {
                         "cc_control_id": midi.midi_note,
@@ -102,11 +120,7 @@ class ProfileDetection():
                     },
                 }
             case _:
-                print("NO MATCH")
-
-        with open(self.profile_name, "w") as file:
-            json.dump(profile_data, file, indent=4)
-            pass
+                return None
 
     def _get_action_type(self, action_type: MidiActionType):   
         match(action_type):
@@ -118,6 +132,8 @@ class ProfileDetection():
                 return "RUN_SCRIPT"
             case MidiActionType.PRINT_MESSAGE:
                 return "PRINT_MESSAGE"
+            case MidiActionType.MACRO_SEQUENCE:
+                return "MACRO_SEQUENCE"
             case _:
                 return "NONE"
     
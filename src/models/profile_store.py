@@ -0,0 +1,241 @@
+import copy
+import json
+import os
+import threading
+
+class ProfileStore():
+    """
+    The in-memory copy of profiles.json plus an append-only journal of changes.
+
+    Every change is applied in memory and appended as one JSON line to `<file>.journal`
+    (flushed and fsynced), so saving a binding costs the same no matter how large the library
+    is. Once the journal grows past `compact_after` entries it is folded back into the JSON
+    file on a background thread, written to a temp file, fsynced and renamed over the original.
+    A crash at any point leaves a valid JSON file and a journal whose replay is idempotent.
+
+    Use ProfileStore.open(path) so every widget in the process shares the same store.
+    Listeners added with add_listener() get every applied journal entry, or None when the file
+    was edited by hand and reloaded, on the thread that made the change.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, file_path: str, default_profiles: dict = None, compact_after: int = 200):
+        self._file_path = file_path
+        self._journal_path = file_path + ".journal"
+        self._default_profiles = default_profiles or {}
+        self._compact_after = compact_after
+        self._lock = threading.RLock()
+        self._profiles = None
+        self._file_signature = None
+        self._journal_entries = 0
+        self._compaction = None
+        self._listeners = []
+
+    @classmethod
+    def open(cls, file_path: str, default_profiles: dict = None):
+        """Return the shared store for file_path, creating it on first use."""
+        key = os.path.abspath(file_path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(file_path, default_profiles)
+            return cls._instances[key]
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def journal_path(self):
+        return self._journal_path
+
+    @property
+    def journal_entries(self):
+        return self._journal_entries
+
+    @property
+    def profiles(self) -> dict:
+        """The live profile data. Treat it as read-only, change it through the methods below."""
+        with self._lock:
+            # a stat per access so hand edits to the JSON file are not overwritten by the next compaction
+            reloaded = self._profiles is not None and self._get_file_signature() != self._file_signature
+            if self._profiles is None or reloaded:
+                self._load()
+            profiles = self._profiles
+        if reloaded:
+            self._notify(None)
+        return profiles
+
+    def get(self, *path):
+        """Walk the profile data, e.g. get("chrome", "KEY", "35"). Returns None if any part is missing."""
+        node = self.profiles
+        for part in path:
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def add_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def set_binding(self, profile: str, control_type: str, key: str, binding: dict):
+        self._apply({"op": "set", "path": [profile, control_type, str(key)], "value": binding})
+
+    def put_profile(self, profile: str, data: dict):
+        self._apply({"op": "set", "path": [profile], "value": data})
+
+    def delete_profile(self, profile: str):
+        self._apply({"op": "delete", "path": [profile]})
+
+    def apply_batch(self, entries: list):
+        """Apply several journal entries with a single append and fsync."""
+        self._apply(*entries)
+
+    def compact(self):
+        """Fold the journal into the JSON file now, on the calling thread."""
+        with self._lock:
+            snapshot = copy.deepcopy(self.profiles)
+            journal_offset = self._journal_size()
+
+        self._write_atomic(self._file_path, json.dumps(snapshot, indent=4))
+
+        with self._lock:
+            self._file_signature = self._get_file_signature()
+            # keep whatever was journaled while the snapshot was being written
+            with open(self._journal_path, "ab+") as journal:
+                journal.seek(journal_offset)
+                remainder = journal.read().decode("utf-8")
+            self._write_atomic(self._journal_path, remainder)
+            self._journal_entries = remainder.count("\n")
+
+    def wait_for_compaction(self, timeout: float = None):
+        compaction = self._compaction
+        if compaction:
+            compaction.join(timeout)
+
+    @staticmethod
+    def read_profiles(file_path: str):
+        """Read the JSON file and replay its journal without touching the shared store. JSON errors propagate."""
+        with open(file_path, "r") as file:
+            profiles = json.load(file)
+        ProfileStore._replay(profiles, file_path + ".journal")
+        return profiles
+
+    def _load(self):
+        try:
+            with open(self._file_path, "r") as file:
+                self._profiles = json.load(file)
+        except FileNotFoundError:
+            self._profiles = copy.deepcopy(self._default_profiles)
+            self._write_atomic(self._file_path, json.dumps(self._profiles, indent=4))
+        except json.JSONDecodeError:
+            print(f"JSON Decode Error: {self._file_path} is corrupted. Replacing with default profiles.")
+            self._profiles = copy.deepcopy(self._default_profiles)
+            self._write_atomic(self._file_path, json.dumps(self._profiles, indent=4))
+        self._file_signature = self._get_file_signature()
+        self._truncate_torn_entry()
+        self._journal_entries = self._replay(self._profiles, self._journal_path)
+
+    @staticmethod
+    def _replay(profiles: dict, journal_path: str):
+        entries = 0
+        try:
+            with open(journal_path, "r") as journal:
+                for line in journal:
+                    try:
+                        ProfileStore._apply_entry(profiles, json.loads(line))
+                        entries += 1
+                    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        # a crash mid-append leaves a partial last line, everything before it is intact
+                        print(f"Skipping unreadable journal entry in {journal_path}")
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @staticmethod
+    def _apply_entry(profiles: dict, entry: dict):
+        *parents, last = entry["path"]
+        node = profiles
+        for part in parents:
+            node = node.setdefault(part, {})
+        match entry["op"]:
+            case "set":
+                node[last] = entry["value"]
+            case "delete":
+                node.pop(last, None)
+
+    def _apply(self, *entries: dict):
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+        with self._lock:
+            profiles = self.profiles
+            for entry in entries:
+                self._apply_entry(profiles, copy.deepcopy(entry))
+            with open(self._journal_path, "a", newline="\n") as journal:
+                journal.write(lines)
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._journal_entries += len(entries)
+            if self._journal_entries >= self._compact_after and not (self._compaction and self._compaction.is_alive()):
+                self._compaction = threading.Thread(target=self._compact_in_background, daemon=True)
+                self._compaction.start()
+        for entry in entries:
+            self._notify(entry)
+
+    def _truncate_torn_entry(self):
+        # the next append would be glued onto a partial last line and be lost with it on replay
+        try:
+            with open(self._journal_path, "rb+") as journal:
+                content = journal.read()
+                if content and not content.endswith(b"\n"):
+                    print(f"Dropping a partial last entry from {self._journal_path}")
+                    journal.truncate(content.rfind(b"\n") + 1)
+                    journal.flush()
+                    os.fsync(journal.fileno())
+        except FileNotFoundError:
+            pass
+
+    def _notify(self, entry):
+        for callback in list(self._listeners):
+            try:
+                callback(entry)
+            except Exception as e:
+                print(f"Profile store listener failed: {e}")
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except OSError as e:
+            print(f"Profile store compaction failed, the journal is kept: {e}")
+
+    def _get_file_signature(self):
+        try:
+            stat = os.stat(self._file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self._journal_path)
+        except OSError:
+            return 0
+
+    def _write_atomic(self, file_path: str, content: str):
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w", newline="\n") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+        if os.name != "nt":
+            # make the rename itself durable
+            directory = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+from collections import namedtuple
+from src.models.dispatch_table import DispatchTable
+from src.models.profile_cache import ProfileCache
+from src.models.profile_store import ProfileStore
+from src.models.window_matcher import WindowMatcher
+
+# profiles is the raw json data, dispatch_tables the compiled DispatchTable per profile name and
+# matcher the WindowMatcher for this profile set.
+# A snapshot is never mutated, a reload builds a new one and swaps the reference.
+ProfileSnapshot = namedtuple("ProfileSnapshot", ["profiles", "dispatch_tables", "matcher"])
+
+class ProfileWatcher(threading.Thread):
+    """
+    Polls profiles.json and its journal for changes and recompiles the profiles that changed.
+
+    The listener reads `snapshot` once per message; a reload happens on this thread and
+    replaces the snapshot in a single assignment, so the listener never sees a half built table.
+    The first load comes from the ProfileCache when it matches the files on disk. The cache is
+    written after a cold start and whenever the JSON file itself changes, not on journal appends.
+    """
+    def __init__(self, file_path: str = "profiles.json", interval: float = 0.05, on_reload=None, use_cache: bool = True):
+        super().__init__(daemon=True)
+        self._file_path = file_path
+        self._interval = interval
+        self._on_reload = on_reload
+        self._profile_cache = ProfileCache(file_path) if use_cache else None
+        self._stop_event = threading.Event()
+        self._file_signature = None
+        self._reload_count = 0
+        self._snapshot = ProfileSnapshot({}, {}, WindowMatcher({}))
+        self.check()
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def snapshot(self) -> ProfileSnapshot:
+        return self._snapshot
+
+    @property
+    def on_reload(self):
+        return self._on_reload
+
+    @on_reload.setter
+    def on_reload(self, callback):
+        self._on_reload = callback
+
+    @property
+    def reload_count(self):
+        return self._reload_count
+
+    def run(self):
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Profile watcher could not reload {self.file_path}: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def check(self):
+        """Reload if the file changed since the last check. Returns True when a new snapshot was published."""
+        signature = self._get_file_signature()
+        if signature is None or signature == self._file_signature:
+            return False
+
+        if self._file_signature is None and self._profile_cache:
+            cached = self._profile_cache.load(signature)
+            if cached:
+                self._file_signature = signature
+                self._set_snapshot(cached)
+                return True
+
+        try:
+            # side panel edits land in the store's journal first, read_profiles replays it on top of the JSON
+            profiles = ProfileStore.read_profiles(self.file_path)
+        except (OSError, json.JSONDecodeError) as e:
+            # most likely caught the file mid-write, keep the old tables and retry on the next poll
+            print(f"Profile watcher could not read {self.file_path}: {e}")
+            return False
+
+        previous_signature = self._file_signature
+        self._file_signature = signature
+        if not isinstance(profiles, dict):
+            return False
+
+        self._publish(profiles)
+        # a journal append (a side panel save) does not rewrite the cache, pickling every table per edit
+        # costs far more than it saves; a cold start, compaction or hand edit of the JSON file does
+        if self._profile_cache and (previous_signature is None or previous_signature[:3] != signature[:3]):
+            self._profile_cache.save(signature, self._snapshot)
+        return True
+
+    def _publish(self, profiles: dict):
+        previous = self._snapshot
+        dispatch_tables = {}
+        for name, macros in profiles.items():
+            if not isinstance(macros, dict):
+                continue
+            if previous.profiles.get(name) == macros and name in previous.dispatch_tables:
+                dispatch_tables[name] = previous.dispatch_tables[name]  # unchanged, reuse the compiled table
+                continue
+            try:
+                dispatch_tables[name] = DispatchTable(name, macros)
+            except Exception as e:
+                # one broken profile must not take the others, or this thread, down with it
+                print(f"Could not compile profile '{name}', {'keeping its previous bindings' if name in previous.dispatch_tables else 'skipping it'}: {e}")
+                if name in previous.dispatch_tables:
+                    dispatch_tables[name] = previous.dispatch_tables[name]
+
+        try:
+            matcher = WindowMatcher(profiles)
+        except Exception as e:
+            print(f"Could not compile the window patterns, keeping the previous ones: {e}")
+            matcher = previous.matcher
+        self._set_snapshot(ProfileSnapshot(profiles, dispatch_tables, matcher))
+
+    def _set_snapshot(self, snapshot: ProfileSnapshot):
+        self._snapshot = snapshot
+        self._reload_count += 1
+        if self._on_reload:
+            self._on_reload(self._snapshot)
+
+    def _get_file_signature(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        try:
+            journal = os.stat(self.file_path + ".journal")
+            journal_signature = (journal.st_mtime_ns, journal.st_size, journal.st_ino)
+        except OSError:
+            journal_signature = None
+        # inode covers replace-by-rename, size covers writes landing inside the same mtime tick
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino, journal_signature)
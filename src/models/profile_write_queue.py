@@ -0,0 +1,106 @@
+import threading
+import time
+from src.models.profile_store import ProfileStore
+
+class ProfileWriteQueue(threading.Thread):
+    """
+    Write-behind buffer in front of a ProfileStore for edits made in the editor.
+
+    Edits are held until nothing changed for `delay` seconds, or `max_delay` after the first
+    one, then written with ProfileStore.apply_batch: one journal append and one fsync for the
+    whole batch. Only the latest edit of each (profile, control type, key) is written, so
+    clicking through a bank of keys costs a single write. pending() lets readers see edits
+    that are not on disk yet. The thread starts with the first edit.
+    """
+    def __init__(self, store: ProfileStore, delay: float = 0.3, max_delay: float = 2.0):
+        super().__init__(daemon=True)
+        self._store = store
+        self._delay = delay
+        self._max_delay = max_delay
+        self._condition = threading.Condition()
+        self._pending = {}  # (profile, control type, key) -> binding
+        self._deadline = None
+        self._first_queued = None
+        self._stopped = False
+        self._queued = 0
+        self._written = 0
+        self._flushes = 0
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def delay(self):
+        return self._delay
+
+    def stats(self):
+        """Edits queued, bindings written, batches written and edits replaced before reaching the disk."""
+        with self._condition:
+            return {
+                "queued": self._queued,
+                "written": self._written,
+                "flushes": self._flushes,
+                "coalesced": self._queued - self._written - len(self._pending),
+            }
+
+    def set_binding(self, profile: str, control_type: str, key, binding: dict):
+        if self._stopped or self._delay <= 0:
+            self._store.set_binding(profile, control_type, key, binding)
+            return
+        with self._condition:
+            self._queued += 1
+            self._pending[str(profile), control_type, str(key)] = binding
+            now = time.monotonic()
+            if self._first_queued is None:
+                self._first_queued = now
+            self._deadline = min(now + self._delay, self._first_queued + self._max_delay)
+            self._condition.notify()
+            if not self.is_alive():
+                self.start()
+
+    def pending(self, profile: str, control_type: str, key):
+        """The queued binding for this key, None when nothing is waiting to be written."""
+        with self._condition:
+            return self._pending.get((str(profile), control_type, str(key)))
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+            self.flush()
+
+    def flush(self):
+        """Write everything queued now. Returns the number of bindings written."""
+        with self._condition:
+            batch = self._pending
+            self._pending = {}
+            self._deadline = None
+            self._first_queued = None
+            if not batch:
+                return 0
+            try:
+                self._store.apply_batch([{"op": "set", "path": list(path), "value": binding} for path, binding in batch.items()])
+            except OSError as e:
+                print(f"Could not save profile edits, they are kept for the next flush: {e}")
+                self._pending = batch
+                self._first_queued = time.monotonic()
+                self._deadline = self._first_queued + self._delay
+                return 0
+            self._written += len(batch)
+            self._flushes += 1
+            return len(batch)
+
+    def stop(self):
+        """Write whatever is still queued and stop the timer, later edits are written straight away."""
+        self.flush()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
@@ -0,0 +1,169 @@
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+# Runs inside each pooled interpreter. Requests and replies are one JSON object per line on
+# stdin/stdout; the script's own prints are sent to stderr and its stdin is the null device
+# so they cannot break the protocol.
+WORKER_SOURCE = r"""
+import json, os, runpy, sys, traceback
+protocol, requests = sys.stdout, sys.stdin
+sys.stdout = sys.stderr
+sys.stdin = open(os.devnull)  # input() in a script must not eat the next request
+for line in requests:
+    request = json.loads(line)
+    script = request["script"]
+    sys.argv = [script]
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    try:
+        runpy.run_path(script, init_globals={"midi_message": request["message"]}, run_name="__main__")
+        reply = {"ok": True}
+    except SystemExit:
+        reply = {"ok": True}
+    except BaseException:
+        reply = {"ok": False, "error": traceback.format_exc()}
+    protocol.write(json.dumps(reply) + "\n")
+    protocol.flush()
+"""
+
+def message_to_dict(msg):
+    """The parts of a mido message a script can use, exposed to scripts as `midi_message`."""
+    if msg is None:
+        return {}
+    message = {"type": msg.type}
+    for attribute in ("channel", "note", "velocity", "control", "value", "pitch"):
+        if hasattr(msg, attribute):
+            message[attribute] = getattr(msg, attribute)
+    return message
+
+class ScriptWorker():
+    """One pooled interpreter. Replies are read on a thread so a hung script can time out."""
+    def __init__(self, python: str = sys.executable):
+        self._process = subprocess.Popen([python, "-u", "-c", WORKER_SOURCE], stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE, text=True, bufsize=1)
+        self._replies = queue.Queue()
+        self._reader = threading.Thread(target=self._read_replies, daemon=True)
+        self._reader.start()
+
+    @property
+    def alive(self):
+        return self._process.poll() is None
+
+    def run(self, script: str, message: dict = None, timeout: float = None):
+        """The worker's reply, None if the script timed out or the worker died."""
+        try:
+            self._process.stdin.write(json.dumps({"script": script, "message": message or {}}) + "\n")
+            self._process.stdin.flush()
+            reply = self._replies.get(timeout=timeout)
+        except (OSError, queue.Empty):
+            return None
+        return json.loads(reply) if reply else None
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+            self._process.wait(1)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+
+    def kill(self):
+        self._process.kill()
+
+    def _read_replies(self):
+        for line in self._process.stdout:
+            self._replies.put(line)
+        self._replies.put(None)  # worker exited
+
+class ScriptWorkerPool():
+    """
+    A few pre-started Python interpreters that run RUN_SCRIPT scripts on request.
+
+    Each script runs in an already warm process, so a trigger skips interpreter startup and
+    re-importing modules the worker has already loaded. A worker that dies, or whose script
+    runs longer than `timeout` seconds, is replaced.
+    """
+    def __init__(self, size: int = 2, python: str = sys.executable, timeout: float = 30.0):
+        self._size = size
+        self._python = python
+        self._timeout = timeout
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    def start(self):
+        with self._lock:
+            while len(self._workers) < self._size:
+                worker = ScriptWorker(self._python)
+                self._workers.append(worker)
+                self._idle.put(worker)
+
+    def run(self, script: str, message: dict = None):
+        """Run a script on the next free worker and wait for it. Returns True on success."""
+        worker = self._idle.get()
+        result = worker.run(script, message, self._timeout)
+        if result is None:
+            print(f"Script worker did not finish {script}, restarting it")
+            self._idle.put(self._replace(worker))
+            return False
+
+        self._idle.put(worker)
+        if not result["ok"]:
+            print(f"Error running script {script}: {result['error']}")
+        return result["ok"]
+
+    def close(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers = []
+            self._idle = queue.Queue()
+
+    def _replace(self, worker: ScriptWorker):
+        with self._lock:
+            worker.kill()
+            replacement = ScriptWorker(self._python)
+            if worker in self._workers:
+                self._workers[self._workers.index(worker)] = replacement
+            return replacement
+
+class InProcessScriptRunner():
+    """
+    Runs trusted scripts inside this process from cached code objects.
+
+    The compiled code is cached per path and recompiled only when the file's mtime changes.
+    Scripts run on the caller's thread and share the app's interpreter, so only use this for
+    scripts you trust not to block or change global state.
+    """
+    def __init__(self):
+        self._cache = {}  # path -> (mtime_ns, code)
+        self._lock = threading.Lock()
+
+    def run(self, script: str, message: dict = None):
+        try:
+            code = self._get_code(script)
+            exec(code, {"__name__": "__main__", "__file__": script, "midi_message": message or {}})
+            return True
+        except SystemExit:
+            return True
+        except Exception as e:
+            print(f"Error running script {script}: {e}")
+            return False
+
+    def _get_code(self, script: str):
+        mtime = os.stat(script).st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(script)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with open(script, "r") as file:
+            code = compile(file.read(), script, "exec")
+        with self._lock:
+            self._cache[script] = (mtime, code)
+        return code
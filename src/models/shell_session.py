@@ -0,0 +1,127 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+
+class ShellSession():
+    """
+    One long-lived shell that runs commands fed over stdin.
+
+    After each command the session echoes a unique sentinel with the exit code, which marks
+    the command as finished. Commands read stdin from the null device so they cannot swallow
+    the next command. On POSIX each command runs in a subshell, on Windows the working
+    directory is reset after each command; environment changes made with `set` still stick
+    for the life of a cmd.exe session, so bind those as isolated.
+    """
+    def __init__(self):
+        self._sentinel = f"__SYMPHONIC_DONE_{uuid.uuid4().hex}__"
+        self._cwd = os.getcwd()
+        self._lines = queue.Queue()
+        if os.name == "nt":
+            args = ["cmd.exe", "/D", "/Q", "/K"]
+        else:
+            args = ["/bin/sh"]
+        self._process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+
+    @property
+    def alive(self):
+        return self._process.poll() is None
+
+    def run(self, command: str, timeout: float = None):
+        """Run a command and return its exit code, or None if it timed out or the shell died."""
+        try:
+            self._process.stdin.write(self._wrap(command))
+            self._process.stdin.flush()
+        except OSError:
+            return None
+
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0, deadline - time.monotonic()) if deadline else None)
+            except queue.Empty:
+                return None
+            if line is None:
+                return None
+            # output that does not end in a newline has the sentinel glued onto its last line
+            output, sentinel, code = line.partition(self._sentinel)
+            if sentinel:
+                if output:
+                    print(output)
+                code = code.strip()
+                return int(code) if code.lstrip("-").isdigit() else None
+            print(line, end="")
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+            self._process.wait(1)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+
+    def _wrap(self, command: str):
+        if os.name == "nt":
+            return f"({command}) < NUL\necho {self._sentinel} %ERRORLEVEL%\ncd /d \"{self._cwd}\"\n"
+        return f"( {command}\n) < /dev/null\necho {self._sentinel} $?\n"
+
+    def _read_output(self):
+        for line in self._process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)  # shell exited
+
+class ShellSessionPool():
+    """
+    A few warm ShellSessions shared by RUN_COMMAND bindings. Dead or hung sessions are replaced.
+
+    A command never waits for a session: when every session is busy it runs in a fresh shell
+    instead, so slow commands cannot hold up the others. The default size matches the
+    ActionExecutor's default worker count.
+    """
+    def __init__(self, size: int = 4, timeout: float = 30.0):
+        self._size = size
+        self._timeout = timeout
+        self._idle = queue.Queue()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    def start(self):
+        with self._lock:
+            while len(self._sessions) < self._size:
+                session = ShellSession()
+                self._sessions.append(session)
+                self._idle.put(session)
+
+    def run(self, command: str):
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            return subprocess.run(command, shell=True, stdin=subprocess.DEVNULL).returncode
+        code = session.run(command, self._timeout)
+        if code is None:
+            print(f"Shell session did not finish '{command}', restarting it")
+            session = self._replace(session)
+        self._idle.put(session)
+        return code
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+            self._idle = queue.Queue()
+
+    def _replace(self, session: ShellSession):
+        with self._lock:
+            session.close()
+            replacement = ShellSession()
+            if session in self._sessions:
+                self._sessions[self._sessions.index(session)] = replacement
+            return replacement
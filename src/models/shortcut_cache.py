@@ -0,0 +1,126 @@
+import threading
+from keyboard import parse_hotkey, press, release
+from src.models.action_scheduler import parse_sequence
+from src.models.enums import MidiActionType
+
+def compile_shortcut(keys: str, parse=parse_hotkey):
+    """
+    A hotkey string such as "ctrl+t" or "alt+F4, enter" as the ((scan code, pressed), ...)
+    events keyboard.send would produce for it: each step's keys pressed in order, then released
+    in reverse. Raises ValueError when the string is empty or names a key the layout lacks.
+    """
+    if not isinstance(keys, str) or not keys.strip():
+        raise ValueError("Shortcut is empty")
+    try:
+        steps = parse(keys.strip())
+    except ValueError as e:
+        raise ValueError(f"Invalid shortcut '{keys}': {e.args[0] if e.args else e}") from None
+    events = []
+    for step in steps:
+        codes = [scan_codes[0] for scan_codes in step]
+        events.extend((code, True) for code in codes)
+        events.extend((code, False) for code in reversed(codes))
+    return tuple(events)
+
+def profile_shortcuts(profile: dict):
+    """Every fixed shortcut string a profile can send, from KEYBOARD_SHORTCUT bindings, mapping zones and MACRO_SEQUENCE keys steps."""
+    shortcuts = set()
+    for section in profile.values():
+        if not isinstance(section, dict):
+            continue
+        for conf in section.values():
+            if not isinstance(conf, dict):
+                continue
+            mapping = conf.get("mapping")
+            zones = mapping.get("zones") if isinstance(mapping, dict) else None
+            for zone in [conf] + [{**conf, **zone} for zone in zones or [] if isinstance(zone, dict)]:
+                shortcuts.update(_conf_shortcuts(zone))
+    # "{value}" is only known once a message arrives, those are compiled on first use
+    return {keys for keys in shortcuts if isinstance(keys, str) and keys.strip() and "{value}" not in keys}
+
+def _conf_shortcuts(conf: dict):
+    params = conf.get("params")
+    if not isinstance(params, dict):
+        return []
+    try:
+        action = int(conf.get("action"))
+    except (TypeError, ValueError):
+        return []
+    match action:
+        case MidiActionType.KEYBOARD_SHORTCUT.value:
+            return [params.get("KEYBOARD_SHORTCUT")]
+        case MidiActionType.MACRO_SEQUENCE.value:
+            try:
+                return [value for _, kind, value in parse_sequence(params.get("MACRO_SEQUENCE", "")) if kind == "keys"]
+            except ValueError:
+                return []
+    return []
+
+class ShortcutCache():
+    """
+    Hotkey strings compiled to scan-code events once per profile, so sending a shortcut only
+    replays press and release calls instead of parsing the string and resolving every key name.
+
+    load(profiles) runs whenever the profile set is (re)loaded; profiles that did not change keep
+    their compiled shortcuts. Invalid shortcuts are reported there and do nothing when triggered.
+    Strings that were not seen at load time are compiled on first use and kept.
+    """
+    def __init__(self, parse=parse_hotkey, press=press, release=release):
+        self._parse = parse
+        self._press = press
+        self._release = release
+        self._lock = threading.Lock()
+        self._profiles = {}  # profile name -> (profile data, {keys: events})
+        self._events = {}  # keys -> events or None when invalid, every profile merged, replaced on load
+
+    def load(self, profiles: dict):
+        """Compile the shortcuts of every profile that changed since the last load."""
+        with self._lock:
+            compiled = {}
+            for name, profile in profiles.items():
+                if not isinstance(profile, dict):
+                    continue
+                previous = self._profiles.get(name)
+                if previous and previous[0] == profile:
+                    compiled[name] = previous
+                    continue
+                shortcuts = {}
+                for keys in profile_shortcuts(profile):
+                    try:
+                        shortcuts[keys] = compile_shortcut(keys, self._parse)
+                    except ValueError as e:
+                        print(f"Profile '{name}': {e}")
+                        shortcuts[keys] = None
+                    except OSError as e:
+                        print(f"Could not read the keyboard layout, shortcuts are compiled on first use: {e}")
+                        break
+                compiled[name] = (profile, shortcuts)
+
+            events = {}
+            for _, shortcuts in compiled.values():
+                events.update(shortcuts)
+            self._profiles = compiled
+            self._events = events
+
+    def events(self, keys: str):
+        """The compiled events for keys, compiling them now when no loaded profile has them."""
+        try:
+            events = self._events[keys]
+        except KeyError:
+            try:
+                events = compile_shortcut(keys, self._parse)
+            except ValueError:
+                events = None
+            self._events[keys] = events
+        return events
+
+    def send(self, keys: str):
+        events = self.events(keys)
+        if events is None:
+            print(f"Invalid shortcut: '{keys}'")
+            return
+        for scan_code, pressed in events:
+            if pressed:
+                self._press(scan_code)
+            else:
+                self._release(scan_code)
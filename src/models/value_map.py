@@ -0,0 +1,135 @@
+import math
+from array import array
+
+CURVES = ("linear", "log", "exp", "step", "table")
+CC_VALUES = 128
+PITCHWHEEL_VALUES = 16384
+PITCHWHEEL_OFFSET = 8192
+
+class ValueMap():
+    """
+    The "mapping" of a CONTROL_CHANGE or PITCHWHEEL binding, compiled into a lookup table.
+
+    Every possible input value (128 for CC, 16384 for pitchwheel) is run through the range,
+    threshold, zones and response curve once, when the profile loads. lookup(msg) is then two
+    indexed reads: the value's slot in a packed array and the action conf for that slot, with
+    "{value}" in its string params already replaced by the mapped value. Input values outside
+    the range, below the threshold or in no zone map to None and trigger nothing.
+
+        "mapping": {
+            "input": [lo, hi],      values outside do nothing, defaults to the full range
+            "threshold": 64,        values below do nothing
+            "output": [lo, hi],     defaults to the input range
+            "curve": "linear" | "log" | "exp" | "step" | "table",
+            "factor": 9,            steepness of log (default 9) and exp (default 4)
+            "steps": 4,             number of levels for step
+            "table": [0, 10, 80],   output points spread evenly over the input, interpolated
+            "decimals": 0,          rounding of the mapped value
+            "zones": [{"input": [0, 63], "action": "1", "params": {...}}, ...]
+        }
+
+    Raises ValueError when the mapping is invalid.
+    """
+    def __init__(self, conf: dict, pitchwheel: bool = False):
+        mapping = conf["mapping"]
+        if not isinstance(mapping, dict):
+            raise ValueError("mapping must be an object")
+        self._attribute = "pitch" if pitchwheel else "value"
+        self._offset = PITCHWHEEL_OFFSET if pitchwheel else 0
+        size = PITCHWHEEL_VALUES if pitchwheel else CC_VALUES
+        first, last = -self._offset, size - 1 - self._offset
+
+        low, high = self._range(mapping.get("input"), first, last)
+        if "threshold" in mapping:
+            low = max(low, float(mapping["threshold"]))
+        curve = mapping.get("curve", "linear")
+        if curve not in CURVES:
+            raise ValueError(f"unknown curve '{curve}', expected one of {', '.join(CURVES)}")
+        out_low, out_high = (0.0, 1.0) if curve == "table" else self._range(mapping.get("output"), low, high)
+        shape = self._curve(curve, mapping)
+        decimals = int(mapping.get("decimals", 0))
+        zones = mapping.get("zones") or [None]
+        if not isinstance(zones, list) or not all(zone is None or isinstance(zone, dict) for zone in zones):
+            raise ValueError("zones must be a list of objects")
+        zone_ranges = [self._range(zone.get("input"), low, high) if zone else (low, high) for zone in zones]
+
+        self._confs = [None]  # slot 0: nothing to do
+        self._indices = array("H", bytes(2 * size))
+        slots = {}
+        for index in range(size):
+            value = index - self._offset
+            if not low <= value <= high:
+                continue
+            zone = next((number for number, (zone_low, zone_high) in enumerate(zone_ranges) if zone_low <= value <= zone_high), None)
+            if zone is None:
+                continue
+            position = (value - low) / (high - low) if high > low else 1.0
+            mapped = round(out_low + shape(position) * (out_high - out_low), decimals)
+            if decimals <= 0:
+                mapped = int(mapped)
+            slot = slots.get((zone, mapped))
+            if slot is None:
+                slot = slots[zone, mapped] = len(self._confs)
+                self._confs.append(self._resolve(conf, zones[zone], mapped))
+            self._indices[index] = slot
+
+    @property
+    def outputs(self):
+        """Distinct action confs the table can return."""
+        return len(self._confs) - 1
+
+    def lookup(self, msg):
+        """The action conf for the message's value, None when the value maps to nothing."""
+        return self._confs[self._indices[getattr(msg, self._attribute) + self._offset]]
+
+    @staticmethod
+    def _range(bounds, low, high):
+        if bounds is None:
+            return float(low), float(high)
+        if not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+            raise ValueError(f"range must be [low, high], got {bounds}")
+        return float(bounds[0]), float(bounds[1])
+
+    @staticmethod
+    def _factor(mapping: dict, default: float):
+        factor = float(mapping.get("factor", default))
+        if factor <= 0:
+            raise ValueError(f"factor must be greater than 0, got {factor}")
+        return factor
+
+    @staticmethod
+    def _curve(curve: str, mapping: dict):
+        match curve:
+            case "linear":
+                return lambda x: x
+            case "log":
+                factor = ValueMap._factor(mapping, 9)
+                return lambda x: math.log1p(factor * x) / math.log1p(factor)
+            case "exp":
+                factor = ValueMap._factor(mapping, 4)
+                return lambda x: math.expm1(factor * x) / math.expm1(factor)
+            case "step":
+                steps = int(mapping.get("steps", 2))
+                if steps < 1:
+                    raise ValueError("steps must be at least 1")
+                return lambda x: min(int(x * steps), steps - 1) / (steps - 1) if steps > 1 else 0.0
+            case "table":
+                points = [float(point) for point in mapping.get("table") or []]
+                if len(points) < 2:
+                    raise ValueError("table needs at least two points")
+                def interpolate(x):
+                    position = x * (len(points) - 1)
+                    index = min(int(position), len(points) - 2)
+                    return points[index] + (points[index + 1] - points[index]) * (position - index)
+                return interpolate
+
+    @staticmethod
+    def _resolve(conf: dict, zone: dict, mapped):
+        resolved = {key: value for key, value in conf.items() if key != "mapping"}
+        if zone:
+            resolved.update({key: value for key, value in zone.items() if key != "input"})
+        text = str(mapped)
+        resolved["params"] = {key: value.replace("{value}", text) if isinstance(value, str) else value
+                              for key, value in resolved.get("params", {}).items()}
+        resolved["value"] = mapped
+        return resolved
@@ -0,0 +1,158 @@
+import fnmatch
+import re
+from collections import deque
+from functools import lru_cache
+
+# higher wins when two patterns have the same priority
+MATCH_MODES = {"substring": 0, "regex": 1, "glob": 2, "exact": 3}
+
+class WindowMatcher():
+    """
+    Resolves a window title to a profile name using every profile's `program_window_name`.
+
+    Patterns are compiled once per profile set: substrings into an Aho-Corasick automaton,
+    glob patterns into one combined regex, regex patterns one by one and exact titles into a
+    dict. A profile can set `match_mode` (substring, exact, glob, regex; substring by default)
+    and an integer `priority`. When several profiles match, the highest priority wins, then the more specific
+    match mode, then the longer pattern, then the profile that comes first in the file.
+    """
+    def __init__(self, profiles: dict, default_profile: str = "default", cache_size: int = 256):
+        self._default_profile = default_profile
+        self._patterns = []  # (rank, profile name), indexed by pattern id
+        self._exact = {}
+        self._automaton = _AhoCorasick()
+        self._combined_regex = None
+        self._regexes = []  # (compiled pattern, pattern id), user regexes are searched one by one
+        self._cache_size = cache_size
+        self._compile(profiles)
+        self._match_cached = lru_cache(maxsize=cache_size)(self._match)
+
+    def __getstate__(self):
+        # the memo is rebuilt empty when a cached matcher is loaded
+        state = dict(self.__dict__)
+        del state["_match_cached"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._match_cached = lru_cache(maxsize=self._cache_size)(self._match)
+
+    @staticmethod
+    def signature(profiles: dict):
+        """The parts of a profile set a matcher is compiled from, equal signatures give the same matcher."""
+        return tuple((name, macros.get("program_window_name"), macros.get("match_mode"), macros.get("priority"))
+                     for name, macros in profiles.items() if isinstance(macros, dict))
+
+    @property
+    def default_profile(self):
+        return self._default_profile
+
+    def match(self, title):
+        """Return the profile name for a window title, falling back to the default profile."""
+        if not title:
+            return self._default_profile
+        return self._match_cached(title)
+
+    def cache_info(self):
+        return self._match_cached.cache_info()
+
+    def _match(self, title):
+        title = title.lower()
+        candidates = set(self._automaton.search(title))
+        if title in self._exact:
+            candidates.add(self._exact[title])
+        if self._combined_regex:
+            groups = self._combined_regex.match(title).groupdict()
+            candidates.update(int(group[1:]) for group, value in groups.items() if value is not None)
+        candidates.update(pattern_id for regex, pattern_id in self._regexes if regex.search(title))
+
+        if not candidates:
+            return self._default_profile
+        return self._patterns[max(candidates, key=lambda pattern_id: self._patterns[pattern_id][0])][1]
+
+    def _compile(self, profiles: dict):
+        globs = []
+        for order, (name, macros) in enumerate(profiles.items()):
+            if name == self._default_profile or not isinstance(macros, dict):
+                continue
+            pattern = macros.get("program_window_name")
+            if not pattern or not isinstance(pattern, str):
+                continue
+
+            mode = str(macros.get("match_mode", "substring")).lower()
+            if mode not in MATCH_MODES:
+                print(f"Unknown match_mode '{mode}' for profile '{name}', using substring")
+                mode = "substring"
+            try:
+                priority = int(macros.get("priority", 0))
+            except (TypeError, ValueError):
+                priority = 0
+
+            pattern_id = len(self._patterns)
+            match mode:
+                case "substring":
+                    self._automaton.add(pattern.lower(), pattern_id)
+                case "exact":
+                    # first profile in the file keeps an exact title it shares with a later one
+                    self._exact.setdefault(pattern.lower(), pattern_id)
+                case "glob":
+                    globs.append((fnmatch.translate(pattern.lower()), pattern_id))
+                case "regex":
+                    # kept apart from the combined regex: inline flags, named groups and backreferences stay valid
+                    try:
+                        self._regexes.append((re.compile(pattern, re.IGNORECASE | re.DOTALL), pattern_id))
+                    except re.error as e:
+                        print(f"Invalid regex for profile '{name}': {e}")
+                        continue
+
+            self._patterns.append(((priority, MATCH_MODES[mode], len(pattern), -order), name))
+
+        self._automaton.build()
+        if globs:
+            # each optional lookahead records whether its glob matched, so one pass reports every hit
+            try:
+                self._combined_regex = re.compile("".join(f"(?:(?={glob})(?P<g{pattern_id}>))?" for glob, pattern_id in globs),
+                                                  re.IGNORECASE | re.DOTALL)
+            except re.error as e:
+                print(f"Could not combine the glob patterns, matching them one by one: {e}")
+                self._regexes.extend((re.compile(glob, re.IGNORECASE | re.DOTALL), pattern_id) for glob, pattern_id in globs)
+
+class _AhoCorasick():
+    """Minimal Aho-Corasick automaton returning the ids of every pattern found in a text."""
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+    def add(self, pattern: str, pattern_id: int):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(pattern_id)
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(char, 0)
+                self._output[next_node] = self._output[next_node] + self._output[self._fail[next_node]]
+
+    def search(self, text: str):
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            yield from self._output[node]
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+class WindowProvider(ABC):
+    """Source of the foreground window title, swappable so tests can run without a desktop."""
+
+    @abstractmethod
+    def get_active_title(self):
+        """Return the lowercased title of the foreground window, or None."""
+        pass
+
+class PyGetWindowProvider(WindowProvider):
+    def __init__(self):
+        self._gw = None
+
+    def get_active_title(self):
+        if self._gw is None:
+            # pygetwindow raises on import on unsupported platforms, so only load it when it is used
+            import pygetwindow
+            self._gw = pygetwindow
+        active_window = self._gw.getActiveWindow()
+        if active_window: return active_window.title.lower()
+        return None
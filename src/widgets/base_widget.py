@@ -2,6 +2,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QSizePolicy
 from abc import ABC, abstractmethod
 from src.widgets.side_panel import SidePanel
 from src.models.profile_detection import ProfileDetection
+from src.widgets.profile_model import ProfileModel
 
 class BaseWidgetMeta(type(QWidget), type(ABC)):
     pass
@@ -9,6 +10,7 @@ class BaseWidgetMeta(type(QWidget), type(ABC)):
 class BaseWidget(ABC, QWidget, metaclass=BaseWidgetMeta):
     _side_panel_instance = None
     _profile_detection = None
+    _profile_model = None
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -16,11 +18,11 @@ class BaseWidget(ABC, QWidget, metaclass=BaseWidgetMeta):
         if BaseWidget._side_panel_instance is None:
             BaseWidget._side_panel_instance = SidePanel(parent)
             BaseWidget._side_panel_instance.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            BaseWidget.get_profile_model().write_queue = BaseWidget._side_panel_instance.write_queue
 
 
-        if BaseWidget._profile_detection is None:
-            BaseWidget._profile_detection = ProfileDetection()
-        
+        BaseWidget.get_profile_model()
+
 
     @abstractmethod
     def toggle_side_panel(self):
@@ -45,4 +47,13 @@ class BaseWidget(ABC, QWidget, metaclass=BaseWidgetMeta):
     @classmethod
     def get_profile_detection(cls):
         """Return the shared profile detection instance."""
-        return cls._profile_detection
\ No newline at end of file
+        if BaseWidget._profile_detection is None:
+            BaseWidget._profile_detection = ProfileDetection()
+        return BaseWidget._profile_detection
+
+    @classmethod
+    def get_profile_model(cls):
+        """Return the shared profile model every editor widget reads and edits profiles through."""
+        if BaseWidget._profile_model is None:
+            BaseWidget._profile_model = ProfileModel(cls.get_profile_detection().store)
+        return BaseWidget._profile_model
\ No newline at end of file
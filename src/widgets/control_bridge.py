@@ -0,0 +1,74 @@
+import threading
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QGuiApplication
+
+class ControlStateBridge(QObject):
+    """
+    Carries live controller values from the listener thread to the widgets.
+
+    push() runs on the listener thread and only stores the latest value per control under a
+    lock, it never touches Qt. Once per display frame a timer on the GUI thread takes
+    everything that changed and emits it as one `controls_changed` dict, so a flood of control
+    changes costs the GUI one update per frame and never slows the listener down.
+
+    Keys of the emitted dict:
+        ("control_change", channel, control) -> value
+        ("note", channel, note)              -> velocity, 0 when released
+        ("pitchwheel", channel)              -> pitch
+    """
+    controls_changed = Signal(object)  # dict, object keeps the tuple keys out of QVariantMap
+
+    def __init__(self, parent=None, interval: int = None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._received = 0
+        self._frames = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval or self.frame_interval())
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    @property
+    def received(self):
+        """Messages pushed by the listener."""
+        return self._received
+
+    @property
+    def frames(self):
+        """controls_changed batches emitted."""
+        return self._frames
+
+    @staticmethod
+    def frame_interval():
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        return max(1, round(1000 / refresh_rate)) if refresh_rate > 0 else 16
+
+    def push(self, msg):
+        match msg.type:
+            case "control_change":
+                key, value = ("control_change", msg.channel, msg.control), msg.value
+            case "note_on":
+                key, value = ("note", msg.channel, msg.note), msg.velocity
+            case "note_off":
+                key, value = ("note", msg.channel, msg.note), 0
+            case "pitchwheel":
+                key, value = ("pitchwheel", msg.channel), msg.pitch
+            case _:
+                return
+        with self._lock:
+            self._received += 1
+            self._pending[key] = value
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+        self._frames += 1
+        self.controls_changed.emit(batch)
+
+    def stop(self):
+        self._timer.stop()
@@ -40,8 +40,7 @@ class FaderWidget(BaseWidget):
 
     def toggle_side_panel(self):
         """Toggle the visibility of the side panel."""
-        fader_data = super().get_profile_detection()
-        _data = fader_data.get_profile_by_key(self.slider_id, f"{self.parent_widget.profile_dropdown.currentText()}", str(MidiControlType.CONTROL_CHANGE.name))
+        _data = super().get_profile_model().binding(self.parent_widget.profile_dropdown.currentText(), MidiControlType.CONTROL_CHANGE.name, self.slider_id)
 
         if _data is None:
             self.set_fader_info()
@@ -91,6 +90,11 @@ class FaderWidget(BaseWidget):
     def update_widget(self, value):
         """Update widget properties or data."""
         self.value_label.setText(str(value))
+
+    def show_value(self, value):
+        """Move the slider to a live value from the controller."""
+        if self.slider.value() != value:
+            self.slider.setValue(value)
     
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -1,11 +1,20 @@
 from src.widgets.base_widget import BaseWidget
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, QPoint, QRectF, Signal
-from PySide6.QtGui import QPainter, QColor, QPen, QBrush
+from PySide6.QtCore import Qt, QEvent, QPoint, QRect, QRectF, Signal
+from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QPixmap
 from src.models.enums import MidiControlType
 import math
 
 class KnobWidget(BaseWidget):
+    """
+    The knob body never changes between values, it is rendered once into a pixmap (again after a
+    resize or a device pixel ratio change) and paintEvent only blits it and draws the indicator
+    and the value on top. show_value() repaints just the area the old and new indicator cover.
+    """
+    ANGLE_RANGE = 270  # Range of rotation (e.g., -135° to +135°)
+    START_ANGLE = -135  # Start angle (leftmost position)
+    INDICATOR_WIDTH = 4
+
     def __init__(self, parent=None, knob_id = None):
         super().__init__(parent)
         self.setMinimumSize(80, 80)    
@@ -18,6 +27,8 @@ class KnobWidget(BaseWidget):
         self._value = (self.max_value + self.min_value) // 2  # Default to midpoint value
         self._angle = 0  # Starting angle for the knob
         self._is_dragging = False
+        self._body_cache = None
+        self._body_cache_key = None
     
     @property
     def min_value(self):
@@ -66,8 +77,7 @@ class KnobWidget(BaseWidget):
 
     def toggle_side_panel(self):
         """Toggle the visibility of the side panel."""
-        knob_data = super().get_profile_detection()
-        _data = knob_data.get_profile_by_key(self.knob_id, f"{self.parent_widget.profile_dropdown.currentText()}", str(MidiControlType.CONTROL_CHANGE.name))
+        _data = super().get_profile_model().binding(self.parent_widget.profile_dropdown.currentText(), MidiControlType.CONTROL_CHANGE.name, self.knob_id)
         if _data is None:
             self.set_knob_info()
             self.side_panel.action_dropdown[0].setCurrentIndex(0)
@@ -106,6 +116,76 @@ class KnobWidget(BaseWidget):
     def update_widget(self, value):
         """Update widget properties or data."""
         pass
+
+    def show_value(self, value):
+        """Turn the knob to a live value from the controller."""
+        if value != self._value:
+            dirty = self.dirty_rect(self._value, value)
+            self.value = value
+            self.update(dirty)
+
+    def knob_geometry(self):
+        """Center and radius of the knob body for the current size."""
+        return QPoint(self.width() // 2, self.height() // 2), min(self.width(), self.height()) // 2 - 10
+
+    def value_angle(self, value):
+        normalized_value = (value - self.min_value) / (self.max_value - self.min_value)
+        return self.START_ANGLE + normalized_value * self.ANGLE_RANGE
+
+    def indicator_end(self, value):
+        center, knob_radius = self.knob_geometry()
+        indicator_length = knob_radius - 5
+        angle_radians = math.radians(self.value_angle(value) - 90)  # angle 0 points straight up
+        return QPoint(center.x() + math.cos(angle_radians) * indicator_length,
+                      center.y() + math.sin(angle_radians) * indicator_length)
+
+    def value_text_rect(self):
+        """Where the value is drawn, wide enough for any value so it never has to grow."""
+        metrics = self.fontMetrics()
+        width = max(metrics.horizontalAdvance(str(self.min_value)), metrics.horizontalAdvance(str(self.max_value)))
+        rect = QRect(0, 0, width + 4, metrics.height())
+        rect.moveCenter(self.rect().center())
+        return rect.translated(0, 10)
+
+    def dirty_rect(self, old_value, new_value):
+        """Area that changes when the knob turns from old_value to new_value."""
+        center, _ = self.knob_geometry()
+        margin = self.INDICATOR_WIDTH
+        dirty = self.value_text_rect()
+        for value in (old_value, new_value):
+            dirty = dirty.united(QRect(center, self.indicator_end(value)).normalized().adjusted(-margin, -margin, margin, margin))
+        return dirty
+
+    def invalidate_cache(self):
+        self._body_cache = None
+
+    def knob_body(self):
+        """The static knob body as a pixmap for the current size and device pixel ratio."""
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio)
+        if self._body_cache is None or self._body_cache_key != key:
+            pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            center, knob_radius = self.knob_geometry()
+            painter.setPen(QPen(QColor(100, 100, 100), 3))
+            painter.setBrush(QBrush(QColor(150, 150, 150)))  # Light gray
+            painter.drawEllipse(center, knob_radius, knob_radius)
+            painter.end()
+            self._body_cache = pixmap
+            self._body_cache_key = key
+        return self._body_cache
+
+    def resizeEvent(self, event):
+        self.invalidate_cache()
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.DevicePixelRatioChange, QEvent.ScreenChangeInternal):
+            self.invalidate_cache()
+        super().changeEvent(event)
     
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -120,42 +200,23 @@ class KnobWidget(BaseWidget):
         knob_radius = min(self.width(), self.height()) // 2
         return distance <= knob_radius
     
-    def paintEvent(self, _):
+    def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Define the size and the center of the knob
-        knob_radius=  min(self.width(), self.height()) // 2- 10
-        center = QPoint(self.width() // 2, self.height() // 2)
+        self.paint(painter, event.rect())
 
-        # Draw the knob circle
-        painter.setPen(QPen(QColor(100, 100, 100), 3))
-        painter.setBrush(QBrush(QColor(150, 150, 150)))  # Light gray
-        painter.drawEllipse(center, knob_radius, knob_radius)
-        
-        # Calculate the angle for the value indicator
-        angle_range = 270  # Range of rotation (e.g., -135° to +135°)
-        start_angle = -135  # Start angle (leftmost position)
-        normalized_value = (self.value - self.min_value) / (self.max_value - self.min_value)
-        self.angle = start_angle + normalized_value * angle_range
-        
-        painter.save()
+    def paint(self, painter, rect):
+        """Draw the knob with `painter`, only what falls inside `rect` needs to be correct."""
+        painter.drawPixmap(0, 0, self.knob_body())
+        painter.setRenderHint(QPainter.Antialiasing)
 
         # Draw the value indicator line
-        painter.setPen(QPen(QColor(50, 50, 50), 4))
-        indicator_length = knob_radius - 5
-        angle_radians = math.radians(-90)
-        # angle_radians = math.radians(self.angle)
-        end_x = center.x() + math.cos(angle_radians) * indicator_length
-        end_y = center.y() + math.sin(angle_radians) * indicator_length
-        painter.drawLine(center, QPoint(end_x, end_y))
-
-        # Restore painter to prevent affecting subsequent drawings
-        painter.restore()
-        
+        center, _ = self.knob_geometry()
+        self.angle = self.value_angle(self.value)
+        painter.setPen(QPen(QColor(50, 50, 50), self.INDICATOR_WIDTH))
+        painter.drawLine(center, self.indicator_end(self.value))
+
         # Draw the value text in the center
-        painter.setPen(Qt.black)
-        painter.setFont(self.font())
-        text_rect = painter.boundingRect(self.rect(), Qt.AlignCenter, f"{self.value}")
-        text_rect.translate(0, 10)
-        painter.drawText(text_rect, Qt.AlignCenter, f"{self.value}")
\ No newline at end of file
+        text_rect = self.value_text_rect()
+        if rect.intersects(text_rect):
+            painter.setPen(Qt.black)
+            painter.drawText(text_rect, Qt.AlignCenter, f"{self.value}")
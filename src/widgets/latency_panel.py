@@ -0,0 +1,67 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QFileDialog, QHeaderView
+from PySide6.QtCore import QTimer
+from src.models.latency import LatencyRecorder
+
+class LatencyPanel(QWidget):
+    """Table of the listener's latency percentiles, refreshed from a LatencyRecorder once a second."""
+    COLUMNS = ("Stage", "Count", "p50 us", "p99 us", "Max us")
+
+    def __init__(self, recorder: LatencyRecorder, parent=None, interval: int = 1000):
+        super().__init__(parent)
+        self._recorder = recorder
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self.create_widget()
+        self._timer.start(interval)
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @property
+    def table(self):
+        return self._table
+
+    def create_widget(self):
+        _layout = QVBoxLayout(self)
+        _layout.setContentsMargins(0, 5, 0, 0)
+
+        self._table = QTableWidget(0, len(self.COLUMNS))
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self._table.setMaximumHeight(180)
+        _layout.addWidget(self._table)
+
+        button_layout = QHBoxLayout()
+        save_button = QPushButton("Save Latency CSV", self)
+        reset_button = QPushButton("Reset Latency", self)
+        save_button.clicked.connect(self.save_csv)
+        reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(reset_button)
+        _layout.addLayout(button_layout)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        rows = [row for row in self._recorder.snapshot() if row[2]]
+        self._table.setRowCount(len(rows))
+        for index, (group, name, count, _, _, p50, _, p99, _, maximum) in enumerate(rows):
+            label = name if group == "stage" else f"action {name}"
+            for column, value in enumerate((label, str(count), f"{p50:.1f}", f"{p99:.1f}", f"{maximum:.1f}")):
+                item = self._table.item(index, column)
+                if item is None:
+                    self._table.setItem(index, column, QTableWidgetItem(value))
+                else:
+                    item.setText(value)
+
+    def save_csv(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Latency", "latency.csv", "CSV Files (*.csv)")
+        if file_path:
+            self._recorder.write_csv(file_path)
+
+    def reset(self):
+        self._recorder.reset()
+        self._table.setRowCount(0)
@@ -1,27 +1,32 @@
-import json
-import time
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QGridLayout, QSizePolicy, QHBoxLayout, QComboBox, QPushButton, QHBoxLayout, QMessageBox, QSpacerItem, QLabel
-from PySide6.QtCore import QThread
+from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QGridLayout, QSizePolicy, QHBoxLayout, QComboBox, QPushButton, QHBoxLayout, QMessageBox, QSpacerItem, QLabel, QFileDialog
+from PySide6.QtCore import QThread, Signal
 from src.models.midi_detection import MidiDetection
+from src.widgets.base_widget import BaseWidget
 from src.widgets.piano_widget import PianoWidget
 from src.widgets.fader_widget import FaderWidget
 from src.widgets.knob_widget import KnobWidget
 from src.widgets.profile_widget import ProfileWidget
+from src.widgets.latency_panel import LatencyPanel
+from src.widgets.control_bridge import ControlStateBridge
 from src.models.profile_detection import ProfileDetection
-import mido
-import subprocess 
-from src.models.enums import MidiActionType
-from keyboard import send
+from src.models.midi_engine import MidiEngine
+from src.models.latency import LatencyRecorder
+from src.models.midi_recorder import MidiRecorder
+from src.models.device_monitor import DeviceMonitor
+from src.models.enums import MidiControlType
 
 class MidiListenerThread(QThread):
-    def __init__(self, midi_device):
+    def __init__(self, midi_device, latency: LatencyRecorder = None, device_monitor: DeviceMonitor = None):
         super().__init__()
         self._midi_device = midi_device
+        self._midi_detection = MidiDetection()
+        self._engine = MidiEngine(self._midi_detection.execute_action, latency=latency, device_monitor=device_monitor,
+                                  on_reload=self._midi_detection.load_profiles)
         self.running = True  # Control flag
 
     def stop(self):
         self.running = False  # Set flag to stop the thread
-        time.sleep(0.1)
+        self._engine.stop()  # closes the port, run_scan returns right away
 
 
     def run(self):
@@ -30,84 +35,24 @@ class MidiListenerThread(QThread):
     @property
     def midi_device(self):
         return self._midi_device
+
+    @property
+    def engine(self):
+        return self._engine
     
     def run_scan(self):
         try:
-            available_devices = mido.get_input_names()
-            if self.midi_device not in available_devices:
-                print(f"MIDI device '{self.midi_device}' not available.")
-                return
-            
-            with mido.open_input(self.midi_device) as port:
-                while self.running:
-                    try:
-                        for msg in port:
-                            if not self.running:  # Check running flag at the beginning of the loop
-                                break  # Immediately break if stopping
-
-                            active_profile = ProfileDetection().run_app()
-
-                            # Match the message and execute the action
-                            match msg.type:
-                                case "note_on" if msg.velocity > 0:
-                                    action = active_profile["KEY"].get(str(msg.note))
-                                    print(action)
-                                    self.execute_action(action)
-
-                                    if msg.note == 72:
-                                        break
-
-                                case "cc":
-                                    action = active_profile["CONTROL_CHANGE"].get(str(msg.control))
-                                    self.execute_action(action)
-
-                                case "pw":
-                                    action = active_profile["PITCH_WHEEL"].get('1')
-                                    self.execute_action(action)
-                    except Exception as e:
-                        print(f"Error processing MIDI message: {e}")
-                        break  # Exit the inner loop on error
-
+            # a list of devices is read through one MergedSource
+            self._engine.run(self._midi_detection.open_devices(self.midi_device))
         except Exception as e:
             print(f"Error in run_scan method: {e}")
+        finally:
+            self._midi_detection.close()
 
-    def execute_action(self, action_conf):
-        if not action_conf or "action" not in action_conf:
-            # print("No action configured")
-            return
-
-        action_type = action_conf["action"]
-        parameters = action_conf.get("params", {})
-
-        try:
-            match int(action_type):
-                case MidiActionType.RUN_COMMAND.value:
-                    command = parameters.get("RUN_COMMAND", "")
-                    subprocess.run(command, shell=True) if command else print("No command provided for 'run_command'.")    
-
-                case MidiActionType.KEYBOARD_SHORTCUT.value:
-                    keys = parameters.get("KEYBOARD_SHORTCUT", "")
-                    send(keys) if keys else  print("No keys provided for 'keyboard_shortcut'.")
-                 
-                case MidiActionType.RUN_SCRIPT.value:
-                    script = parameters.get("RUN_SCRIPT", "")
-                    subprocess.run(["python", script], shell=True) if script else print("No script provided for 'run_script'.")
-                
-                case "print_message":  # TODO get rid of this
-                    message = parameters.get("PRINT_MESSAGE", "No message provided.")
-                    print(message)
-
-                case MidiActionType.NONE.value:  # TODO get rid of this
-                    print("No action assigned to this input")
-
-                case _:
-                    print(f"Unknown action type: {action_type}")
-
-        except Exception as e:
-            print(f"Error executing action: {e}")
-
-PROFILE_LOCATION = "profiles.json"
 class MainWindow(QMainWindow):
+    ALL_DEVICES = "All Devices"  # dropdown entry that listens to every port at once
+    devices_changed = Signal(list)  # emitted from the device monitor's thread, delivered on the GUI thread
+
     def __init__(self):
         super().__init__() 
         self.setWindowTitle("Symphonic Translator")
@@ -117,8 +62,27 @@ class MainWindow(QMainWindow):
         self._midi_detection = MidiDetection()
         self._is_second_window = None
         self._midi_device = None
+        self._latency = LatencyRecorder()  # kept across start/stop so the panel shows the whole session
+        self._recorder = None
+        self._faders = []
+        self._knobs = []
+        self._control_bindings = None  # CC number -> widget ids for the selected profile, see control_bindings()
+        self._profile_model = BaseWidget.get_profile_model()
+        self._profile_model.binding_changed.connect(self.on_binding_changed)
+        self._profile_model.profile_changed.connect(self.invalidate_control_bindings)
+        self._profile_model.modelReset.connect(self.invalidate_control_bindings)
         self.create_widget()
 
+        # live values from the listener reach the faders and knobs at most once per frame
+        self._control_bridge = ControlStateBridge(self)
+        self._control_bridge.controls_changed.connect(self.apply_control_values)
+
+        # the port list is polled off the GUI thread, the first poll fills the dropdown
+        self.devices_changed.connect(self.load_midi_device_list)
+        self._device_monitor = DeviceMonitor(self._midi_detection.list_midi_devices,
+                                             on_change=lambda added, removed, devices: self.devices_changed.emit(devices))
+        self._device_monitor.start()
+
     @property 
     def midi_device(self):
         return self._midi_device
@@ -131,6 +95,18 @@ class MainWindow(QMainWindow):
     def midi_detection(self):
         return self._midi_detection
     @property
+    def latency(self):
+        return self._latency
+
+    @property
+    def device_monitor(self):
+        return self._device_monitor
+
+    @property
+    def control_bridge(self):
+        return self._control_bridge
+
+    @property
     def profile_dropdown(self):
         return self._profile_dropdown
 
@@ -138,6 +114,10 @@ class MainWindow(QMainWindow):
     def profile_detection(self):
         return self._profile_detection
 
+    @property
+    def profile_model(self):
+        return self._profile_model
+
     @property
     def is_second_window(self):
         return self._is_second_window
@@ -166,14 +146,19 @@ class MainWindow(QMainWindow):
         _layout.addLayout(control_layout)
 
    
-        _piano = PianoWidget(self)
-        _layout.addWidget(_piano)
+        self._piano = PianoWidget(self)
+        _layout.addWidget(self._piano)
         self.create_profile_button_group(_layout)
+        self._latency_panel = LatencyPanel(self._latency, self)
+        _layout.addWidget(self._latency_panel)
         self.layout = _layout
 
     def create_profile_dropdown(self, _layout):
         self._profile_dropdown = QComboBox()
-        self.load_profiles()
+        # the dropdown follows the shared model, added and deleted profiles show up on their own
+        self._profile_dropdown.setModel(self.profile_model)
+        self._profile_dropdown.currentTextChanged.connect(self.on_profile_selected)
+        self.on_profile_selected(self._profile_dropdown.currentText())
         spacer = QSpacerItem(0, 10, QSizePolicy.Minimum, QSizePolicy.Fixed)
         _layout.addItem(spacer)
         _layout.addWidget(self._profile_dropdown)
@@ -186,10 +171,13 @@ class MainWindow(QMainWindow):
         
 
         self.start_button = QPushButton("Start", self)
+        self.record_button = QPushButton("Record Session", self)
+        self.record_button.setCheckable(True)
         add_profile_button = QPushButton("Add New Profile", self)
         del_button = QPushButton("Delete Current Profile", self)
         
         self.start_button.clicked.connect(self.run_application)
+        self.record_button.toggled.connect(self.toggle_recording)
         add_profile_button.clicked.connect(self.open_add_window)       
         del_button.clicked.connect(self.delete_profile)
 
@@ -198,6 +186,7 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(add_profile_button)
         button_layout.addWidget(del_button)
         master_button_layout.addWidget(self.start_button)
+        master_button_layout.addWidget(self.record_button)
         master_button_layout.addLayout(button_layout)
         # Add the horizontal button layout to the provided vertical layout
         self.create_profile_dropdown(master_button_layout)
@@ -208,7 +197,6 @@ class MainWindow(QMainWindow):
         _hlayout = QHBoxLayout()
         midi_text_label = QLabel("Selece Midi Device")
         self.midi_devices_dropdown = QComboBox()
-        self.load_midi_device_list()
         _hlayout.addWidget(midi_text_label)
         _hlayout.addWidget(self.midi_devices_dropdown)
 
@@ -225,6 +213,7 @@ class MainWindow(QMainWindow):
         fader_layout = QGridLayout()
         for i, _ in enumerate(range(8)):
             fader = FaderWidget(parent=self, slider_id=i)
+            self._faders.append(fader)
             fader_layout.addWidget(fader, 0, i)
         return fader_layout
 
@@ -236,20 +225,79 @@ class MainWindow(QMainWindow):
         for row in range(2): 
             for col in range(4): 
                 knob = KnobWidget(parent = self, knob_id=knob_id)
+                self._knobs.append(knob)
                 knob.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Minimum)  # Allow knobs to shrink
                 knob_layout.addWidget(knob, row, col)
                 knob_id+=1
         return knob_layout
 
-    def load_midi_device_list(self):
+    def load_midi_device_list(self, devices: list = None):
+        selected = self.midi_devices_dropdown.currentText()
+        if devices is None:
+            devices = self.midi_detection.list_midi_devices()
+        self.midi_devices_dropdown.blockSignals(True)
         self.midi_devices_dropdown.clear()
-        self.midi_devices_dropdown.addItems([i for i in self.midi_detection.list_midi_devices()])
-
-    def load_profiles(self):
-        global PROFILE_LOCATION
-        self.profile_dropdown.clear()
-        profiles = self.profile_detection
-        self.profile_dropdown.addItems([i for i in profiles.get_loaded_profiles()])
+        self.midi_devices_dropdown.addItems([i for i in devices])
+        if len(devices) > 1:
+            self.midi_devices_dropdown.addItem(self.ALL_DEVICES, devices)
+        # keep the selection when the device is still there
+        index = self.midi_devices_dropdown.findText(selected)
+        if index >= 0:
+            self.midi_devices_dropdown.setCurrentIndex(index)
+        self.midi_devices_dropdown.blockSignals(False)
+
+    def control_bindings(self):
+        """CC number -> ids of the faders and knobs bound to it in the selected profile."""
+        if self._control_bindings is None:
+            bindings = {}
+            section = self.profile_model.bindings(self.profile_dropdown.currentText(), MidiControlType.CONTROL_CHANGE.name)
+            for widget_id, conf in section.items():
+                try:
+                    bindings.setdefault(int(conf["params"]["cc_control_id"]), []).append(int(widget_id))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self._control_bindings = bindings
+        return self._control_bindings
+
+    def invalidate_control_bindings(self, *_):
+        self._control_bindings = None
+
+    def on_binding_changed(self, profile, control_type, key):
+        if control_type == MidiControlType.CONTROL_CHANGE.name and profile == self.profile_dropdown.currentText():
+            self.invalidate_control_bindings()
+
+    def on_profile_selected(self, profile):
+        self.invalidate_control_bindings()
+        self._piano.profile_name = profile or None
+
+    def apply_control_values(self, values: dict):
+        """Show one frame of live controller values on the piano and the faders and knobs bound to them."""
+        bindings = None
+        for key, value in values.items():
+            if key[0] == "note":
+                self._piano.show_note(key[2], value)
+                continue
+            if key[0] != "control_change":
+                continue
+            if bindings is None:
+                bindings = self.control_bindings()
+            for widget_id in bindings.get(key[2], ()):
+                if widget_id < len(self._faders):
+                    self._faders[widget_id].show_value(value)
+                if widget_id < len(self._knobs):
+                    self._knobs[widget_id].show_value(value)
+
+    def selected_midi_devices(self):
+        """The selected device name, or the list of every device for the All Devices entry."""
+        return self.midi_devices_dropdown.currentData() or self.midi_devices_dropdown.currentText()
+
+    def load_profiles(self, selected: str = None):
+        """Pick up hand edits to the profile file and optionally select a profile."""
+        self.profile_model.refresh()
+        if selected:
+            index = self.profile_dropdown.findText(selected)
+            if index >= 0:
+                self.profile_dropdown.setCurrentIndex(index)
     
     def open_add_window(self):
         print("working")
@@ -271,44 +319,76 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.No:
             return
 
-        # Load JSON
-        try:
-            with open(PROFILE_LOCATION, "r") as file:
-                profiles = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            profiles = {}
-
         # Remove profile if it exists
-        if selected_profile in profiles:
-            del profiles[selected_profile]
-
-            # Save updated JSON
-            with open(PROFILE_LOCATION, "w") as file:
-                json.dump(profiles, file, indent=4)
-
-            # Refresh the combo box
-            self.load_profiles()
+        if selected_profile in self.profile_model.profile_names:
+            self.profile_model.delete_profile(selected_profile)  # the combo box drops it through the model
             QMessageBox.information(self, "Deleted", f"Profile '{selected_profile}' deleted successfully!")
         else:
             QMessageBox.warning(self, "Error", "Profile not found.")
 
+    def toggle_recording(self, checked):
+        if checked:
+            if not (hasattr(self, "midi_thread") and self.midi_thread.isRunning()):
+                QMessageBox.warning(self, "Not Listening", "Start listening before recording a session.")
+                self.record_button.setChecked(False)
+                return
+            self._recorder = MidiRecorder()
+            self._recorder.start()
+            self.midi_thread.engine.recorder = self._recorder
+            self.record_button.setText("Stop Recording")
+            return
+
+        if self._recorder is None:
+            return
+        recorder, self._recorder = self._recorder, None
+        recorder.stop()
+        if hasattr(self, "midi_thread"):
+            self.midi_thread.engine.recorder = None
+        self.record_button.setText("Record Session")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Session", "session.mid", "MIDI Files (*.mid)")
+        if file_path:
+            print(f"Recorded {recorder.save(file_path)} messages to {file_path}")
+
     def closeEvent(self, event):
+        if hasattr(self, "midi_thread") and self.midi_thread.isRunning():
+            # release the port before the window goes away, the listener stops without waiting for a message
+            self.midi_thread.stop()
+            self.midi_thread.wait(2000)
+        self._device_monitor.stop()
+        self._control_bridge.stop()
+        self.flush_profile_edits()
         if self.is_second_window:
             self.is_second_window.close()
         event.accept()
         return super().closeEvent(event)
 
+    def flush_profile_edits(self):
+        """Write the side panel's queued edits now and report how much batching saved."""
+        write_queue = BaseWidget.get_side_panel().write_queue
+        write_queue.stop()
+        stats = write_queue.stats()
+        if stats["queued"]:
+            print(f"Profile edits: {stats['queued']} saved in {stats['flushes']} writes, {stats['coalesced']} coalesced")
+
+    def on_listener_finished(self):
+        self._control_bridge.flush()
+        self._piano.release_all()  # note offs still in flight are gone with the listener
+        self.start_button.setText("Start")
+        self.start_button.setEnabled(True)
+
     def run_application(self):
         if hasattr(self, "midi_thread") and self.midi_thread.isRunning():
             print("Stopping app")
-            self.midi_thread.stop()  # Tell thread to stop
-            self.midi_thread.quit()
-            self.midi_thread.wait(1)
-            self.start_button.setText("Start")  # Update button text
-            
+            self.record_button.setChecked(False)
+            # only closes the port, the listener thread shuts the pipeline down and on_listener_finished follows
+            self.midi_thread.stop()
+            self.start_button.setEnabled(False)
+
         else:
             print("Starting app")
             # self.midi_thread = MidiListenerThread("Minilab3 MIDI 0")
-            self.midi_thread = MidiListenerThread(self.midi_devices_dropdown.currentText())
+            self.midi_thread = MidiListenerThread(self.selected_midi_devices(), self._latency, self._device_monitor)
+            self.midi_thread.engine.observer = self._control_bridge.push
+            self.midi_thread.finished.connect(self.on_listener_finished)
             self.midi_thread.start()  # Calls run(), which calls run_scan()
             self.start_button.setText("Stop")  # Update button text
\ No newline at end of file
@@ -1,66 +1,122 @@
 from PySide6.QtWidgets import (
     QMainWindow,
-    QPushButton,
     QSizePolicy
 )
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QPainter, QColor
 from src.widgets.base_widget import BaseWidget
 from src.models.enums import MidiControlType
 
 class PianoWidget(BaseWidget):
-    def __init__(self, parent: QMainWindow, octaves = 3):
+    """
+    The whole keyboard is one painted widget. Key rects are computed once per resize into a
+    table by MIDI note, plus one entry per white key column holding the black keys on either
+    side of it, so the note under the mouse is found from x/y in constant time. Pressed notes
+    only repaint their own key.
+    """
+    WHITE_NUMBERS = (0, 2, 4, 5, 7, 9, 11)
+    BLACK_WIDTH_RATIO = 0.6
+    BLACK_HEIGHT_RATIO = 0.6
+    PRESSED_COLOR = QColor(80, 160, 255)
+    BOUND_COLOR = QColor(68, 194, 101)
+
+    def __init__(self, parent: QMainWindow, octaves = 3, first_note = 0, last_note = None):
         super().__init__(parent)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.setMinimumSize(600, 200)
-        
+
         self._parent = parent
         self._piano_octaves = octaves
-        self._key_width = 55
-        self._white_keys = []
-        self._black_keys = []
+        self._first_note = first_note
+        self._last_note = last_note if last_note is not None else first_note + octaves * 12 - 1
+        self._max_key_width = 55
+        self._key_width = self._max_key_width
+        self._white_keys = [note for note in self.notes if self.is_white(note)]
+        self._black_keys = [note for note in self.notes if not self.is_white(note)]
         self._white_key_names = ["C", "D", "E", "F", "G", "A", "B"]
+        self._key_rects = {}
+        self._columns = []
+        self._offset = 0
+        self._geometry_size = None
+        self._pressed = {}
+        self._profile_name = None
 
         self._side_panel = super().get_side_panel()
 
-        
+
         # Make sure parent exists and has a layout before adding widgets
         if self._parent and hasattr(self._parent, "_layout"):
             self._parent.layout.addWidget(self._side_panel)  # Correct way to access layout
 
         self.create_widget()
+        model = super().get_profile_model()
+        model.binding_changed.connect(self.on_binding_changed)
+        model.profile_changed.connect(self.on_profile_changed)
+        model.modelReset.connect(self.update)
 
     @property
     def key_width(self):
+        self.ensure_geometry()
         return self._key_width
-    
+
     @property
     def piano_octaves(self):
         return self._piano_octaves
-    
+
+    @property
+    def notes(self):
+        return range(self._first_note, self._last_note + 1)
+
     @property
     def side_panel(self):
         return self._side_panel
-    
+
     @property
     def white_keys(self):
+        """MIDI notes of the white keys, left to right."""
         return self._white_keys
-    
+
     @property
     def black_keys(self):
+        """MIDI notes of the black keys, left to right."""
         return self._black_keys
 
     @property
     def white_key_names(self):
         return self._white_key_names
 
+    @property
+    def pressed(self):
+        """Velocity of every note currently held."""
+        return self._pressed
+
+    @property
+    def profile_name(self):
+        """Profile whose key bindings are marked on the keys."""
+        return self._profile_name
+
+    @profile_name.setter
+    def profile_name(self, name):
+        if name != self._profile_name:
+            self._profile_name = name
+            self.update()
+
+    @classmethod
+    def is_white(cls, note):
+        return note % 12 in cls.WHITE_NUMBERS
+
+    def key_rect(self, note):
+        self.ensure_geometry()
+        return self._key_rects.get(note)
+
     def toggle_side_panel(self, key_index):
         """Toggle the visibility of the side panel."""
-        piano_key_data = super().get_profile_detection()
-        _data = piano_key_data.get_profile_by_key(key_index, f"{self._parent.profile_dropdown.currentText()}", str(MidiControlType.KEY.name))
-        
+        _data = super().get_profile_model().binding(self._parent.profile_dropdown.currentText(), MidiControlType.KEY.name, key_index)
+
         if _data is None:
             self.set_key_info(key_index)
             self.side_panel.action_dropdown[0].setCurrentIndex(0)
-            self.side_panel.midi_value.setText("") 
+            self.side_panel.midi_value.setText("")
         else:
             self.set_key_info(key_index)
 
@@ -72,91 +128,146 @@ class PianoWidget(BaseWidget):
                 _, value = next(iter(params.items()))
                 self.side_panel.midi_value.setText(value)
 
-        self.side_panel.update_side_panel_visibility() 
+        self.side_panel.update_side_panel_visibility()
 
     def set_key_info(self, key_index):
         self.side_panel.profile_label_text.setText(f"{self._parent.profile_dropdown.currentText()}")
         self.side_panel.control_type_dropdown[0].setCurrentIndex(0)
-        self.side_panel.midi_note_edit_text.setText(f"{key_index}")  
+        self.side_panel.midi_note_edit_text.setText(f"{key_index}")
 
     def create_widget(self):
         """Create and add widgets to the layout."""
-        black_key_width = self.key_width * 0.6
-        black_key_height = self.height() * 0.6 
-        black_key_positions = [0, 1, 3, 4, 5]
-        white_numbers = [0, 2, 4, 5, 7, 9, 11]
-        black_numbers = [1, 3, 6, 8, 10]
-  
-
-        for octave in range(self.piano_octaves):
-            base_midi = octave * 12  # MIDI base for the current octave
-    
-             # Create white keys
-            for i, note_offset in enumerate(white_numbers):
-                midi_value = base_midi + note_offset
-                key_name = self.white_key_names[i] + str(octave)  # C4, D4, etc.
-                self.white_keys.append(self.create_piano_key(self.key_width, self.height(), midi_value, "white", key_name))
-
-            # Create black keys
-            for key_idx, note_offset in enumerate(black_numbers):
-                midi_value = base_midi + note_offset
-                key_name = self.white_key_names[black_key_positions[key_idx]] + "#" + str(octave)
-                btn = self.create_piano_key(black_key_width, black_key_height, midi_value, "black", key_name)
-                self.black_keys.append(btn)
-    
-    def create_piano_key(self, width, height, idx, color, key_name):
-        piano_key_btn = QPushButton(self)
-        piano_key_btn.setStyleSheet(f"background-color: {color}; border: 1px solid black;")
-        piano_key_btn.setFixedSize(width, height)
-        piano_key_btn.clicked.connect(lambda _, idx = idx: self.toggle_side_panel(idx))
-        return piano_key_btn
-    
+        self.resize_piano()
+
     def update_widget(self, value):
         """Update widget properties or data."""
         pass
 
+    def show_note(self, note, velocity):
+        """Highlight `note` while velocity is above 0, repainting only its key."""
+        if velocity > 0:
+            if self._pressed.get(note) == velocity:
+                return
+            self._pressed[note] = velocity
+        elif self._pressed.pop(note, None) is None:
+            return
+        rect = self.key_rect(note)
+        if rect is not None:
+            self.update(rect)
+
+    def on_binding_changed(self, profile, control_type, key):
+        if profile != self._profile_name or control_type != MidiControlType.KEY.name:
+            return
+        try:
+            rect = self.key_rect(int(key))
+        except ValueError:
+            return
+        if rect is not None:
+            self.update(rect)
+
+    def on_profile_changed(self, profile):
+        if profile == self._profile_name:
+            self.update()
+
+    def release_all(self):
+        notes = list(self._pressed)
+        for note in notes:
+            self.show_note(note, 0)
+
+    def ensure_geometry(self):
+        """Rebuild the key table if the size changed, hidden widgets get their resize event late."""
+        if self._geometry_size != self.size():
+            self.resize_piano()
 
     def resize_piano(self):
-        """Ensure the piano scales correctly on resizing."""
+        """Rebuild the key geometry table for the current size."""
+        self._geometry_size = self.size()
         key_height = self.height()
+        white_count = max(len(self.white_keys), 1)
+        self._key_width = min(self._max_key_width, self.width() / white_count) if self.width() else self._max_key_width
+        black_key_width = self.key_width * self.BLACK_WIDTH_RATIO
+        black_key_height = key_height * self.BLACK_HEIGHT_RATIO
+        self._offset = (self.width() - white_count * self.key_width) / 2
+
+        self._key_rects = {}
+        self._columns = []
+        column = 0
+        for note in self.notes:
+            if self.is_white(note):
+                left = round(self._offset + column * self.key_width)
+                right = round(self._offset + (column + 1) * self.key_width)
+                self._key_rects[note] = QRect(left, 0, right - left, key_height)
+                # the black key before this one (if any) overlaps the column's left edge
+                left_black = note - 1 if note - 1 in self._key_rects and not self.is_white(note - 1) else None
+                self._columns.append([note, left_black, None])
+                column += 1
+            else:
+                x = round(self._offset + column * self.key_width - black_key_width / 2)
+                self._key_rects[note] = QRect(x, 0, round(black_key_width), round(black_key_height))
+                if self._columns:
+                    self._columns[-1][2] = note
+
+    def note_at(self, pos):
+        """MIDI note of the key at `pos`, None outside the keyboard."""
+        self.ensure_geometry()
+        if not self._columns or pos.y() < 0 or pos.y() >= self.height():
+            return None
+        column = int((pos.x() - self._offset) // self.key_width)
+        if column < 0 or column >= len(self._columns):
+            return None
+        white, left_black, right_black = self._columns[column]
+        for black in (left_black, right_black):
+            if black is not None and self._key_rects[black].contains(pos):
+                return black
+        return white
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            note = self.note_at(event.position().toPoint())
+            if note is not None:
+                self.toggle_side_panel(note)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.paint(painter, event.rect())
+
+    def paint(self, painter, rect):
+        """Draw the keys that intersect `rect`, white ones first so black ones sit on top."""
+        self.ensure_geometry()
+        if not self._columns:
+            return
+        first = max(int((rect.left() - self._offset) // self.key_width) - 1, 0)
+        last = min(int((rect.right() - self._offset) // self.key_width) + 1, len(self._columns) - 1)
+        bound = super().get_profile_model().bindings(self._profile_name, MidiControlType.KEY.name) if self._profile_name else {}
+        painter.setPen(Qt.black)
+        for column in range(first, last + 1):
+            self.draw_key(painter, self._columns[column][0], Qt.white, bound)
+        if first == 0 and self._columns[0][1] is not None:
+            self.draw_key(painter, self._columns[0][1], Qt.black, bound)
+        for column in range(first, last + 1):
+            black = self._columns[column][2]
+            if black is not None and self._key_rects[black].intersects(rect):
+                self.draw_key(painter, black, Qt.black, bound)
+
+    def draw_key(self, painter, note, color, bound):
+        key_rect = self._key_rects[note]
+        painter.setBrush(self.key_color(note, color))
+        painter.drawRect(key_rect.adjusted(0, 0, -1, -1))
+        if str(note) in bound:
+            # a dot near the bottom of every key with a binding in the shown profile
+            radius = max(2, key_rect.width() // 6)
+            painter.save()
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.BOUND_COLOR)
+            painter.drawEllipse(key_rect.center().x() - radius, key_rect.bottom() - 4 * radius, 2 * radius, 2 * radius)
+            painter.restore()
+
+    def key_color(self, note, color):
+        velocity = self._pressed.get(note)
+        if velocity is None:
+            return color
+        return self.PRESSED_COLOR.lighter(100 + (127 - velocity) // 2)  # softer hits show a paler highlight
 
-        white_keys_num = 7
-        black_key_width = self.key_width * 0.6
-        black_key_height = key_height * 0.6
-        black_key_positions = self.get_black_key_positions(self.piano_octaves)
-
-
-        total_piano_width = white_keys_num * self.piano_octaves  * self.key_width
-        widget_width = self.width()
-
-        hori_offset = (widget_width - total_piano_width) / 2
-
-        # Resize and reposition white keys
-        for i, white_key in enumerate(self.white_keys):
-            white_key.setFixedSize(self.key_width, key_height)
-            white_key.move(hori_offset + i * self.key_width, 0)
-
-        # Resize and reposition black keys
-   
-        for i, pos in enumerate(black_key_positions):
-            black_key = self.black_keys[i]
-            black_key.setFixedSize(black_key_width, black_key_height)
-            x_offset = hori_offset + (pos + 1) * self.key_width - (black_key_width / 2)
-            black_key.move(x_offset, 0)
-
-    def get_black_key_positions(self, octaves: int):
-        white_keys_num = 7
-        base_black_key_positions = [0, 1, 3, 4, 5]  # Base positions for one octave
-        black_key_positions = []
-        
-        # For each octave, extend the base positions by the correct offset
-        for octave in range(octaves):
-            offset = octave * white_keys_num  # 7 positions per octave (one octave has 5 black keys)
-            for pos in base_black_key_positions:
-                black_key_positions.append(pos + offset)
-        
-        return black_key_positions
-    
     def resizeEvent(self, event):
         """Handle resizing to maintain static key positions."""
         self.resize_piano()
@@ -165,4 +276,4 @@ class PianoWidget(BaseWidget):
     def showEvent(self, event):
         """Ensure proper layout when the widget is shown."""
         self.resize_piano()
-        super().showEvent(event)
\ No newline at end of file
+        super().showEvent(event)
@@ -0,0 +1,114 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from src.models.profile_store import ProfileStore
+
+class ProfileModel(QAbstractListModel):
+    """
+    The shared ProfileStore as a Qt list model of profile names, for every editor widget.
+
+    Reads are dictionary lookups on the store's in-memory data. Every change made through the
+    store, from this model or anywhere else in the process, comes back as one of the signals
+    below on the GUI thread, so views update only what changed instead of reloading.
+    """
+    ProfileRole = Qt.UserRole + 1
+    binding_changed = Signal(str, str, str)  # profile, control type, key
+    profile_changed = Signal(str)  # a whole profile was added, replaced or removed
+    _store_changed = Signal(object)  # store listener -> GUI thread
+
+    def __init__(self, store: ProfileStore, parent=None):
+        super().__init__(parent)
+        self._store = store
+        self._write_queue = None
+        self._names = list(store.profiles)
+        self._store_changed.connect(self._apply_change)
+        store.add_listener(self._store_changed.emit)
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def write_queue(self):
+        """Edits waiting in this ProfileWriteQueue are returned by binding() before they are written."""
+        return self._write_queue
+
+    @write_queue.setter
+    def write_queue(self, queue):
+        self._write_queue = queue
+
+    @property
+    def profile_names(self):
+        return list(self._names)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._names):
+            return None
+        name = self._names[index.row()]
+        match role:
+            case Qt.DisplayRole | Qt.EditRole:
+                return name
+            case ProfileModel.ProfileRole:
+                return self._store.get(name)
+        return None
+
+    def profile(self, name: str):
+        return self._store.get(str(name))
+
+    def bindings(self, profile: str, control_type: str):
+        """Every binding of one control type in a profile, by key."""
+        return self._store.get(str(profile), control_type) or {}
+
+    def binding(self, profile: str, control_type: str, key):
+        if self._write_queue is not None:
+            pending = self._write_queue.pending(profile, control_type, key)
+            if pending is not None:
+                return pending
+        return self._store.get(str(profile), control_type, str(key))
+
+    def set_binding(self, profile: str, control_type: str, key, binding: dict):
+        self._store.set_binding(profile, control_type, str(key), binding)
+
+    def put_profile(self, profile: str, data: dict):
+        self._store.put_profile(profile, data)
+
+    def delete_profile(self, profile: str):
+        self._store.delete_profile(profile)
+
+    def refresh(self):
+        """Pick up hand edits to the profile file, the store reloads it if it changed."""
+        self._store.profiles
+
+    def close(self):
+        self._store.remove_listener(self._store_changed.emit)
+
+    def _apply_change(self, entry):
+        if entry is None:
+            self.beginResetModel()
+            self._names = list(self._store.profiles)
+            self.endResetModel()
+            return
+
+        name, *rest = entry["path"]
+        if entry["op"] == "delete" and not rest:
+            if name in self._names:
+                row = self._names.index(name)
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._names[row]
+                self.endRemoveRows()
+            self.profile_changed.emit(name)
+            return
+
+        if name not in self._names:
+            self.beginInsertRows(QModelIndex(), len(self._names), len(self._names))
+            self._names.append(name)
+            self.endInsertRows()
+        elif not rest:
+            row = self._names.index(name)
+            self.dataChanged.emit(self.index(row), self.index(row), [ProfileModel.ProfileRole])
+
+        if len(rest) == 2:
+            self.binding_changed.emit(name, rest[0], rest[1])
+        else:
+            self.profile_changed.emit(name)
@@ -8,12 +8,9 @@ from PySide6.QtWidgets import (
     QLabel,
 )
 from PySide6.QtCore import Signal
-from src.models.profile_detection import ProfileDetection
-import json
+from src.widgets.base_widget import BaseWidget
 import os
 
-PROFILE_FILE = "profiles.json"
-
 class ProfileWidget(QWidget):
     add_profile = Signal(str)
 
@@ -69,44 +66,30 @@ class ProfileWidget(QWidget):
             print("Error: No file selected!")
             return 
         
-        profiles = ProfileDetection()
-        all_profiles = profiles.get_loaded_profiles()
+        profile_model = BaseWidget.get_profile_model()
 
-        if profile_name in all_profiles:
+        if profile_model.profile(profile_name) is not None:
             print("Error: profile name exists")
             return 
         
-        try:
-            if os.path.exists(PROFILE_FILE):
-                with open(PROFILE_FILE, "r") as file:
-                    profiles = json.load(file) 
-                    
-            # Extract the executable name from the file path
-            executable_name = os.path.basename(self.file_path)  # Get the full file name with extension
-            executable_name_without_extension = os.path.splitext(executable_name)[0]  # Remove the extension
-            # Add new profile
-            profiles[profile_name] = {
-                "file_path": self.file_path,
-                "program_window_name" : executable_name_without_extension,
-                "KEY": {
-                    "69" : {"action": "1", "params": {"command": "start notepad"}},
-                    "70" : {"action": "1", "params": {"command": "start chrome"}}
-                },
-                "CONTROL_CHANGE": {
-                    "69" : {"action": "1", "params": {"command": "start notepad"}},
-                    "70" : {"action": "1", "params": {"command": "start chrome"}}
-                },
-                "PITCHWEEL": {"1": {"action": "print_message", "params": {"message": "Pitch wheel moved!"}}}
-            }
-
-            # Save updated profiles back to JSON file
-            with open(PROFILE_FILE, "w") as file:
-                json.dump(profiles, file, indent=4)
-
-            print(f"Profile '{profile_name}' saved successfully!")
-            self.add_profile.emit(profile_name)  # Notify main window
-            self.close()   
+        # Extract the executable name from the file path
+        executable_name = os.path.basename(self.file_path)  # Get the full file name with extension
+        executable_name_without_extension = os.path.splitext(executable_name)[0]  # Remove the extension
+        # Add new profile
+        profile_model.put_profile(profile_name, {
+            "file_path": self.file_path,
+            "program_window_name" : executable_name_without_extension,
+            "KEY": {
+                "69" : {"action": "1", "params": {"command": "start notepad"}},
+                "70" : {"action": "1", "params": {"command": "start chrome"}}
+            },
+            "CONTROL_CHANGE": {
+                "69" : {"action": "1", "params": {"command": "start notepad"}},
+                "70" : {"action": "1", "params": {"command": "start chrome"}}
+            },
+            "PITCHWEEL": {"1": {"action": "print_message", "params": {"message": "Pitch wheel moved!"}}}
+        })
 
-        except json.JSONDecodeError:
-            print("Error: Invalid JSON format! Creating a new profile file.")
-            return
+        print(f"Profile '{profile_name}' saved successfully!")
+        self.add_profile.emit(profile_name)  # Notify main window
+        self.close()   
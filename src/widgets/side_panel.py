@@ -3,6 +3,8 @@ from PySide6.QtWidgets import QMainWindow, QPushButton, QVBoxLayout, QWidget, QL
 from src.models.midi import Midi
 from src.models.enums import MidiActionType, MidiControlType
 from src.models.profile_detection import ProfileDetection
+from src.models.profile_write_queue import ProfileWriteQueue
+from src.models.shortcut_cache import compile_shortcut, profile_shortcuts
 from enum import Enum
 import time
 
@@ -12,6 +14,8 @@ class SidePanel(QWidget):
         self._non_key_id = -1
         self._parent_widget = parent
         self._profile_detection = ProfileDetection()
+        # edits are batched, bulk editing a bank of keys is one write instead of one per click
+        self._write_queue = ProfileWriteQueue(self._profile_detection.store)
         self._side_panel_widget_visibility = False 
 
         self.setFixedWidth(300)
@@ -35,6 +39,10 @@ class SidePanel(QWidget):
     def profile_detection(self)->ProfileDetection:
         return self._profile_detection
     
+    @property
+    def write_queue(self)->ProfileWriteQueue:
+        return self._write_queue
+
     @property
     def non_key_id(self)->str:
         return self._non_key_id
@@ -238,16 +246,37 @@ class SidePanel(QWidget):
         try:
             midi_item = Midi(time.time_ns(), self.profile_label_text.text(), MidiControlType[self.control_type_dropdown[0].currentText()], MidiActionType[self.action_dropdown[0].currentText()],
                                 self.midi_channel_dropdown[0].currentText(), self.midi_note_edit_text.text(), self.midi_value.text())
-            
+            error = self.shortcut_error(midi_item)
+            if error:
+                print(f"Not saved: {error}")
+                return
+
             if MidiControlType[self.control_type_dropdown[0].currentText()] == MidiControlType.CONTROL_CHANGE:
                 print("saving cc")
-                self.profile_detection.save_profile(midi_item, self.non_key_id)
+                self.profile_detection.save_profile(midi_item, self.non_key_id, self.write_queue)
             else:
                 print("saving keys")
-                self.profile_detection.save_profile(midi_item)
+                self.profile_detection.save_profile(midi_item, store=self.write_queue)
         except Exception as e:
             print(f"Error occured during saving inside the Side Panel: {e}")
 
+    def shortcut_error(self, midi_item: Midi):
+        """Why a shortcut this binding would send is invalid, None when they all compile."""
+        built = self.profile_detection.build_binding(midi_item, self.non_key_id)
+        if built is None:
+            return None
+        _, control_type, key, binding = built
+        if midi_item.action_type == MidiActionType.KEYBOARD_SHORTCUT and not str(midi_item.midi_value).strip():
+            return "Shortcut is empty"
+        try:
+            for keys in profile_shortcuts({control_type: {key: binding}}):
+                compile_shortcut(keys)
+        except ValueError as e:
+            return str(e)
+        except OSError as e:
+            print(f"Could not read the keyboard layout to check the shortcut: {e}")
+        return None
+
     def reset_macro(self):
         """Define the reset macro logic here."""
         self.control_type_dropdown[0].setCurrentIndex(0)
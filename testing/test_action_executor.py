@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from src.models.action_executor import ActionExecutor
+from src.models.enums import QueuePolicy
+
+class TestActionExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ActionExecutor(workers=2, max_queue=8)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+        self.executor.start()
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.stop()
+
+    def blocking_action(self, value):
+        self.calls.append(value)
+        self.started.set()
+        self.release.wait(2)
+
+    def record_action(self, value):
+        self.calls.append(value)
+
+    def wait_until_idle(self):
+        done = threading.Event()
+        self.executor.submit(done.set, key="barrier", policy=QueuePolicy.SERIALIZE)
+        self.assertTrue(done.wait(2))
+        # the barrier may finish on another worker before the last action is counted
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            stats = self.executor.stats()
+            if stats["executed"] + stats["failed"] + stats["dropped"] + stats["coalesced"] >= stats["submitted"]:
+                return
+            time.sleep(0.001)
+        self.fail(f"executor did not go idle: {self.executor.stats()}")
+
+    def test_serialize_runs_in_order(self):
+        self.executor.submit(self.blocking_action, 0, key="pad", policy=QueuePolicy.SERIALIZE)
+        self.started.wait(2)
+        for value in range(1, 4):
+            self.executor.submit(self.record_action, value, key="pad", policy=QueuePolicy.SERIALIZE)
+        self.assertEqual(self.executor.queue_depth, 3)
+
+        self.release.set()
+        self.wait_until_idle()
+        self.assertEqual(self.calls, [0, 1, 2, 3])
+
+    def test_drop_if_busy(self):
+        self.executor.submit(self.blocking_action, 0, key="pad", policy=QueuePolicy.DROP_IF_BUSY)
+        self.started.wait(2)
+        self.assertFalse(self.executor.submit(self.record_action, 1, key="pad", policy=QueuePolicy.DROP_IF_BUSY))
+
+        self.release.set()
+        self.wait_until_idle()
+        self.assertEqual(self.calls, [0])
+        self.assertEqual(self.executor.stats()["dropped"], 1)
+
+    def test_coalesce_keeps_latest(self):
+        self.executor.submit(self.blocking_action, 0, key="fader", policy=QueuePolicy.COALESCE)
+        self.started.wait(2)
+        for value in range(1, 6):
+            self.executor.submit(self.record_action, value, key="fader", policy=QueuePolicy.COALESCE)
+        self.assertEqual(self.executor.queue_depth, 1)
+
+        self.release.set()
+        self.wait_until_idle()
+        self.assertEqual(self.calls, [0, 5])
+        self.assertEqual(self.executor.stats()["coalesced"], 4)
+
+    def test_concurrent_does_not_wait_for_busy_key(self):
+        self.executor.submit(self.blocking_action, 0, key="pad", policy=QueuePolicy.CONCURRENT)
+        self.started.wait(2)
+        done = threading.Event()
+        self.executor.submit(done.set, key="pad", policy=QueuePolicy.CONCURRENT)
+        self.assertTrue(done.wait(2))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        executor = ActionExecutor(workers=1, max_queue=2)
+        for value in range(4):
+            executor.submit(self.record_action, value)
+        self.assertEqual(executor.stats()["dropped"], 2)
+
+    def test_failing_action_is_counted(self):
+        def broken():
+            raise RuntimeError("boom")
+        self.executor.submit(broken, key="pad", policy=QueuePolicy.SERIALIZE)
+        self.wait_until_idle()
+        self.assertEqual(self.executor.stats()["failed"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
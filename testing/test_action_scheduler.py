@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from src.models.action_scheduler import ActionScheduler, parse_sequence
+
+class TestParseSequence(unittest.TestCase):
+
+    def test_text_and_list_forms(self):
+        expected = [(0.0, "keys", "ctrl+c"), (50.0, "command", "start notepad"), (10.0, "print", "done")]
+        self.assertEqual(parse_sequence("keys ctrl+c; wait 50; cmd start notepad; delay 4; sleep 6; print done"), expected)
+        self.assertEqual(parse_sequence([{"keys": "ctrl+c"}, {"delay": 50}, {"command": "start notepad"},
+                                         {"delay": 10}, {"print": "done"}]), expected)
+
+    def test_invalid_steps(self):
+        with self.assertRaises(ValueError):
+            parse_sequence("jump 3")
+        with self.assertRaises(ValueError):
+            parse_sequence("wait soon; keys a")
+        self.assertEqual(parse_sequence(""), [])
+
+class TestActionScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.runs = []
+        self.scheduler = ActionScheduler(self.run_step, workers=4)
+        self.scheduler.start()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def run_step(self, kind, value, context):
+        if kind == "command" and value == "slow":
+            time.sleep(0.2)
+        with self.lock:
+            self.runs.append((context, value, time.perf_counter()))
+
+    def wait_until_finished(self, timeout=2):
+        deadline = time.monotonic() + timeout
+        while self.scheduler.active and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(self.scheduler.active, 0)
+
+    def test_delays_are_kept(self):
+        started = time.perf_counter()
+        self.scheduler.schedule(parse_sequence("print a; wait 20; print b; wait 30; print c"), "pad")
+        self.wait_until_finished()
+
+        self.assertEqual([value for _, value, _ in self.runs], ["a", "b", "c"])
+        offsets = [at - started for _, _, at in self.runs]
+        self.assertAlmostEqual(offsets[1], 0.020, delta=0.010)
+        self.assertAlmostEqual(offsets[2], 0.050, delta=0.010)
+        self.assertLess(self.scheduler.lateness.percentile(50), 1_000_000)
+
+    def test_sequences_interleave(self):
+        self.scheduler.schedule(parse_sequence("print a1; wait 20; print a2; wait 20; print a3"), "a")
+        time.sleep(0.01)
+        self.scheduler.schedule(parse_sequence("print b1; wait 20; print b2; wait 20; print b3"), "b")
+        self.wait_until_finished()
+        self.assertEqual([value for _, value, _ in self.runs], ["a1", "b1", "a2", "b2", "a3", "b3"])
+
+    def test_slow_step_only_delays_its_own_sequence(self):
+        self.scheduler.schedule(parse_sequence("command slow; print after slow"), "slow pad")
+        started = time.perf_counter()
+        self.scheduler.schedule(parse_sequence("wait 10; print fast"), "fast pad")
+        self.wait_until_finished()
+
+        fast = next(at for context, _, at in self.runs if context == "fast pad")
+        self.assertLess(fast - started, 0.1)
+        self.assertEqual([value for context, value, _ in self.runs if context == "slow pad"], ["slow", "after slow"])
+
+    def test_stop_drops_steps_not_due(self):
+        self.scheduler.schedule(parse_sequence("wait 500; print never"), "pad")
+        self.scheduler.stop()
+        time.sleep(0.6)
+        self.assertEqual(self.runs, [])
+
+    def test_empty_sequence_is_not_scheduled(self):
+        self.assertIsNone(self.scheduler.schedule([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from benchmarks.bench_dispatch import build_profiles, compare, run_benchmark
+
+class TestBenchDispatch(unittest.TestCase):
+
+    def test_build_profiles(self):
+        profiles = build_profiles(3, bindings=8)
+        self.assertEqual(list(profiles), ["default", "profile_1", "profile_2"])
+        self.assertEqual(len(profiles["profile_2"]["KEY"]), 8)
+        self.assertEqual(profiles["profile_2"]["CONTROL_CHANGE"]["1"]["params"]["cc_control_id"], "16")
+
+    def test_small_run_reports_every_scenario(self):
+        report = run_benchmark((1, 3), ("note", "clock"), count=200, quiet=True)
+        self.assertEqual([(result["profiles"], result["scenario"]) for result in report["results"]],
+                         [(1, "note"), (1, "clock"), (3, "note"), (3, "clock")])
+        note = report["results"][2]
+        self.assertGreater(note["throughput"], 0)
+        self.assertEqual(note["latency"]["lookup"]["count"], 200)
+        self.assertEqual(note["actions"], note["latency"]["total"]["count"])
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [{"profiles": 1, "scenario": "note", "throughput": 1000,
+                                 "latency": {"total": {"p99_us": 100}, "lookup": {"p99_us": 0.5}}}]}
+        same = {"results": [{"profiles": 1, "scenario": "note", "throughput": 950,
+                             "latency": {"total": {"p99_us": 110}, "lookup": {"p99_us": 0.9}}}]}
+        slower = {"results": [{"profiles": 1, "scenario": "note", "throughput": 500,
+                               "latency": {"total": {"p99_us": 200}, "lookup": {"p99_us": 0.5}}}]}
+
+        self.assertEqual(compare(same, baseline), [])
+        self.assertEqual(len(compare(slower, baseline)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+import mido
+from src.models.cc_coalescer import ControlChangeCoalescer
+
+class TestControlChangeCoalescer(unittest.TestCase):
+
+    def setUp(self):
+        self.received = []
+        self.flushed = threading.Event()
+        self.coalescer = ControlChangeCoalescer(self.sink, window=0.02)
+
+    def tearDown(self):
+        self.coalescer.stop()
+
+    def sink(self, msg):
+        self.received.append(msg)
+        self.flushed.set()
+
+    def test_burst_collapses_to_latest_value(self):
+        self.coalescer.start()
+        for value in range(100):
+            self.coalescer.push(mido.Message("control_change", control=7, value=value))
+            self.coalescer.push(mido.Message("control_change", control=8, value=127 - value))
+
+        deadline = time.monotonic() + 2
+        while len(self.received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        self.assertEqual(sorted((msg.control, msg.value) for msg in self.received), [(7, 99), (8, 28)])
+        self.assertEqual(self.coalescer.received, 200)
+        self.assertEqual(self.coalescer.emitted, 2)
+
+    def test_channels_are_kept_apart(self):
+        self.coalescer.push(mido.Message("control_change", channel=0, control=7, value=1))
+        self.coalescer.push(mido.Message("control_change", channel=1, control=7, value=2))
+        self.coalescer.stop()
+        self.assertEqual(len(self.received), 2)
+
+    def test_groups_are_kept_apart(self):
+        self.coalescer.push(mido.Message("control_change", control=7, value=1), group="keys")
+        self.coalescer.push(mido.Message("control_change", control=7, value=2), group="pads")
+        self.coalescer.push(mido.Message("control_change", control=7, value=3), group="pads")
+        self.coalescer.stop()
+        self.assertEqual(sorted(msg.value for msg in self.received), [1, 3])
+
+    def test_other_messages_pass_through(self):
+        self.coalescer.push(mido.Message("note_on", note=60, velocity=100))
+        self.assertEqual(self.received[0].type, "note_on")
+
+    def test_stop_flushes_pending(self):
+        self.coalescer.push(mido.Message("control_change", control=1, value=64))
+        self.assertEqual(self.received, [])
+        self.coalescer.stop()
+        self.assertEqual(self.received[0].value, 64)
+
+    def test_zero_window_disables_coalescing(self):
+        coalescer = ControlChangeCoalescer(self.sink, window=0)
+        coalescer.push(mido.Message("control_change", control=1, value=1))
+        coalescer.push(mido.Message("control_change", control=1, value=2))
+        self.assertEqual([msg.value for msg in self.received], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
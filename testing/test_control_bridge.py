@@ -0,0 +1,54 @@
+import os
+import threading
+import unittest
+import mido
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtWidgets import QApplication
+from src.widgets.control_bridge import ControlStateBridge
+
+class TestControlStateBridge(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.bridge = ControlStateBridge(interval=1000)
+        self.batches = []
+        self.bridge.controls_changed.connect(self.batches.append)
+
+    def tearDown(self):
+        self.bridge.stop()
+
+    def test_flood_becomes_one_batch(self):
+        def listener():
+            for value in range(128):
+                self.bridge.push(mido.Message("control_change", control=7, value=value))
+                self.bridge.push(mido.Message("control_change", channel=1, control=7, value=127 - value))
+        thread = threading.Thread(target=listener)
+        thread.start()
+        thread.join()
+        self.bridge.flush()
+
+        self.assertEqual(self.batches, [{("control_change", 0, 7): 127, ("control_change", 1, 7): 0}])
+        self.assertEqual(self.bridge.received, 256)
+        self.assertEqual(self.bridge.frames, 1)
+
+    def test_notes_and_pitchwheel(self):
+        self.bridge.push(mido.Message("note_on", note=60, velocity=90))
+        self.bridge.push(mido.Message("note_off", note=61))
+        self.bridge.push(mido.Message("pitchwheel", pitch=-200))
+        self.bridge.push(mido.Message("clock"))
+        self.bridge.flush()
+        self.assertEqual(self.batches, [{("note", 0, 60): 90, ("note", 0, 61): 0, ("pitchwheel", 0): -200}])
+
+    def test_nothing_emitted_without_changes(self):
+        self.bridge.flush()
+        self.assertEqual(self.batches, [])
+
+    def test_frame_interval(self):
+        self.assertGreaterEqual(ControlStateBridge.frame_interval(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+import mido
+from src.models.device_monitor import DeviceMonitor
+from src.models.midi_sources import PortSource
+
+class FakePort():
+    def __init__(self, name, callback=None):
+        self.name = name
+        self.callback = callback
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class TestDeviceMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.devices = ["keys", "pads"]
+        self.changes = []
+        self.ports = []
+        patches = [
+            mock.patch("mido.get_input_names", side_effect=lambda: list(self.devices)),
+            mock.patch("mido.open_input", side_effect=self.open_input),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.monitor = DeviceMonitor(on_change=lambda added, removed, devices: self.changes.append((added, removed, devices)))
+
+    def open_input(self, name, callback=None):
+        port = FakePort(name, callback)
+        self.ports.append(port)
+        return port
+
+    def test_reports_added_and_removed_devices(self):
+        self.assertTrue(self.monitor.poll())
+        self.assertFalse(self.monitor.poll())
+        self.devices = ["pads", "drums"]
+        self.assertTrue(self.monitor.poll())
+
+        self.assertEqual(self.changes, [(["keys", "pads"], [], ["keys", "pads"]),
+                                        (["drums"], ["keys"], ["pads", "drums"])])
+
+    def test_listing_errors_are_ignored(self):
+        monitor = DeviceMonitor(list_devices=mock.Mock(side_effect=OSError("no backend")))
+        self.assertFalse(monitor.poll())
+        self.assertIsNone(monitor.devices)
+
+    def test_watched_port_reconnects(self):
+        received = []
+        source = PortSource("pads")
+        source.open()
+        source._open_port(received.append)
+        self.monitor.poll()
+        self.monitor.watch(source)
+        stale = self.ports[0]
+
+        self.devices = ["keys"]
+        self.monitor.poll()
+        self.assertTrue(source.disconnected)
+        self.assertTrue(stale.closed)
+        stale.callback(mido.Message("note_on", note=1))
+
+        self.devices = ["keys", "pads"]
+        self.monitor.poll()
+        self.assertFalse(source.disconnected)
+        self.ports[1].callback(mido.Message("note_on", note=2))
+
+        self.assertEqual([msg.note for msg in received], [2])
+        stats = self.monitor.stats()["pads"]
+        self.assertEqual((stats["disconnects"], stats["reconnects"], stats["dropped"]), (1, 1, 1))
+        self.assertTrue(stats["connected"])
+        self.assertGreater(stats["downtime"], 0)
+
+    def test_unwatched_port_is_left_alone(self):
+        source = PortSource("pads")
+        self.monitor.poll()
+        self.monitor.watch(source)
+        self.monitor.unwatch(source)
+        self.devices = []
+        self.monitor.poll()
+        self.assertFalse(source.disconnected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import mido
+from src.models.dispatch_table import DispatchTable
+from src.models.enums import MidiControlType, MidiActionType
+
+class TestDispatchTable(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = {
+            "file_path": "None",
+            "program_window_name": "chrome",
+            "KEY": {
+                "69": {"action": "1", "params": {"RUN_COMMAND": "start notepad"}},
+                "70": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "CTRL + T"}, "channel": 3},
+                "71": {"action": "4", "params": {"PRINT_MESSAGE": "minilab only"}, "device": "Minilab3"},
+                "bad": {"action": "1", "params": {"RUN_COMMAND": "ignored"}},
+            },
+            "CONTROL_CHANGE": {
+                "0": {"action": "1", "params": {"cc_control_id": "74", "RUN_COMMAND": "volume"}},
+                "5": {"action": "1", "params": {"RUN_COMMAND": "no cc id"}},
+                "6": {"action": "4", "params": {"cc_control_id": "74", "PRINT_MESSAGE": "pads"}, "device": "pads"},
+            },
+            "PITCHWEEL": {"1": {"action": "4", "params": {"PRINT_MESSAGE": "Pitch wheel moved!"}}},
+        }
+        self.table = DispatchTable("chrome", self.profile)
+
+    def test_note_on_lookup(self):
+        binding = self.table.lookup(mido.Message("note_on", note=69, velocity=100, channel=9))
+        self.assertEqual(binding.control_type, MidiControlType.KEY)
+        self.assertEqual(binding.action_type, MidiActionType.RUN_COMMAND)
+        self.assertEqual(binding.conf, self.profile["KEY"]["69"])
+
+    def test_note_on_zero_velocity_is_ignored(self):
+        self.assertIsNone(self.table.lookup(mido.Message("note_on", note=69, velocity=0)))
+
+    def test_channel_specific_binding(self):
+        self.assertIsNotNone(self.table.lookup(mido.Message("note_on", note=70, velocity=1, channel=3)))
+        self.assertIsNone(self.table.lookup(mido.Message("note_on", note=70, velocity=1, channel=4)))
+
+    def test_device_specific_binding(self):
+        msg = mido.Message("note_on", note=71, velocity=100)
+        self.assertEqual(self.table.lookup(msg, "Minilab3 MIDI 0").params["PRINT_MESSAGE"], "minilab only")
+        self.assertIsNone(self.table.lookup(msg, "Launchpad"))
+        self.assertIsNone(self.table.lookup(msg))
+        self.assertEqual(self.table.devices, ["minilab3", "pads"])
+
+    def test_device_binding_takes_precedence(self):
+        msg = mido.Message("control_change", control=74, value=1)
+        self.assertEqual(self.table.lookup(msg, "Pads MIDI 1").params["PRINT_MESSAGE"], "pads")
+        self.assertEqual(self.table.lookup(msg, "Minilab3 MIDI 0").params["RUN_COMMAND"], "volume")
+
+    def test_control_change_uses_cc_control_id(self):
+        binding = self.table.lookup(mido.Message("control_change", control=74, value=10))
+        self.assertEqual(binding.params["RUN_COMMAND"], "volume")
+        self.assertIsNone(self.table.lookup(mido.Message("control_change", control=0, value=10)))
+
+    def test_control_change_falls_back_to_key(self):
+        binding = self.table.lookup(mido.Message("control_change", control=5, value=10))
+        self.assertEqual(binding.params["RUN_COMMAND"], "no cc id")
+
+    def test_pitchwheel_lookup(self):
+        binding = self.table.lookup(mido.Message("pitchwheel", pitch=100))
+        self.assertEqual(binding.action_type, MidiActionType.PRINT_MESSAGE)
+
+    def test_unbound_and_unknown_messages(self):
+        self.assertIsNone(self.table.lookup(mido.Message("note_on", note=1, velocity=1)))
+        self.assertIsNone(self.table.lookup(mido.Message("note_off", note=69)))
+        self.assertIsNone(self.table.lookup(mido.Message("clock")))
+
+
+if __name__ == '__main__':
+    unittest.main()
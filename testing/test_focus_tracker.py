@@ -0,0 +1,61 @@
+import unittest
+from src.models.focus_tracker import FocusTracker
+from src.models.profile_detection import ProfileDetection
+from src.models.window_provider import WindowProvider
+
+class FakeWindowProvider(WindowProvider):
+    def __init__(self, title=None):
+        self.title = title
+        self.calls = 0
+
+    def get_active_title(self):
+        self.calls += 1
+        return self.title
+
+class TestFocusTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.profiles = {
+            "default": {"program_window_name": "default"},
+            "chrome": {"program_window_name": "chrome"},
+        }
+        self.provider = FakeWindowProvider("new tab - google chrome")
+        self.profile_detection = ProfileDetection(self.provider)
+        self.changes = []
+        self.tracker = FocusTracker(lambda title: self.profile_detection.match_profile_name(self.profiles, title),
+                                    self.provider, on_change=self.changes.append)
+
+    def test_resolves_on_start(self):
+        self.assertEqual(self.tracker.active_profile, "chrome")
+        self.assertEqual(self.changes, ["chrome"])
+
+    def test_publishes_only_on_profile_change(self):
+        self.provider.title = "settings - google chrome"
+        self.assertFalse(self.tracker.poll())
+        self.provider.title = "untitled - notepad"
+        self.assertTrue(self.tracker.poll())
+        self.assertEqual(self.tracker.active_profile, "default")
+        self.assertEqual(self.changes, ["chrome", "default"])
+
+    def test_no_active_window_falls_back_to_default(self):
+        self.provider.title = None
+        self.tracker.poll()
+        self.assertEqual(self.tracker.active_profile, "default")
+
+    def test_refresh_after_profiles_change(self):
+        self.provider.title = "untitled - notepad"
+        self.tracker.poll()
+        self.profiles["notepad"] = {"program_window_name": "notepad"}
+        self.assertTrue(self.tracker.refresh())
+        self.assertEqual(self.tracker.active_profile, "notepad")
+
+    def test_provider_errors_do_not_escape(self):
+        def broken():
+            raise RuntimeError("no display")
+        self.provider.get_active_title = broken
+        self.tracker.poll()
+        self.assertEqual(self.tracker.active_profile, "default")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QWidget
+from src.widgets.knob_widget import KnobWidget
+from src.widgets.base_widget import BaseWidget
+from src.models.profile_store import ProfileStore
+
+class TestKnobWidget(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        # the widgets share a store on ./profiles.json, keep it out of the working tree
+        cls.cwd = os.getcwd()
+        cls.directory = tempfile.TemporaryDirectory()
+        os.chdir(cls.directory.name)
+        cls.host = QWidget()
+
+    @classmethod
+    def tearDownClass(cls):
+        if BaseWidget._profile_model:
+            BaseWidget._profile_model.close()
+        if BaseWidget._side_panel_instance:
+            BaseWidget._side_panel_instance.write_queue.stop()
+        BaseWidget._side_panel_instance = BaseWidget._profile_model = BaseWidget._profile_detection = None
+        ProfileStore._instances.pop(os.path.abspath("profiles.json"), None)
+        cls.host.deleteLater()
+        os.chdir(cls.cwd)
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.knob = KnobWidget(parent=self.host, knob_id=0)
+        self.knob.resize(100, 100)
+
+    def paint(self):
+        image = QImage(self.knob.size(), QImage.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        self.knob.paint(painter, self.knob.rect())
+        painter.end()
+        return image
+
+    def test_body_is_rendered_once(self):
+        self.paint()
+        body = self.knob.knob_body()
+        self.knob.value = 10
+        self.paint()
+        self.assertIs(self.knob.knob_body(), body)
+
+    def test_resize_invalidates_body(self):
+        body = self.knob.knob_body()
+        self.knob.resize(120, 120)
+        self.assertIsNot(self.knob.knob_body(), body)
+        self.assertEqual(self.knob.knob_body().width(), round(120 * self.knob.devicePixelRatioF()))
+
+    def test_indicator_follows_value(self):
+        center, _ = self.knob.knob_geometry()
+        self.assertLess(self.knob.indicator_end(0).x(), center.x())
+        self.assertEqual(self.knob.indicator_end(63.5).x(), center.x())
+        self.assertGreater(self.knob.indicator_end(127).x(), center.x())
+        self.assertLess(self.knob.indicator_end(63.5).y(), center.y())
+
+    def test_dirty_rect_covers_old_and_new_indicator(self):
+        dirty = self.knob.dirty_rect(0, 127)
+        for value in (0, 127):
+            self.assertTrue(dirty.contains(self.knob.indicator_end(value)))
+        self.assertTrue(dirty.contains(self.knob.value_text_rect()))
+        self.assertLess(self.knob.dirty_rect(60, 61).width(), self.knob.width())
+
+    def test_show_value(self):
+        self.knob.show_value(100)
+        self.assertEqual(self.knob.value, 100)
+        with self.assertRaises(ValueError):
+            self.knob.show_value(200)
+
+
+if __name__ == '__main__':
+    unittest.main()
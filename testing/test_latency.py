@@ -0,0 +1,69 @@
+import csv
+import os
+import tempfile
+import unittest
+from src.models.latency import LatencyHistogram, LatencyRecorder, STAGES
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(50), 50)
+        self.assertEqual(histogram.percentile(99), 99)
+        self.assertEqual(histogram.min, 1)
+        self.assertEqual(histogram.max, 100)
+
+    def test_large_values_within_precision(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+        for percent in (50, 90, 99, 99.9):
+            expected = percent / 100 * 10_000_000
+            self.assertAlmostEqual(histogram.percentile(percent), expected, delta=expected * 0.02)
+        self.assertEqual(histogram.percentile(100), 10_000_000)
+
+    def test_bucket_bounds_are_contiguous(self):
+        previous = -1
+        for index in range(LatencyHistogram._index(1 << 30)):
+            upper = LatencyHistogram._upper_bound(index)
+            self.assertEqual(LatencyHistogram._index(upper), index)
+            self.assertEqual(LatencyHistogram._index(previous + 1), index)
+            previous = upper
+
+    def test_out_of_range_values_are_clamped(self):
+        histogram = LatencyHistogram(highest=1_000_000)
+        histogram.record(-5)
+        histogram.record(5_000_000)
+        self.assertEqual(histogram.min, 0)
+        self.assertEqual(histogram.max, 1_000_000)
+
+class TestLatencyRecorder(unittest.TestCase):
+
+    def test_summary_and_csv(self):
+        recorder = LatencyRecorder()
+        for stage in STAGES:
+            recorder.record(stage, 2000)
+        recorder.record_action("KEYBOARD_SHORTCUT", 5000)
+
+        self.assertIn("action KEYBOARD_SHORTCUT", recorder.summary())
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "latency.csv")
+            recorder.write_csv(file_path)
+            with open(file_path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual([row["name"] for row in rows], list(STAGES) + ["KEYBOARD_SHORTCUT"])
+        self.assertEqual(rows[-1]["p50_us"], "5.000")
+
+    def test_reset(self):
+        recorder = LatencyRecorder()
+        recorder.record("total", 10)
+        recorder.record_action("RUN_COMMAND", 10)
+        recorder.reset()
+        self.assertEqual([row[2] for row in recorder.snapshot()], [0] * len(STAGES))
+
+
+if __name__ == '__main__':
+    unittest.main()
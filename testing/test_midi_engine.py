@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import mido
+from src.models.midi_engine import MidiEngine
+from src.models.midi_recorder import MidiRecorder
+from src.models.midi_sources import LoopbackSource, MidiFileSource, SyntheticSource
+from src.models.window_provider import WindowProvider
+
+class FakeWindowProvider(WindowProvider):
+    def __init__(self, title=None):
+        self.title = title
+
+    def get_active_title(self):
+        return self.title
+
+class TestMidiEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.profile_path = os.path.join(self.directory.name, "profiles.json")
+        with open(self.profile_path, "w") as file:
+            json.dump({
+                "default": {"KEY": {"60": {"action": "4", "params": {"PRINT_MESSAGE": "default"}}}},
+                "chrome": {"program_window_name": "chrome", "KEY": {"60": {"action": "4", "params": {"PRINT_MESSAGE": "chrome"}}},
+                           "CONTROL_CHANGE": {"0": {"action": "4", "params": {"cc_control_id": "7", "PRINT_MESSAGE": "volume"}}}},
+            }, file)
+
+        self.calls = []
+        self.called = threading.Event()
+        self.window_provider = FakeWindowProvider("new tab - google chrome")
+        self.engine = MidiEngine(self.handler, self.profile_path, self.window_provider, cc_window=0.005)
+
+    def tearDown(self):
+        self.engine.stop()
+        self.directory.cleanup()
+
+    def handler(self, action_conf, msg):
+        self.calls.append((action_conf["params"]["PRINT_MESSAGE"], msg))
+        self.called.set()
+
+    def wait_for_calls(self, count):
+        deadline = time.monotonic() + 2
+        while len(self.calls) < count and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def run_in_background(self, source):
+        thread = threading.Thread(target=self.engine.run, args=(source,), daemon=True)
+        thread.start()
+        return thread
+
+    def test_loopback_dispatches_to_active_profile(self):
+        source = LoopbackSource()
+        thread = self.run_in_background(source)
+        source.send(mido.Message("note_on", note=60, velocity=100))
+        source.send(mido.Message("note_on", note=61, velocity=100))
+        self.wait_for_calls(1)
+
+        self.assertEqual([name for name, _ in self.calls], ["chrome"])
+        self.assertEqual(self.calls[0][1].note, 60)
+        self.engine.stop()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+
+    def test_control_changes_are_coalesced(self):
+        source = LoopbackSource()
+        self.run_in_background(source)
+        for value in range(50):
+            source.send(mido.Message("control_change", control=7, value=value))
+        self.wait_for_calls(1)
+        time.sleep(0.05)
+
+        self.assertEqual([msg.value for _, msg in self.calls], [49])
+
+    def test_on_reload_sees_the_loaded_profiles(self):
+        snapshots = []
+        self.engine = MidiEngine(self.handler, self.profile_path, self.window_provider, on_reload=snapshots.append)
+        self.engine.start()
+        self.assertEqual(sorted(snapshots[0].profiles), ["chrome", "default"])
+
+        time.sleep(0.01)
+        with open(self.profile_path, "w") as file:
+            json.dump({"default": {}}, file)
+        deadline = time.monotonic() + 2
+        while len(snapshots) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(list(snapshots[-1].profiles), ["default"])
+
+    def test_stop_during_start_ends_run(self):
+        starting, release = threading.Event(), threading.Event()
+        def slow_reload(_):
+            starting.set()
+            release.wait(2)
+        self.engine = MidiEngine(self.handler, self.profile_path, self.window_provider, on_reload=slow_reload)
+        thread = self.run_in_background(LoopbackSource())
+        self.assertTrue(starting.wait(2))
+
+        self.engine.stop()
+        release.set()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.engine.running)
+
+    def test_stop_does_not_wait_for_running_actions(self):
+        release = threading.Event()
+        self.engine = MidiEngine(lambda conf, msg: (self.called.set(), release.wait(2)), self.profile_path, self.window_provider)
+        source = LoopbackSource()
+        thread = self.run_in_background(source)
+        source.send(mido.Message("note_on", note=60, velocity=100))
+        self.assertTrue(self.called.wait(2))
+
+        started = time.perf_counter()
+        self.engine.stop()
+        self.assertLess(time.perf_counter() - started, 0.1)
+        release.set()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.engine.running)
+
+    def test_latency_is_recorded_per_stage(self):
+        self.window_provider.title = None
+        self.engine.run(SyntheticSource(["note_on"], count=20, numbers=[60]))
+        rows = {name: count for _, name, count, *_ in self.engine.latency.snapshot()}
+
+        executed = self.engine.action_executor.stats()["executed"]
+        self.assertEqual(rows["lookup"], 20)
+        self.assertGreater(executed, 0)
+        self.assertEqual(rows["total"], executed)
+        self.assertEqual(rows["PRINT_MESSAGE"], executed)
+
+    def test_synthetic_source_runs_to_completion(self):
+        self.window_provider.title = None
+        self.engine.run(SyntheticSource(["note_on"], count=200, numbers=[60]))
+        self.assertFalse(self.engine.running)
+        self.assertEqual(self.engine.action_executor.stats()["submitted"], 200)
+
+    def test_recorder_captures_pushed_messages(self):
+        recorder = MidiRecorder()
+        recorder.start()
+        self.engine.recorder = recorder
+        self.engine.run(SyntheticSource(["note_on", "clock"], count=50))
+
+        self.assertEqual(recorder.message_count, 50)
+
+    def test_midi_file_source(self):
+        file_path = os.path.join(self.directory.name, "take.mid")
+        midi_file = mido.MidiFile()
+        track = mido.MidiTrack()
+        track.append(mido.Message("note_on", note=60, velocity=100, time=0))
+        track.append(mido.Message("note_off", note=60, time=10))
+        midi_file.tracks.append(track)
+        midi_file.save(file_path)
+
+        with MidiFileSource(file_path, realtime=False) as source:
+            self.assertEqual([msg.type for msg in source], ["note_on", "note_off"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+import mido
+from src.models.midi_recorder import MidiRecorder
+from src.models.midi_sources import MidiFileSource
+
+class TestMidiRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "session.mid")
+        self.recorder = MidiRecorder()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record_session(self, offsets_ms):
+        self.recorder.start()
+        started = time.perf_counter_ns()
+        for index, offset in enumerate(offsets_ms):
+            self.recorder.record(mido.Message("note_on", note=60 + index, velocity=100), started + int(offset * 1_000_000))
+        self.recorder.stop()
+        return self.recorder.save(self.file_path)
+
+    def test_saved_file_keeps_timing(self):
+        offsets = [0, 1.5, 2, 250, 250.04]
+        self.assertEqual(self.record_session(offsets), 5)
+
+        midi_file = mido.MidiFile(self.file_path)
+        elapsed = 0.0
+        times = []
+        for msg in midi_file:
+            elapsed += msg.time
+            if not msg.is_meta:
+                times.append((elapsed, msg.note))
+        first = times[0][0]
+        for (seconds, note), offset in zip(times, offsets):
+            self.assertAlmostEqual((seconds - first) * 1000, offset, delta=0.03)
+        self.assertEqual([note for _, note in times], [60, 61, 62, 63, 64])
+
+    def test_realtime_messages_survive_the_file(self):
+        self.recorder.start()
+        for msg in (mido.Message("start"), mido.Message("clock"), mido.Message("note_on", note=60), mido.Message("stop")):
+            self.recorder.record(msg)
+        self.recorder.save(self.file_path)
+
+        with MidiFileSource(self.file_path, realtime=False) as source:
+            self.assertEqual([msg.type for msg in source], ["start", "clock", "note_on", "stop"])
+
+    def test_nothing_recorded_while_stopped(self):
+        self.recorder.record(mido.Message("note_on", note=60))
+        self.assertEqual(self.recorder.message_count, 0)
+
+    def test_realtime_replay_is_accurate(self):
+        self.record_session([index * 5 for index in range(20)])
+        source = MidiFileSource(self.file_path)
+        started = time.perf_counter()
+        with source:
+            notes = [msg.note for msg in source]
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(notes, list(range(60, 80)))
+        self.assertGreaterEqual(elapsed, 0.095)
+        self.assertEqual(source.lateness.count, 20)
+        self.assertLess(source.lateness.percentile(50), 1_000_000)
+
+    def test_fast_replay(self):
+        self.record_session([0, 1000, 2000])
+        started = time.perf_counter()
+        with MidiFileSource(self.file_path, realtime=False) as source:
+            self.assertEqual(len(list(source)), 3)
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_close_interrupts_replay(self):
+        self.record_session([0, 5000])
+        source = MidiFileSource(self.file_path)
+        with source:
+            iterator = iter(source)
+            next(iterator)
+            source.close()
+            started = time.perf_counter()
+            self.assertEqual(list(iterator), [])
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
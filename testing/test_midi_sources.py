@@ -0,0 +1,178 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import mido
+from src.models.midi_engine import MidiEngine
+from src.models.midi_sources import LoopbackSource, MergedSource, PortSource, SyntheticSource, sleep_until
+from src.models.window_provider import WindowProvider
+
+class FakePort():
+    """Stands in for a mido input port opened with a callback."""
+    def __init__(self, name, callback=None):
+        self.name = name
+        self.callback = callback
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class FakeWindowProvider(WindowProvider):
+    def get_active_title(self):
+        return None
+
+class TestPortSource(unittest.TestCase):
+
+    def setUp(self):
+        self.ports = []
+        patches = [
+            mock.patch("mido.get_input_names", return_value=["pads"]),
+            mock.patch("mido.open_input", side_effect=self.open_input),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def open_input(self, name, callback=None):
+        port = FakePort(name, callback)
+        self.ports.append(port)
+        return port
+
+    def test_missing_device(self):
+        with self.assertRaises(IOError):
+            PortSource("keys").open()
+
+    def test_listen_returns_when_closed(self):
+        received = []
+        source = PortSource("pads")
+        source.open()
+        thread = threading.Thread(target=source.listen, args=(received.append,), daemon=True)
+        thread.start()
+        while not self.ports:
+            time.sleep(0.001)
+        self.ports[0].callback(mido.Message("note_on", note=60))
+
+        started = time.perf_counter()
+        source.close()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertTrue(self.ports[0].closed)
+        self.assertEqual([msg.note for msg in received], [60])
+
+    def test_iterator_ends_when_closed(self):
+        source = PortSource("pads")
+        source.open()
+        iterator = iter(source)
+        threading.Timer(0.02, lambda: (self.ports[0].callback(mido.Message("clock")), source.close())).start()
+        self.assertEqual([msg.type for msg in iterator], ["clock"])
+
+    def test_close_before_listen(self):
+        source = PortSource("pads")
+        source.open()
+        source.close()
+        source.listen(print)
+        self.assertEqual(self.ports, [])
+
+    def test_engine_stop_is_immediate(self):
+        calls = []
+        engine = MidiEngine(lambda conf, msg: calls.append(msg), profile_path="missing.json", window_provider=FakeWindowProvider())
+        thread = threading.Thread(target=engine.run, args=(PortSource("pads"),), daemon=True)
+        thread.start()
+        while not self.ports:
+            time.sleep(0.001)
+
+        started = time.perf_counter()
+        engine.stop()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertTrue(self.ports[0].closed)
+
+class TestMergedSource(unittest.TestCase):
+
+    def test_messages_are_tagged_and_interleaved(self):
+        flood = SyntheticSource(["note_on"], count=500, numbers=[60])
+        pads = LoopbackSource("pads")
+        merged = MergedSource([flood, pads])
+        received = []
+
+        def callback(msg, device, received_at):
+            received.append(device)
+            if len(received) == 1:
+                for _ in range(5):
+                    pads.send(mido.Message("note_on", note=36))
+                pads.close()
+                while len(merged._pending["pads"]) < 5:
+                    time.sleep(0.001)
+
+        merged.open()
+        merged.listen(callback)
+        # the five pad hits come out within the next turns instead of after the flood
+        pad_positions = [index for index, device in enumerate(received) if device == "pads"]
+        self.assertEqual(len(pad_positions), 5)
+        self.assertEqual(received.count("synthetic"), 500 - merged.dropped["synthetic"])
+        self.assertLess(pad_positions[-1], 12)
+
+    def test_full_queue_drops_oldest(self):
+        merged = MergedSource([LoopbackSource("a")], max_pending=2)
+        pending = merged._pending["a"]
+        merged._active_readers = 1
+        reader = threading.Thread(target=merged._read, args=(merged.sources[0],))
+        reader.start()
+        for note in range(5):
+            merged.sources[0].send(mido.Message("note_on", note=note))
+        merged.sources[0].close()
+        reader.join(1)
+        self.assertEqual([msg.note for msg, _ in pending], [3, 4])
+        self.assertEqual(merged.dropped["a"], 3)
+
+    def test_unavailable_device_waits_for_reconnect(self):
+        opened = []
+        open_input = lambda name, callback=None: opened.append(FakePort(name, callback)) or opened[-1]
+        with mock.patch("mido.get_input_names", return_value=["pads"]), mock.patch("mido.open_input", side_effect=open_input):
+            merged = MergedSource([PortSource("pads"), PortSource("keys")])
+            merged.open()
+            self.assertEqual([port.name for port in merged.ports], ["pads", "keys"])
+            self.assertTrue(merged.ports[1].disconnected)
+            thread = threading.Thread(target=merged.listen, args=(lambda *_: None,), daemon=True)
+            thread.start()
+            deadline = time.monotonic() + 2
+            while not merged.ports[1].reconnect() and time.monotonic() < deadline:
+                time.sleep(0.005)  # the reader has to be listening before the port can reconnect
+            self.assertEqual(sorted(port.name for port in opened), ["keys", "pads"])
+            self.assertFalse(merged.ports[1].disconnected)
+            merged.close()
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+
+    def test_no_available_device(self):
+        with mock.patch("mido.get_input_names", return_value=[]):
+            with self.assertRaises(IOError):
+                MergedSource([PortSource("pads"), PortSource("keys")]).open()
+
+    def test_close_ends_listen(self):
+        merged = MergedSource([LoopbackSource("a"), LoopbackSource("b")])
+        merged.open()
+        thread = threading.Thread(target=merged.listen, args=(print,), daemon=True)
+        thread.start()
+        time.sleep(0.01)
+        merged.close()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+
+class TestSleepUntil(unittest.TestCase):
+
+    def test_wakes_on_time(self):
+        deadline = time.perf_counter() + 0.01
+        self.assertTrue(sleep_until(deadline))
+        self.assertLess(time.perf_counter() - deadline, 0.005)
+
+    def test_stop_event(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertFalse(sleep_until(time.perf_counter() + 5, stop_event))
+
+
+if __name__ == '__main__':
+    unittest.main()
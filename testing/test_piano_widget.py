@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QWidget
+from src.widgets.piano_widget import PianoWidget
+from src.widgets.base_widget import BaseWidget
+from src.models.profile_store import ProfileStore
+
+class TestPianoWidget(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        # the widgets share a store on ./profiles.json, keep it out of the working tree
+        cls.cwd = os.getcwd()
+        cls.directory = tempfile.TemporaryDirectory()
+        os.chdir(cls.directory.name)
+        cls.host = QWidget()
+
+    @classmethod
+    def tearDownClass(cls):
+        if BaseWidget._profile_model:
+            BaseWidget._profile_model.close()
+        if BaseWidget._side_panel_instance:
+            BaseWidget._side_panel_instance.write_queue.stop()
+        BaseWidget._side_panel_instance = BaseWidget._profile_model = BaseWidget._profile_detection = None
+        ProfileStore._instances.pop(os.path.abspath("profiles.json"), None)
+        cls.host.deleteLater()
+        os.chdir(cls.cwd)
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.piano = PianoWidget(self.host)
+        self.piano.resize(36 * 21, 200)
+
+    def test_key_table(self):
+        self.assertEqual(len(self.piano.white_keys), 21)
+        self.assertEqual(len(self.piano.black_keys), 15)
+        self.assertEqual(self.piano.key_width, 36)
+        self.assertEqual(self.piano.key_rect(0).left(), 0)
+        self.assertEqual(self.piano.key_rect(2).left(), 36)
+        self.assertTrue(self.piano.key_rect(1).left() < 36 < self.piano.key_rect(1).right())
+        self.assertEqual(self.piano.key_rect(1).height(), 120)
+
+    def test_hit_testing(self):
+        self.assertEqual(self.piano.note_at(QPoint(5, 150)), 0)     # C below the black keys
+        self.assertEqual(self.piano.note_at(QPoint(34, 50)), 1)     # C# over the C/D edge
+        self.assertEqual(self.piano.note_at(QPoint(34, 150)), 0)
+        self.assertEqual(self.piano.note_at(QPoint(3 * 36 - 2, 50)), 4)  # no black key between E and F
+        self.assertEqual(self.piano.note_at(QPoint(21 * 36 - 1, 50)), 35)
+        self.assertIsNone(self.piano.note_at(QPoint(21 * 36 + 5, 50)))
+
+    def test_hit_testing_matches_key_rects(self):
+        for note in self.piano.notes:
+            self.assertEqual(self.piano.note_at(self.piano.key_rect(note).center()), note)
+
+    def test_full_range(self):
+        piano = PianoWidget(self.host, first_note=21, last_note=108)
+        piano.resize(1040, 200)
+        self.assertEqual(len(piano.white_keys) + len(piano.black_keys), 88)
+        for note in piano.notes:
+            self.assertEqual(piano.note_at(piano.key_rect(note).center()), note)
+
+    def test_show_note(self):
+        self.piano.show_note(60, 100)     # outside this keyboard, remembered but not drawn
+        self.piano.show_note(13, 90)
+        self.assertEqual(self.piano.pressed, {60: 100, 13: 90})
+        self.piano.show_note(13, 0)
+        self.piano.release_all()
+        self.assertEqual(self.piano.pressed, {})
+
+    def test_paint_highlights_pressed_key(self):
+        self.piano.show_note(2, 127)
+        image = QImage(self.piano.size(), QImage.Format_ARGB32)
+        painter = QPainter(image)
+        self.piano.paint(painter, self.piano.rect())
+        painter.end()
+        self.assertEqual(image.pixelColor(self.piano.key_rect(2).center()), PianoWidget.PRESSED_COLOR)
+        self.assertEqual(image.pixelColor(self.piano.key_rect(4).center()).name(), "#ffffff")
+        self.assertEqual(image.pixelColor(self.piano.key_rect(3).center()).name(), "#000000")
+
+
+if __name__ == '__main__':
+    unittest.main()
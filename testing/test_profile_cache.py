@@ -0,0 +1,62 @@
+import os
+import pickle
+import tempfile
+import unittest
+import mido
+from src.models.dispatch_table import DispatchTable
+from src.models.profile_cache import ProfileCache
+from src.models.profile_watcher import ProfileSnapshot
+from src.models.window_matcher import WindowMatcher
+
+class TestProfileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ProfileCache(os.path.join(self.directory.name, "profiles.json"))
+        self.profiles = {
+            "default": {"KEY": {"60": {"action": "4", "params": {"PRINT_MESSAGE": "default"}}}},
+            "chrome": {"program_window_name": "chrome", "KEY": {"61": {"action": "4", "params": {}}}},
+        }
+        self.snapshot = ProfileSnapshot(self.profiles,
+                                        {name: DispatchTable(name, macros) for name, macros in self.profiles.items()},
+                                        WindowMatcher(self.profiles))
+        self.signature = (1000, 200, 3, None)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        self.cache.save(self.signature, self.snapshot)
+        loaded = self.cache.load(self.signature)
+
+        self.assertEqual(loaded.profiles, self.profiles)
+        self.assertEqual(loaded.matcher.match("google chrome"), "chrome")
+        self.assertEqual(loaded.matcher.match("notepad"), "default")
+        binding = loaded.dispatch_tables["default"].lookup(mido.Message("note_on", note=60, velocity=100))
+        self.assertEqual(binding.conf["params"]["PRINT_MESSAGE"], "default")
+        self.assertIsNone(loaded.dispatch_tables["chrome"].lookup(mido.Message("note_on", note=60, velocity=100)))
+
+    def test_changed_signature_is_a_miss(self):
+        self.cache.save(self.signature, self.snapshot)
+        self.assertIsNone(self.cache.load((1001, 200, 3, None)))
+
+    def test_missing_cache_is_a_miss(self):
+        self.assertIsNone(self.cache.load(self.signature))
+
+    def test_corrupted_payload_is_rejected(self):
+        self.cache.save(self.signature, self.snapshot)
+        with open(self.cache.cache_path, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))
+
+        self.assertIsNone(self.cache.load(self.signature))
+
+    def test_tables_pickle_only_filled_slots(self):
+        table = self.snapshot.dispatch_tables["default"]
+        self.assertLess(len(pickle.dumps(table)), 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
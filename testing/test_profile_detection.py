@@ -21,6 +21,17 @@ class TestProfileDetection(unittest.TestCase):
     def test_default_profile(self):
         self.assertEqual(self.default_profile, self.profile_detection.default_profile)
 
+    def test_matcher_is_compiled_once_per_pattern_set(self):
+        profiles = {"default": {"program_window_name": "default"}, "chrome": {"program_window_name": "chrome", "KEY": {}}}
+        matcher = self.profile_detection.get_matcher(profiles)
+        self.assertEqual(self.profile_detection.match_profile_name(profiles, "google chrome"), "chrome")
+        profiles["chrome"]["KEY"]["60"] = {"action": "1"}
+        self.assertIs(self.profile_detection.get_matcher(profiles), matcher)
+
+        profiles["chrome"]["program_window_name"] = "firefox"
+        self.assertIsNot(self.profile_detection.get_matcher(profiles), matcher)
+        self.assertEqual(self.profile_detection.match_profile_name(profiles, "google chrome"), "default")
+
     def test__load_profiles(self):
 
         current_profiles = {
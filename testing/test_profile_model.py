@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtWidgets import QApplication
+from src.models.profile_store import ProfileStore
+from src.widgets.profile_model import ProfileModel
+
+class TestProfileModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "profiles.json")
+        self.store = ProfileStore(self.file_path, {"default": {"program_window_name": "default", "KEY": {}}})
+        self.model = ProfileModel(self.store)
+        self.events = []
+        self.model.binding_changed.connect(lambda *args: self.events.append(("binding", *args)))
+        self.model.profile_changed.connect(lambda name: self.events.append(("profile", name)))
+        self.model.modelReset.connect(lambda: self.events.append(("reset",)))
+
+    def tearDown(self):
+        self.model.close()
+        self.directory.cleanup()
+
+    def test_rows_are_profile_names(self):
+        self.assertEqual(self.model.rowCount(), 1)
+        self.assertEqual(self.model.data(self.model.index(0)), "default")
+        self.assertEqual(self.model.data(self.model.index(0), ProfileModel.ProfileRole)["program_window_name"], "default")
+
+    def test_binding_change_is_signalled(self):
+        self.model.set_binding("default", "KEY", 60, {"action": "1"})
+        self.assertEqual(self.events, [("binding", "default", "KEY", "60")])
+        self.assertEqual(self.model.binding("default", "KEY", 60), {"action": "1"})
+        self.assertEqual(self.model.bindings("default", "KEY"), {"60": {"action": "1"}})
+
+    def test_profiles_are_inserted_and_removed(self):
+        inserted, removed = [], []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append(first))
+        self.model.rowsRemoved.connect(lambda parent, first, last: removed.append(first))
+
+        self.model.put_profile("chrome", {"program_window_name": "chrome"})
+        self.assertEqual(self.model.profile_names, ["default", "chrome"])
+        self.model.delete_profile("default")
+        self.assertEqual(self.model.profile_names, ["chrome"])
+        self.assertEqual((inserted, removed), ([1], [0]))
+        self.assertEqual(self.events, [("profile", "chrome"), ("profile", "default")])
+
+    def test_changes_from_other_code_reach_the_model(self):
+        # e.g. the side panel saving through its own ProfileDetection, from another thread
+        thread = threading.Thread(target=self.store.set_binding, args=("default", "KEY", "61", {"action": "2"}))
+        thread.start()
+        thread.join()
+        self.app.processEvents()
+        self.assertEqual(self.events, [("binding", "default", "KEY", "61")])
+
+    def test_hand_edit_resets_the_model(self):
+        time.sleep(0.01)  # a new mtime even on coarse clocks
+        with open(self.file_path, "w") as file:
+            json.dump({"edited": {"program_window_name": "edited"}}, file)
+        self.model.refresh()
+        self.assertEqual(self.events, [("reset",)])
+        self.assertEqual(self.model.profile_names, ["edited"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from src.models.profile_store import ProfileStore
+
+class TestProfileStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "profiles.json")
+        self.default_profiles = {"default": {"program_window_name": "default", "KEY": {}}}
+        self.store = ProfileStore(self.file_path, self.default_profiles, compact_after=1000)
+
+    def tearDown(self):
+        self.store.wait_for_compaction()
+        self.directory.cleanup()
+
+    def read_file(self):
+        with open(self.file_path) as file:
+            return json.load(file)
+
+    def test_missing_file_is_created_with_defaults(self):
+        self.assertEqual(self.store.profiles, self.default_profiles)
+        self.assertEqual(self.read_file(), self.default_profiles)
+
+    def test_changes_go_to_the_journal(self):
+        self.store.set_binding("default", "KEY", 60, {"action": "1", "params": {"RUN_COMMAND": "a"}})
+        self.store.put_profile("chrome", {"program_window_name": "chrome"})
+        self.store.delete_profile("chrome")
+
+        self.assertEqual(self.read_file(), self.default_profiles)
+        self.assertEqual(self.store.journal_entries, 3)
+        self.assertEqual(self.store.get("default", "KEY", "60", "action"), "1")
+        self.assertIsNone(self.store.get("chrome"))
+        self.assertEqual(ProfileStore.read_profiles(self.file_path), self.store.profiles)
+
+    def test_listeners_get_every_change(self):
+        entries = []
+        self.store.add_listener(entries.append)
+        self.store.set_binding("default", "KEY", 60, {"action": "1"})
+        self.store.delete_profile("default")
+        self.store.remove_listener(entries.append)
+        self.store.put_profile("chrome", {})
+
+        self.assertEqual([(entry["op"], entry["path"]) for entry in entries],
+                         [("set", ["default", "KEY", "60"]), ("delete", ["default"])])
+
+    def test_reopen_replays_journal(self):
+        self.store.set_binding("default", "KEY", "60", {"action": "1"})
+        reopened = ProfileStore(self.file_path)
+        self.assertEqual(reopened.get("default", "KEY", "60"), {"action": "1"})
+
+    def test_partial_journal_line_is_skipped(self):
+        self.store.set_binding("default", "KEY", "60", {"action": "1"})
+        with open(self.store.journal_path, "a") as journal:
+            journal.write('{"op": "set", "path": ["default", "KEY", "61"], "val')
+
+        reopened = ProfileStore(self.file_path)
+        self.assertEqual(reopened.get("default", "KEY", "60"), {"action": "1"})
+        self.assertIsNone(reopened.get("default", "KEY", "61"))
+
+    def test_append_after_partial_line_survives_restart(self):
+        self.store.set_binding("default", "KEY", "60", {"action": "1"})
+        with open(self.store.journal_path, "a") as journal:
+            journal.write('{"op": "set", "path": ["default", "KEY", "61"], "val')
+
+        reopened = ProfileStore(self.file_path)
+        reopened.set_binding("default", "KEY", "62", {"action": "2"})
+        self.assertEqual(reopened.journal_entries, 2)
+        self.assertEqual(ProfileStore.read_profiles(self.file_path)["default"]["KEY"]["62"], {"action": "2"})
+        self.assertEqual(ProfileStore(self.file_path).get("default", "KEY", "60"), {"action": "1"})
+
+    def test_compaction_folds_journal_into_file(self):
+        self.store.set_binding("default", "KEY", "60", {"action": "1"})
+        self.store.compact()
+
+        self.assertEqual(self.read_file()["default"]["KEY"]["60"], {"action": "1"})
+        self.assertEqual(self.store.journal_entries, 0)
+        self.assertEqual(os.path.getsize(self.store.journal_path), 0)
+        self.assertFalse(os.path.exists(self.file_path + ".tmp"))
+
+    def test_background_compaction_after_threshold(self):
+        store = ProfileStore(self.file_path, self.default_profiles, compact_after=5)
+        for note in range(5):
+            store.set_binding("default", "KEY", note, {"action": "1"})
+        store.wait_for_compaction(2)
+
+        self.assertEqual(len(self.read_file()["default"]["KEY"]), 5)
+        self.assertEqual(store.journal_entries, 0)
+
+    def test_hand_edits_are_picked_up(self):
+        self.store.profiles
+        with open(self.file_path, "w") as file:
+            json.dump({"edited": {}}, file)
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertIn("edited", self.store.profiles)
+
+    def test_open_shares_instances(self):
+        self.assertIs(ProfileStore.open(self.file_path), ProfileStore.open(self.file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
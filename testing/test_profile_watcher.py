@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import mido
+from src.models.profile_watcher import ProfileWatcher
+
+class TestProfileWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.profiles = {
+            "default": {"program_window_name": "default", "KEY": {"69": {"action": "1", "params": {"RUN_COMMAND": "a"}}}},
+            "chrome": {"program_window_name": "chrome", "KEY": {"35": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "CTRL + T"}}}},
+        }
+        handle, self.file_path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.write_profiles()
+        self.watcher = ProfileWatcher(self.file_path, interval=0.01)
+
+    def tearDown(self):
+        self.watcher.stop()
+        os.remove(self.file_path)
+        if os.path.exists(self.file_path + ".cache"):
+            os.remove(self.file_path + ".cache")
+
+    def write_profiles(self):
+        with open(self.file_path, "w") as file:
+            json.dump(self.profiles, file)
+        # make sure the signature moves even on filesystems with coarse mtimes
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_initial_snapshot(self):
+        profiles, dispatch_tables, matcher = self.watcher.snapshot
+        self.assertEqual(profiles, self.profiles)
+        self.assertEqual(matcher.match("new tab - google chrome"), "chrome")
+        self.assertEqual(set(dispatch_tables), {"default", "chrome"})
+        self.assertFalse(self.watcher.check())
+
+    def test_only_changed_profiles_are_recompiled(self):
+        before = self.watcher.snapshot.dispatch_tables
+        self.profiles["chrome"]["KEY"]["36"] = {"action": "1", "params": {"RUN_COMMAND": "b"}}
+        self.write_profiles()
+
+        self.assertTrue(self.watcher.check())
+        after = self.watcher.snapshot.dispatch_tables
+        self.assertIs(before["default"], after["default"])
+        self.assertIsNot(before["chrome"], after["chrome"])
+
+    def test_corrupted_file_keeps_previous_snapshot(self):
+        snapshot = self.watcher.snapshot
+        with open(self.file_path, "w") as file:
+            file.write("{ not json")
+
+        self.assertFalse(self.watcher.check())
+        self.assertIs(self.watcher.snapshot, snapshot)
+
+    def test_broken_profile_keeps_its_previous_table(self):
+        chrome = self.watcher.snapshot.dispatch_tables["chrome"]
+        self.profiles["chrome"]["KEY"] = []  # a list has no items(), compiling it fails
+        self.profiles["default"]["KEY"]["70"] = {"action": "1", "channel": "all", "params": {"RUN_COMMAND": "b"}}
+        self.write_profiles()
+
+        self.assertTrue(self.watcher.check())
+        dispatch_tables = self.watcher.snapshot.dispatch_tables
+        self.assertIs(dispatch_tables["chrome"], chrome)
+        self.assertIsNotNone(dispatch_tables["default"].lookup(mido.Message("note_on", note=69, velocity=100)))
+        self.assertIsNone(dispatch_tables["default"].lookup(mido.Message("note_on", note=70, velocity=100)))
+
+        self.profiles["opera"] = {"KEY": []}
+        self.write_profiles()
+        self.assertTrue(self.watcher.check())
+        self.assertNotIn("opera", self.watcher.snapshot.dispatch_tables)
+
+    def test_second_watcher_loads_from_cache(self):
+        self.assertTrue(os.path.exists(self.file_path + ".cache"))
+        cached = ProfileWatcher(self.file_path)
+        with open(self.file_path, "w") as file:
+            file.write("the cache is used, so this is never parsed")
+        self.assertEqual(cached.snapshot.profiles, self.profiles)
+        self.assertEqual(cached.snapshot.matcher.match("google chrome"), "chrome")
+
+    def test_journal_appends_do_not_rewrite_the_cache(self):
+        cache_signature = os.stat(self.file_path + ".cache").st_mtime_ns
+        with open(self.file_path + ".journal", "a") as journal:
+            journal.write(json.dumps({"op": "set", "path": ["default", "KEY", "70"], "value": {"action": "1"}}) + "\n")
+        try:
+            self.assertTrue(self.watcher.check())
+            self.assertIn("70", self.watcher.snapshot.profiles["default"]["KEY"])
+            self.assertEqual(os.stat(self.file_path + ".cache").st_mtime_ns, cache_signature)
+
+            self.write_profiles()
+            self.assertTrue(self.watcher.check())
+            self.assertNotEqual(os.stat(self.file_path + ".cache").st_mtime_ns, cache_signature)
+        finally:
+            os.remove(self.file_path + ".journal")
+
+    def test_background_thread_picks_up_changes(self):
+        self.watcher.start()
+        del self.profiles["chrome"]
+        self.write_profiles()
+
+        deadline = time.monotonic() + 2
+        while "chrome" in self.watcher.snapshot.dispatch_tables and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertNotIn("chrome", self.watcher.snapshot.dispatch_tables)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from src.models.profile_store import ProfileStore
+from src.models.profile_write_queue import ProfileWriteQueue
+
+class TestProfileWriteQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "profiles.json")
+        self.store = ProfileStore(self.file_path, {"default": {"program_window_name": "default", "KEY": {}}}, compact_after=1000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def journal_lines(self):
+        if not os.path.exists(self.store.journal_path):
+            return 0
+        with open(self.store.journal_path) as journal:
+            return sum(1 for _ in journal)
+
+    def test_bulk_edit_is_one_write(self):
+        queue = ProfileWriteQueue(self.store, delay=60)
+        self.store.profiles  # creates the file, which is fsynced too
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            for edit in range(100):
+                queue.set_binding("default", "KEY", 60 + edit % 10, {"action": "1", "params": {"RUN_COMMAND": str(edit)}})
+            self.assertEqual(self.journal_lines(), 0)
+            self.assertEqual(queue.flush(), 10)
+        queue.stop()
+
+        self.assertEqual(fsync.call_count, 1)
+        self.assertEqual(self.journal_lines(), 10)
+        self.assertEqual(queue.stats(), {"queued": 100, "written": 10, "flushes": 1, "coalesced": 90})
+        self.assertEqual(self.store.get("default", "KEY", "69", "params", "RUN_COMMAND"), "99")
+        self.assertEqual(ProfileStore.read_profiles(self.file_path), self.store.profiles)
+
+    def test_pending_edits_are_readable(self):
+        queue = ProfileWriteQueue(self.store, delay=60)
+        queue.set_binding("default", "KEY", "60", {"action": "2"})
+        self.assertEqual(queue.pending("default", "KEY", 60), {"action": "2"})
+        self.assertIsNone(self.store.get("default", "KEY", "60"))
+        queue.stop()
+        self.assertIsNone(queue.pending("default", "KEY", 60))
+        self.assertEqual(self.store.get("default", "KEY", "60"), {"action": "2"})
+
+    def test_debounce_flushes_on_its_own(self):
+        queue = ProfileWriteQueue(self.store, delay=0.05)
+        queue.set_binding("default", "KEY", "60", {"action": "1"})
+        queue.set_binding("default", "KEY", "60", {"action": "2"})
+        deadline = time.monotonic() + 2
+        while queue.stats()["flushes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.store.get("default", "KEY", "60"), {"action": "2"})
+        self.assertEqual(self.journal_lines(), 1)
+        queue.stop()
+
+    def test_edits_after_stop_are_written_directly(self):
+        queue = ProfileWriteQueue(self.store, delay=60)
+        queue.stop()
+        queue.set_binding("default", "KEY", "61", {"action": "3"})
+        self.assertEqual(self.journal_lines(), 1)
+
+    def test_listeners_see_every_binding_of_a_batch(self):
+        entries = []
+        self.store.add_listener(entries.append)
+        self.store.apply_batch([{"op": "set", "path": ["default", "KEY", str(note)], "value": {}} for note in range(3)])
+        self.assertEqual([entry["path"][2] for entry in entries], ["0", "1", "2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
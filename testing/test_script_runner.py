@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+import mido
+from src.models.script_runner import ScriptWorkerPool, InProcessScriptRunner, message_to_dict
+
+SCRIPT = """
+import json, sys
+print("scripts may print freely")
+with open(OUTPUT, "w") as file:
+    json.dump(midi_message, file)
+"""
+
+class TestScriptRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "out.json")
+        self.script = os.path.join(self.directory.name, "script.py")
+        self.write_script(f"OUTPUT = {self.output!r}\n" + SCRIPT)
+        self.message = message_to_dict(mido.Message("control_change", channel=2, control=7, value=99))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_script(self, source):
+        with open(self.script, "w") as file:
+            file.write(source)
+
+    def read_output(self):
+        with open(self.output) as file:
+            return json.load(file)
+
+    def test_message_to_dict(self):
+        self.assertEqual(self.message, {"type": "control_change", "channel": 2, "control": 7, "value": 99})
+        self.assertEqual(message_to_dict(None), {})
+
+    def test_in_process_runner_passes_message(self):
+        runner = InProcessScriptRunner()
+        self.assertTrue(runner.run(self.script, self.message))
+        self.assertEqual(self.read_output(), self.message)
+
+    def test_in_process_runner_recompiles_on_change(self):
+        runner = InProcessScriptRunner()
+        runner.run(self.script, self.message)
+        self.write_script(f"OUTPUT = {self.output!r}\nimport json\njson.dump('changed', open(OUTPUT, 'w'))\n")
+        stat = os.stat(self.script)
+        os.utime(self.script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        runner.run(self.script, self.message)
+        self.assertEqual(self.read_output(), "changed")
+
+    def test_in_process_runner_reports_errors(self):
+        self.write_script("raise RuntimeError('boom')\n")
+        self.assertFalse(InProcessScriptRunner().run(self.script))
+
+    def test_worker_pool_runs_scripts(self):
+        pool = ScriptWorkerPool(size=1)
+        pool.start()
+        try:
+            self.assertTrue(pool.run(self.script, self.message))
+            self.assertEqual(self.read_output(), self.message)
+            self.write_script("import sys\nsys.exit(3)\n")
+            self.assertTrue(pool.run(self.script))
+            self.write_script("raise RuntimeError('boom')\n")
+            self.assertFalse(pool.run(self.script))
+        finally:
+            pool.close()
+
+    def test_worker_pool_replaces_dead_worker(self):
+        pool = ScriptWorkerPool(size=1)
+        pool.start()
+        try:
+            self.write_script("import os\nos._exit(1)\n")
+            self.assertFalse(pool.run(self.script))
+            self.write_script(f"OUTPUT = {self.output!r}\n" + SCRIPT)
+            self.assertTrue(pool.run(self.script, self.message))
+        finally:
+            pool.close()
+
+    def test_worker_pool_replaces_hung_worker(self):
+        pool = ScriptWorkerPool(size=1, timeout=0.5)
+        pool.start()
+        try:
+            self.write_script("import time\ntime.sleep(30)\n")
+            self.assertFalse(pool.run(self.script))
+            self.write_script(f"OUTPUT = {self.output!r}\n" + SCRIPT)
+            self.assertTrue(pool.run(self.script, self.message))
+        finally:
+            pool.close()
+
+    def test_pooled_scripts_cannot_read_requests(self):
+        pool = ScriptWorkerPool(size=1, timeout=5)
+        pool.start()
+        try:
+            self.write_script(f"import json, sys\njson.dump(sys.stdin.read(), open({self.output!r}, 'w'))\n")
+            self.assertTrue(pool.run(self.script))
+            self.assertEqual(self.read_output(), "")
+            self.write_script(f"OUTPUT = {self.output!r}\n" + SCRIPT)
+            self.assertTrue(pool.run(self.script, self.message))
+            self.assertEqual(self.read_output(), self.message)
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
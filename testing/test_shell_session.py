@@ -0,0 +1,67 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from src.models.shell_session import ShellSession, ShellSessionPool
+
+@unittest.skipIf(os.name == "nt", "commands below are POSIX shell syntax")
+class TestShellSession(unittest.TestCase):
+
+    def setUp(self):
+        self.session = ShellSession()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_exit_codes(self):
+        self.assertEqual(self.session.run("true"), 0)
+        self.assertEqual(self.session.run("exit 3"), 3)
+        self.assertTrue(self.session.alive)
+
+    def test_commands_do_not_leak_state(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.session.run(f"cd {directory}; FOO=bar")
+            self.assertEqual(self.session.run(f'[ "$(pwd)" != "{directory}" ] && [ -z "$FOO" ]'), 0)
+
+    def test_commands_cannot_read_session_stdin(self):
+        self.assertEqual(self.session.run("cat"), 0)
+        self.assertEqual(self.session.run("true"), 0)
+
+    def test_output_without_trailing_newline(self):
+        self.assertEqual(self.session.run("printf foo", timeout=3), 0)
+        self.assertEqual(self.session.run("printf foo; exit 2", timeout=3), 2)
+        self.assertEqual(self.session.run("true", timeout=3), 0)
+
+    def test_timeout(self):
+        self.assertIsNone(self.session.run("sleep 5", timeout=0.1))
+
+class TestShellSessionPool(unittest.TestCase):
+
+    @unittest.skipIf(os.name == "nt", "commands below are POSIX shell syntax")
+    def test_busy_pool_does_not_block(self):
+        pool = ShellSessionPool(size=1)
+        pool.start()
+        try:
+            slow = threading.Thread(target=pool.run, args=("sleep 1",))
+            slow.start()
+            time.sleep(0.1)
+            started = time.monotonic()
+            self.assertEqual(pool.run("exit 4"), 4)
+            self.assertLess(time.monotonic() - started, 0.5)
+            slow.join()
+        finally:
+            pool.close()
+
+    def test_hung_session_is_replaced(self):
+        pool = ShellSessionPool(size=1, timeout=0.1)
+        pool.start()
+        try:
+            self.assertIsNone(pool.run("sleep 5"))
+            self.assertEqual(pool.run("exit 0"), 0)
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from src.models.shortcut_cache import ShortcutCache, compile_shortcut, profile_shortcuts
+
+SCAN_CODES = {"ctrl": 29, "shift": 42, "alt": 56, "t": 20, "c": 46, "v": 47, "f4": 62, "enter": 28}
+
+def fake_parse(keys):
+    """parse_hotkey's shape, ((scan codes per key, ...) per step), without reading the OS layout."""
+    steps = []
+    for step in keys.split(","):
+        names = [name.strip().lower() for name in step.split("+")]
+        unknown = [name for name in names if name not in SCAN_CODES]
+        if unknown:
+            raise ValueError(f"Key {unknown[0]!r} is not mapped to any known key.")
+        steps.append(tuple((SCAN_CODES[name],) for name in names))
+    return tuple(steps)
+
+class CountingParse():
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(keys)
+        return fake_parse(keys)
+
+class TestShortcutCache(unittest.TestCase):
+
+    def setUp(self):
+        self.parse = CountingParse()
+        self.sent = []
+        self.cache = ShortcutCache(self.parse, lambda code: self.sent.append(("down", code)), lambda code: self.sent.append(("up", code)))
+
+    def test_compile_presses_then_releases_in_reverse(self):
+        self.assertEqual(compile_shortcut("CTRL + T", fake_parse), ((29, True), (20, True), (20, False), (29, False)))
+        self.assertEqual(compile_shortcut("alt+f4, enter", fake_parse), ((56, True), (62, True), (62, False), (56, False), (28, True), (28, False)))
+
+    def test_compile_rejects_invalid_shortcuts(self):
+        for keys in ("", "   ", None, "ctrl+nokey"):
+            with self.assertRaises(ValueError):
+                compile_shortcut(keys, fake_parse)
+
+    def test_profile_shortcuts(self):
+        profile = {
+            "program_window_name": "chrome",
+            "KEY": {
+                "60": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "ctrl+t"}},
+                "61": {"action": "1", "params": {"RUN_COMMAND": "ls"}},
+                "62": {"action": "5", "params": {"MACRO_SEQUENCE": "keys ctrl+c; wait 20; keys ctrl+v"}},
+            },
+            "CONTROL_CHANGE": {
+                "0": {"action": "1", "params": {"cc_control_id": "7"}, "mapping": {"zones": [
+                    {"input": [0, 10], "action": "2", "params": {"KEYBOARD_SHORTCUT": "alt+f4"}}]}},
+                "1": {"action": "2", "params": {"cc_control_id": "8", "KEYBOARD_SHORTCUT": "ctrl+{value}"}},
+            },
+        }
+        self.assertEqual(profile_shortcuts(profile), {"ctrl+t", "ctrl+c", "ctrl+v", "alt+f4"})
+
+    def test_send_replays_without_parsing(self):
+        self.cache.load({"default": {"KEY": {"60": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "ctrl+t"}}}}})
+        self.assertEqual(self.parse.calls, ["ctrl+t"])
+
+        for _ in range(3):
+            self.cache.send("ctrl+t")
+        self.assertEqual(self.parse.calls, ["ctrl+t"])
+        self.assertEqual(self.sent[:4], [("down", 29), ("down", 20), ("up", 20), ("up", 29)])
+        self.assertEqual(len(self.sent), 12)
+
+    def test_unknown_shortcut_is_compiled_once_on_first_use(self):
+        self.cache.send("shift+c")
+        self.cache.send("shift+c")
+        self.assertEqual(self.parse.calls, ["shift+c"])
+        self.assertEqual(len(self.sent), 8)
+
+    def test_invalid_shortcut_sends_nothing(self):
+        self.cache.load({"default": {"KEY": {"60": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "ctrl+nokey"}}}}})
+        self.cache.send("ctrl+nokey")
+        self.assertIsNone(self.cache.events("ctrl+nokey"))
+        self.assertEqual(self.sent, [])
+        self.assertEqual(self.parse.calls, ["ctrl+nokey"])
+
+    def test_only_changed_profiles_are_recompiled(self):
+        chrome = {"KEY": {"60": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "ctrl+t"}}}}
+        self.cache.load({"default": {"KEY": {"60": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "ctrl+c"}}}}, "chrome": chrome})
+        self.parse.calls.clear()
+
+        self.cache.load({"default": {"KEY": {"60": {"action": "2", "params": {"KEYBOARD_SHORTCUT": "ctrl+v"}}}}, "chrome": dict(chrome)})
+        self.assertEqual(self.parse.calls, ["ctrl+v"])
+        self.assertIsNotNone(self.cache.events("ctrl+t"))
+
+
+if __name__ == '__main__':
+    unittest.main()
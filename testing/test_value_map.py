@@ -0,0 +1,87 @@
+import pickle
+import unittest
+import mido
+from src.models.dispatch_table import DispatchTable
+from src.models.value_map import ValueMap
+
+def cc(value):
+    return mido.Message("control_change", control=7, value=value)
+
+def pitch(value):
+    return mido.Message("pitchwheel", pitch=value)
+
+class TestValueMap(unittest.TestCase):
+
+    def mapped(self, mapping, msg, pitchwheel=False):
+        conf = ValueMap({"action": "1", "params": {"RUN_COMMAND": "volume {value}"}, "mapping": mapping}, pitchwheel).lookup(msg)
+        return None if conf is None else conf["value"]
+
+    def test_linear_output_range(self):
+        value_map = ValueMap({"action": "1", "params": {"RUN_COMMAND": "volume {value}"}, "mapping": {"output": [0, 100]}})
+        self.assertEqual(value_map.lookup(cc(0))["params"]["RUN_COMMAND"], "volume 0")
+        self.assertEqual(value_map.lookup(cc(127))["params"]["RUN_COMMAND"], "volume 100")
+        self.assertEqual(value_map.lookup(cc(64))["value"], 50)
+        self.assertNotIn("mapping", value_map.lookup(cc(64)))
+        self.assertEqual(value_map.outputs, 101)
+
+    def test_input_range_and_threshold(self):
+        self.assertIsNone(self.mapped({"input": [10, 20]}, cc(9)))
+        self.assertEqual(self.mapped({"input": [10, 20], "output": [0, 1], "decimals": 1}, cc(15)), 0.5)
+        self.assertIsNone(self.mapped({"threshold": 64}, cc(63)))
+        self.assertEqual(self.mapped({"threshold": 64}, cc(100)), 100)
+
+    def test_curves(self):
+        for curve in ("log", "exp"):
+            values = [self.mapped({"curve": curve, "output": [0, 1000]}, cc(value)) for value in range(128)]
+            self.assertEqual((values[0], values[-1]), (0, 1000))
+            self.assertEqual(values, sorted(values))
+        self.assertGreater(self.mapped({"curve": "log", "output": [0, 1000]}, cc(32)), 250)
+        self.assertLess(self.mapped({"curve": "exp", "output": [0, 1000]}, cc(32)), 250)
+
+        steps = {self.mapped({"curve": "step", "steps": 4, "output": [0, 3]}, cc(value)) for value in range(128)}
+        self.assertEqual(steps, {0, 1, 2, 3})
+        self.assertEqual(self.mapped({"curve": "table", "table": [0, 10, 110]}, cc(127)), 110)
+        self.assertEqual(self.mapped({"curve": "table", "table": [0, 10, 110]}, cc(0)), 0)
+
+    def test_zones_pick_the_action(self):
+        value_map = ValueMap({"action": "1", "params": {"RUN_COMMAND": "base"}, "mapping": {"zones": [
+            {"input": [0, 20], "action": "2", "params": {"KEYBOARD_SHORTCUT": "left"}},
+            {"input": [100, 127], "params": {"RUN_COMMAND": "high {value}"}},
+        ]}})
+        self.assertEqual(value_map.lookup(cc(5))["action"], "2")
+        self.assertIsNone(value_map.lookup(cc(50)))
+        self.assertEqual(value_map.lookup(cc(120))["params"], {"RUN_COMMAND": "high 120"})
+
+    def test_pitchwheel_table(self):
+        mapping = {"output": [-1, 1], "decimals": 2}
+        self.assertEqual(self.mapped(mapping, pitch(-8192), pitchwheel=True), -1)
+        self.assertEqual(self.mapped(mapping, pitch(8191), pitchwheel=True), 1)
+        self.assertEqual(self.mapped({"threshold": 0}, pitch(-1), pitchwheel=True), None)
+
+    def test_invalid_mappings(self):
+        for mapping in ({"curve": "cubic"}, {"curve": "table", "table": [1]}, {"input": [1]}, {"curve": "step", "steps": 0}, "linear",
+                        {"curve": "exp", "factor": 0}, {"curve": "log", "factor": -1}, {"zones": [1]}, {"zones": {"input": [0, 1]}}):
+            with self.assertRaises(ValueError):
+                ValueMap({"action": "1", "mapping": mapping})
+
+    def test_dispatch_table_resolves_mapped_bindings(self):
+        table = DispatchTable("default", {
+            "CONTROL_CHANGE": {
+                "0": {"action": "1", "params": {"cc_control_id": "7", "RUN_COMMAND": "volume {value}"},
+                      "mapping": {"output": [0, 100], "threshold": 1}},
+                "1": {"action": "1", "params": {"cc_control_id": "8"}, "mapping": {"curve": "cubic"}},
+            },
+            "PITCHWHEEL": {"1": {"action": "4", "params": {"PRINT_MESSAGE": "{value}"}, "mapping": {"output": [0, 10]}}},
+        })
+        binding = table.lookup(cc(127))
+        self.assertEqual(binding.resolve(cc(127))["params"]["RUN_COMMAND"], "volume 100")
+        self.assertIsNone(binding.resolve(cc(0)))
+        self.assertIsNone(table.lookup(mido.Message("control_change", control=8, value=1)))
+        self.assertEqual(table.lookup(pitch(8191)).resolve(pitch(8191))["params"]["PRINT_MESSAGE"], "10")
+
+        restored = pickle.loads(pickle.dumps(table))
+        self.assertEqual(restored.lookup(cc(64)).resolve(cc(64))["value"], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from src.models.window_matcher import WindowMatcher
+
+class TestWindowMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.profiles = {
+            "default": {"program_window_name": "default"},
+            "chrome": {"program_window_name": "Chrome"},
+            "chrome docs": {"program_window_name": "google docs - google chrome"},
+            "ableton": {"program_window_name": "ableton live*", "match_mode": "glob"},
+            "notepad": {"program_window_name": "untitled - notepad", "match_mode": "exact"},
+            "vscode": {"program_window_name": r"\.py\b.*visual studio code$", "match_mode": "regex"},
+            "pinned": {"program_window_name": "chr", "priority": 5},
+        }
+
+    def test_no_title_returns_default(self):
+        matcher = WindowMatcher(self.profiles)
+        self.assertEqual(matcher.match(None), "default")
+        self.assertEqual(matcher.match(""), "default")
+
+    def test_no_match_returns_default(self):
+        self.assertEqual(WindowMatcher(self.profiles).match("calculator"), "default")
+
+    def test_substring_is_case_insensitive(self):
+        del self.profiles["pinned"]
+        self.assertEqual(WindowMatcher(self.profiles).match("new tab - google chrome"), "chrome")
+
+    def test_longer_substring_wins(self):
+        del self.profiles["pinned"]
+        self.assertEqual(WindowMatcher(self.profiles).match("google docs - google chrome"), "chrome docs")
+
+    def test_priority_beats_specificity(self):
+        self.assertEqual(WindowMatcher(self.profiles).match("google docs - google chrome"), "pinned")
+
+    def test_match_modes(self):
+        matcher = WindowMatcher(self.profiles)
+        self.assertEqual(matcher.match("Ableton Live 12 Suite"), "ableton")
+        self.assertEqual(matcher.match("my ableton live set"), "default")
+        self.assertEqual(matcher.match("untitled - notepad"), "notepad")
+        self.assertEqual(matcher.match("untitled - notepad++"), "default")
+        self.assertEqual(matcher.match("main.py - project - visual studio code"), "vscode")
+        self.assertEqual(matcher.match("main.pyc - visual studio code"), "default")
+
+    def test_invalid_regex_is_skipped(self):
+        self.profiles["broken"] = {"program_window_name": "([", "match_mode": "regex"}
+        self.assertEqual(WindowMatcher(self.profiles).match("(["), "default")
+
+    def test_regex_features_are_kept(self):
+        profiles = {
+            "flags": {"program_window_name": "(?i)firefox", "match_mode": "regex"},
+            "named": {"program_window_name": "(?P<x>chr)ome", "match_mode": "regex"},
+            "backreference": {"program_window_name": r"(ab)-\1", "match_mode": "regex"},
+            "ableton": {"program_window_name": "ableton*", "match_mode": "glob"},
+        }
+        matcher = WindowMatcher(profiles)
+        self.assertEqual(matcher.match("Mozilla Firefox"), "flags")
+        self.assertEqual(matcher.match("google chrome"), "named")
+        self.assertEqual(matcher.match("ab-ab"), "backreference")
+        self.assertEqual(matcher.match("ab-cd"), "default")
+        self.assertEqual(matcher.match("Ableton Live"), "ableton")
+
+    def test_results_are_memoized(self):
+        matcher = WindowMatcher(self.profiles, cache_size=2)
+        matcher.match("calculator")
+        matcher.match("calculator")
+        self.assertEqual(matcher.cache_info().hits, 1)
+
+    def test_overlapping_substrings_are_all_found(self):
+        profiles = {"a": {"program_window_name": "she"}, "b": {"program_window_name": "hers", "priority": 1}}
+        self.assertEqual(WindowMatcher(profiles).match("ushers"), "b")
+
+
+if __name__ == '__main__':
+    unittest.main()